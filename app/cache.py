@@ -0,0 +1,164 @@
+import contextvars
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+# Set while serving a request whose response mustn't come from the cache, e.g. a profiled one
+bypass_cache: contextvars.ContextVar[bool] = contextvars.ContextVar("bypass_cache", default=False)
+
+
+class CachedResponse(NamedTuple):
+    """A response body serialized once and replayed on cache hits."""
+    body: bytes
+    headers: Dict[str, str]
+
+    def to_response(self) -> Response:
+        return Response(content=self.body, media_type="application/json", headers=self.headers)
+
+
+def render_json(content: Any, headers: Optional[Dict[str, str]] = None) -> CachedResponse:
+    """Serialize content exactly like FastAPI's default JSON response."""
+    return CachedResponse(JSONResponse(jsonable_encoder(content)).body, dict(headers or {}))
+
+
+class ResponseCache:
+    """In-process LRU cache of serialized API responses with a TTL.
+
+    Entries are keyed on the endpoint, its normalized parameters and the
+    current data generation. The scrape pipeline bumps the generation when
+    it commits new jobs, which invalidates every entry at once. When jobs
+    are changed by another process, readers poll the persisted data version
+    (see app.dataversion) every ``sync_interval`` seconds and bump the
+    generation when it changes.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0, sync_interval: float = 5.0):
+        """
+        Args:
+            maxsize: Maximum number of cached responses (0 disables the cache)
+            ttl: Seconds a response stays valid
+            sync_interval: Seconds between data version checks (0 disables them)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.sync_interval = sync_interval
+        self.generation = 0
+        self._version: Optional[Any] = None
+        self._next_sync = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, CachedResponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def make_key(self, endpoint: str, params: Dict[str, Any]) -> Hashable:
+        """Build a cache key from an endpoint's validated parameters.
+
+        Parameters left at None don't affect the key, so ``/jobs`` and
+        ``/jobs?keyword=`` map to the same entry.
+        """
+        normalized = tuple(sorted((name, value) for name, value in params.items() if value is not None))
+        return (self.generation, endpoint, normalized)
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: CachedResponse) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_render(self, endpoint: str, params: Dict[str, Any],
+                      render: Callable[[], CachedResponse]) -> Response:
+        """Return the cached response for a request, rendering it on a miss."""
+        key = self.make_key(endpoint, params)
+        cached = None if bypass_cache.get() else self.get(key)
+        if cached is None:
+            cached = render()
+            self.set(key, cached)
+        return cached.to_response()
+
+    async def get_or_render_async(self, endpoint: str, params: Dict[str, Any],
+                                  render: Callable[[], Awaitable[CachedResponse]]) -> Response:
+        """Like get_or_render, for renderers that query through an async session."""
+        key = self.make_key(endpoint, params)
+        cached = None if bypass_cache.get() else self.get(key)
+        if cached is None:
+            cached = await render()
+            self.set(key, cached)
+        return cached.to_response()
+
+    def bump_generation(self) -> None:
+        """Invalidate every cached response after the underlying data changed."""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def version_due(self) -> bool:
+        """Whether the data version should be checked before serving from the cache."""
+        if not self.enabled or self.sync_interval <= 0:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            if now < self._next_sync:
+                return False
+            self._next_sync = now + self.sync_interval
+            return True
+
+    def observe_version(self, version: Any) -> None:
+        """Record the current data version, invalidating the cache if it changed."""
+        with self._lock:
+            changed = self._version is not None and version != self._version
+            self._version = version
+        if changed:
+            self.bump_generation()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "generation": self.generation,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+response_cache = ResponseCache(
+    maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", "300")),
+    sync_interval=float(os.getenv("RESPONSE_CACHE_SYNC_INTERVAL", "5")),
+)
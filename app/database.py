@@ -1,22 +1,107 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
 from dotenv import load_dotenv
 
-# Load environment variables
+# Load environment variables, before the modules below read their settings
 load_dotenv()
 
+from . import metrics, profiling
+
 # Get database URL from environment or use SQLite as default
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./jobs.db")
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-)
+# Async drivers used for each synchronous database backend
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def to_async_url(url: str) -> str:
+    """Point a database URL at the async driver for its backend."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None or parsed.get_dialect().is_async:
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+# Get async database URL from environment or derive it from DATABASE_URL
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+
+# SQLite pragmas applied to every new connection. WAL lets readers run while
+# the scraper writes, and busy_timeout makes writers wait instead of failing.
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000")),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-64000")),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+}
+
+# Connection pool settings for server databases
+POOL_OPTIONS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "1").lower() not in ("0", "false", "no"),
+}
+
+def engine_options(url: str) -> dict:
+    """Keyword arguments for create_engine based on the database backend."""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return dict(POOL_OPTIONS)
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply SQLITE_PRAGMAS on a new DBAPI connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+def create_db_engine(url: str = DATABASE_URL, **kwargs):
+    """
+    Create a synchronous engine with the configured pool or SQLite pragmas.
+    
+    Args:
+        url: Database URL
+        **kwargs: Extra create_engine arguments, overriding the configured ones
+    """
+    options = engine_options(url)
+    if make_url(url).get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+    options.update(kwargs)
+    db_engine = create_engine(url, **options)
+    if db_engine.dialect.name == "sqlite":
+        event.listen(db_engine, "connect", set_sqlite_pragmas)
+    metrics.instrument_engine(db_engine)
+    profiling.instrument_engine(db_engine)
+    return db_engine
+
+def create_async_db_engine(url: str = ASYNC_DATABASE_URL, **kwargs):
+    """Create an async engine with the configured pool or SQLite pragmas."""
+    options = engine_options(url)
+    options.update(kwargs)
+    db_engine = create_async_engine(url, **options)
+    if db_engine.dialect.name == "sqlite":
+        event.listen(db_engine.sync_engine, "connect", set_sqlite_pragmas)
+    metrics.instrument_engine(db_engine.sync_engine)
+    profiling.instrument_engine(db_engine.sync_engine)
+    return db_engine
 
-# Create SessionLocal class
+# Create SQLAlchemy engines, the async one used by the read endpoints
+engine = create_db_engine()
+async_engine = create_async_db_engine()
+
+# Create SessionLocal classes
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 # Create Base class
 Base = declarative_base()
@@ -27,4 +112,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Dependency to get an async DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,32 @@
+"""Persisted data version, for invalidating caches across processes.
+
+Every transaction that inserts or updates jobs, their tags or their
+duplicate links advances the version, so API processes serving cached
+responses notice writes made by the scrape worker or a backfill script.
+"""
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from . import schemas
+
+# Primary key of the single row holding the version
+DATA_VERSION_ID = 1
+
+
+def data_version_query():
+    """Query for a number that changes whenever stored jobs change, by any process."""
+    DataVersion = schemas.DataVersion
+    return select(func.coalesce(
+        select(DataVersion.version).where(DataVersion.id == DATA_VERSION_ID).scalar_subquery(), 0
+    ))
+
+
+def bump_data_version(db: Session) -> None:
+    """Advance the data version, within the caller's transaction."""
+    DataVersion = schemas.DataVersion
+    result = db.execute(
+        update(DataVersion).where(DataVersion.id == DATA_VERSION_ID).values(version=DataVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        # Databases created from the models start without the row
+        db.execute(insert(DataVersion).values(id=DATA_VERSION_ID, version=1))
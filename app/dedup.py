@@ -0,0 +1,352 @@
+"""Near-duplicate job detection with MinHash signatures and an LSH index.
+
+Usage:
+    python -m app.dedup    # Fingerprint stored jobs that have no fingerprint yet
+"""
+import argparse
+import hashlib
+import importlib.util
+import os
+import random
+import re
+import zlib
+from array import array
+from collections import defaultdict
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from . import schemas
+from .dataversion import bump_data_version
+from .stats import refresh_stat_counters
+
+# numpy computes signatures about 20x faster, but is optional
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+if HAS_NUMPY:
+    import numpy as np
+
+NUM_PERM = 128
+BANDS = 16
+
+# Estimated Jaccard similarity above which two jobs are the same posting
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "1") != "0"
+
+_MAX_HASH = (1 << 32) - 1
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Description word n-grams used as shingles
+SHINGLE_SIZE = 3
+
+# Jobs with fewer shingles, e.g. without a description, are never marked as
+# duplicates: with so few features, unrelated postings from one company
+# differ in a single title word and MinHash noise can push them over the
+# threshold.
+MIN_SHINGLES = 20
+
+Signature = Tuple[int, ...]
+
+
+def normalize(text: Optional[str]) -> List[str]:
+    """Lowercase a field and split it into words, dropping punctuation."""
+    return _WORD.findall((text or "").lower())
+
+
+def job_shingles(job: Mapping[str, Any]) -> Set[str]:
+    """
+    Features of a job compared between postings.
+
+    Title, company and location words are tagged with their field so that
+    e.g. a company named like a title word doesn't match it. Descriptions
+    contribute overlapping word n-grams, which dominate when present.
+
+    Args:
+        job: Job dictionary or row with title, company, location and description
+
+    Returns:
+        Set of shingles
+    """
+    shingles = set()
+    for field in ("title", "company", "location"):
+        shingles.update(f"{field[0]}:{word}" for word in normalize(job.get(field)))
+    words = normalize(job.get("description"))
+    if len(words) < SHINGLE_SIZE:
+        shingles.update(f"d:{word}" for word in words)
+    else:
+        shingles.update(map(" ".join, zip(*(words[i:] for i in range(SHINGLE_SIZE)))))
+    return shingles
+
+
+class MinHasher:
+    """Computes MinHash signatures whose agreement estimates Jaccard similarity."""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        """
+        Args:
+            num_perm: Number of hash permutations, i.e. signature length
+            seed: Seed of the permutations; signatures only compare under the same seed
+        """
+        self.num_perm = num_perm
+        rng = random.Random(seed)
+        # x -> (a * x + b) mod 2**32 with an odd a permutes the 32-bit hashes
+        self._a = [rng.randrange(0, 1 << 32) | 1 for _ in range(num_perm)]
+        self._b = [rng.randrange(0, 1 << 32) for _ in range(num_perm)]
+        if HAS_NUMPY:
+            self._np_a = np.array(self._a, dtype=np.uint32)[:, None]
+            self._np_b = np.array(self._b, dtype=np.uint32)[:, None]
+
+    def signature(self, shingles: Iterable[str]) -> Signature:
+        return self.signatures([shingles])[0]
+
+    def signatures(self, shingle_sets: Iterable[Iterable[str]]) -> List[Signature]:
+        """Signatures of many shingle sets, computed together when numpy is available."""
+        hash_lists = [[zlib.crc32(shingle.encode()) for shingle in shingles] for shingles in shingle_sets]
+        if not HAS_NUMPY:
+            return [self._signature(hashes) for hashes in hash_lists]
+
+        results: List[Optional[Signature]] = [None] * len(hash_lists)
+        filled = [i for i, hashes in enumerate(hash_lists) if hashes]
+        for i in set(range(len(hash_lists))) - set(filled):
+            results[i] = (_MAX_HASH,) * self.num_perm
+        if filled:
+            values = np.fromiter((value for i in filled for value in hash_lists[i]), dtype=np.uint32)
+            # uint32 arithmetic wraps around, which is the mod 2**32
+            permuted = self._np_a * values[None, :]
+            permuted += self._np_b
+            # Minimum over each set's run of columns
+            offsets = np.cumsum([0] + [len(hash_lists[i]) for i in filled[:-1]])
+            minima = np.minimum.reduceat(permuted, offsets, axis=1).T.tolist()
+            for i, signature in zip(filled, minima):
+                results[i] = tuple(signature)
+        return results
+
+    def _signature(self, hashes: List[int]) -> Signature:
+        if not hashes:
+            return (_MAX_HASH,) * self.num_perm
+        return tuple(
+            min((a * value + b) & _MAX_HASH for value in hashes)
+            for a, b in zip(self._a, self._b)
+        )
+
+
+minhasher = MinHasher()
+
+
+def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def encode_signature(signature: Sequence[int]) -> bytes:
+    return array("I", signature).tobytes()
+
+
+def decode_signature(data: bytes) -> Signature:
+    values = array("I")
+    values.frombytes(data)
+    return tuple(values)
+
+
+def band_keys(signature: Sequence[int], bands: int = BANDS) -> List[int]:
+    """
+    Bucket keys of a signature's bands.
+
+    Two signatures share a bucket in some band, and so become candidates,
+    with probability ``1 - (1 - s**rows)**bands`` for similarity ``s``.
+    With 16 bands of 8 rows that is 95% at s=0.8 and 6% at s=0.5. Keys are
+    stable across processes so they can be stored.
+
+    Args:
+        signature: MinHash signature
+        bands: Number of bands the signature is split into
+
+    Returns:
+        One signed 64-bit key per band
+    """
+    rows = len(signature) // bands
+    data = encode_signature(signature)
+    return [
+        int.from_bytes(hashlib.blake2b(data[band * rows * 4:(band + 1) * rows * 4], digest_size=8,
+                                       person=band.to_bytes(2, "little")).digest(), "little", signed=True)
+        for band in range(bands)
+    ]
+
+
+class LSHIndex:
+    """In-memory locality-sensitive hashing index of MinHash signatures.
+
+    Lookups only compare a signature against the items sharing one of its
+    band buckets instead of against every indexed item.
+    """
+
+    def __init__(self, bands: int = BANDS):
+        self.bands = bands
+        self.signatures: Dict[Hashable, Signature] = {}
+        self._buckets: List[Dict[int, List[Hashable]]] = [defaultdict(list) for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def add(self, key: Hashable, signature: Signature, keys: Optional[List[int]] = None) -> None:
+        self.signatures[key] = signature
+        for band, bucket in enumerate(keys or band_keys(signature, self.bands)):
+            self._buckets[band][bucket].append(key)
+
+    def candidates(self, signature: Signature, keys: Optional[List[int]] = None) -> Set[Hashable]:
+        found = set()
+        for band, bucket in enumerate(keys or band_keys(signature, self.bands)):
+            found.update(self._buckets[band].get(bucket, ()))
+        return found
+
+    def query(self, signature: Signature, threshold: float = DEDUP_THRESHOLD,
+              keys: Optional[List[int]] = None) -> List[Tuple[Hashable, float]]:
+        """Indexed items similar to a signature, most similar first."""
+        matches = [
+            (key, similarity(signature, self.signatures[key]))
+            for key in self.candidates(signature, keys)
+        ]
+        return sorted((match for match in matches if match[1] >= threshold), key=lambda match: -match[1])
+
+
+def _stored_matches(db: Session, keys_by_job: Dict[int, List[int]]) -> Dict[Tuple[int, int], Set[int]]:
+    """Stored jobs sharing each (band, bucket) pair of the given jobs."""
+    buckets: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+    LSHBucket = schemas.JobLSHBucket
+    for band in range(BANDS):
+        band_buckets = list({keys[band] for keys in keys_by_job.values()})
+        for start in range(0, len(band_buckets), 500):
+            rows = db.execute(
+                select(LSHBucket.bucket, LSHBucket.job_id)
+                .where(LSHBucket.band == band, LSHBucket.bucket.in_(band_buckets[start:start + 500]))
+            )
+            for bucket, job_id in rows:
+                buckets[(band, bucket)].add(job_id)
+    return buckets
+
+
+def index_jobs(db: Session, jobs: Sequence[Tuple[int, Mapping[str, Any]]],
+               threshold: float = DEDUP_THRESHOLD) -> Dict[int, int]:
+    """
+    Fingerprint new jobs and link duplicates to their canonical job.
+
+    Candidates come from the persisted LSH buckets and from earlier jobs
+    of the same batch, so each batch is checked incrementally. A duplicate
+    points at the canonical job of its best match, which is the first
+    stored posting. Jobs with fewer than MIN_SHINGLES shingles are indexed
+    but never marked as duplicates. Runs within the caller's transaction.
+
+    Args:
+        db: Database session
+        jobs: (job id, job dictionary) pairs, in insertion order
+        threshold: Estimated Jaccard similarity above which jobs are duplicates
+
+    Returns:
+        Dictionary mapping each duplicate's id to its canonical job id
+    """
+    if not jobs:
+        return {}
+    # SQLite reuses the ids of deleted jobs, so drop the rows a deleted job left behind
+    job_ids = [job_id for job_id, _ in jobs]
+    db.execute(delete(schemas.JobLSHBucket).where(schemas.JobLSHBucket.job_id.in_(job_ids)))
+    db.execute(delete(schemas.JobFingerprint).where(schemas.JobFingerprint.job_id.in_(job_ids)))
+    shingle_sets = {job_id: job_shingles(job_data) for job_id, job_data in jobs}
+    signatures = dict(zip(shingle_sets, minhasher.signatures(shingle_sets.values())))
+    keys_by_job = {job_id: band_keys(signature) for job_id, signature in signatures.items()}
+    stored_buckets = _stored_matches(db, keys_by_job)
+
+    stored_ids = set().union(*stored_buckets.values()) if stored_buckets else set()
+    stored = {}
+    canonical_of = {}
+    if stored_ids:
+        rows = db.execute(
+            select(schemas.JobFingerprint.job_id, schemas.JobFingerprint.signature, schemas.Job.canonical_id)
+            .join(schemas.Job, schemas.Job.id == schemas.JobFingerprint.job_id)
+            .where(schemas.JobFingerprint.job_id.in_(stored_ids))
+        )
+        for job_id, signature, canonical_id in rows:
+            stored[job_id] = decode_signature(signature)
+            canonical_of[job_id] = canonical_id or job_id
+
+    batch = LSHIndex()
+    duplicates = {}
+    for job_id, _ in jobs:
+        signature, keys = signatures[job_id], keys_by_job[job_id]
+        # Bucket rows can outlive their job; those have no stored fingerprint to compare
+        candidates = {
+            candidate for band, bucket in enumerate(keys)
+            for candidate in stored_buckets.get((band, bucket), ()) if candidate in stored
+        }
+        matches = [(candidate, similarity(signature, stored[candidate])) for candidate in candidates]
+        matches.extend(batch.query(signature, threshold, keys))
+        matches = [match for match in matches if match[1] >= threshold]
+        if matches and len(shingle_sets[job_id]) >= MIN_SHINGLES:
+            best = max(matches, key=lambda match: (match[1], -match[0]))[0]
+            duplicates[job_id] = canonical_of[job_id] = canonical_of.get(best, best)
+        else:
+            canonical_of[job_id] = job_id
+        batch.add(job_id, signature, keys)
+
+    db.execute(schemas.JobFingerprint.__table__.insert(), [
+        {"job_id": job_id, "signature": encode_signature(signature)} for job_id, signature in signatures.items()
+    ])
+    db.execute(schemas.JobLSHBucket.__table__.insert(), [
+        {"band": band, "bucket": bucket, "job_id": job_id}
+        for job_id, keys in keys_by_job.items() for band, bucket in enumerate(keys)
+    ])
+    if duplicates:
+        db.execute(update(schemas.Job), [
+            {"id": job_id, "canonical_id": canonical_id} for job_id, canonical_id in duplicates.items()
+        ])
+    return duplicates
+
+
+def backfill_fingerprints(db: Session, batch_size: int = 1000) -> int:
+    """
+    Fingerprint stored jobs that were inserted without one, oldest first.
+
+    Args:
+        db: Database session
+        batch_size: Jobs fingerprinted per transaction
+
+    Returns:
+        Number of jobs marked as duplicates
+    """
+    Job = schemas.Job
+    duplicates = 0
+    while True:
+        rows = db.execute(
+            select(Job.id, Job.title, Job.company, Job.location, Job.description)
+            .outerjoin(schemas.JobFingerprint, schemas.JobFingerprint.job_id == Job.id)
+            .where(schemas.JobFingerprint.job_id.is_(None))
+            .order_by(Job.id).limit(batch_size)
+        ).mappings().all()
+        if not rows:
+            if duplicates:
+                # Duplicates drop out of the stats, so rebuild the counters and invalidate cached stats
+                refresh_stat_counters(db)
+                bump_data_version(db)
+                db.commit()
+            return duplicates
+        marked = index_jobs(db, [(row["id"], row) for row in rows])
+        if marked:
+            bump_data_version(db)
+        db.commit()
+        duplicates += len(marked)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fingerprint stored jobs and mark near-duplicates")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Jobs fingerprinted per transaction")
+    args = parser.parse_args()
+
+    from .database import SessionLocal, engine
+    from .migrations import upgrade_database
+    upgrade_database(engine)
+    with SessionLocal() as db:
+        duplicates = backfill_fingerprints(db, args.batch_size)
+    print(f"Marked {duplicates} jobs as duplicates")
+
+
+if __name__ == "__main__":
+    main()
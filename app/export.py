@@ -0,0 +1,207 @@
+"""Streaming bulk export of jobs as NDJSON, CSV or Parquet.
+
+Rows are read with a streaming cursor and encoded a chunk at a time, so
+exporting the whole jobs table takes the same memory as exporting a page.
+"""
+import csv
+import importlib.util
+import io
+import json
+import os
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import schemas
+
+# Parquet export needs pyarrow, which is optional
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+if HAS_PYARROW:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+# Rows read from the database and encoded at a time
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "1000"))
+
+EXPORT_COLUMNS = [
+    schemas.Job.id,
+    schemas.Job.title,
+    schemas.Job.company,
+    schemas.Job.location,
+    schemas.Job.description,
+    schemas.Job.salary_min,
+    schemas.Job.salary_max,
+    schemas.Job.salary_text,
+    schemas.Job.url,
+    schemas.Job.source,
+    schemas.Job.is_remote,
+    schemas.Job.posted_date,
+    schemas.Job.created_at,
+    schemas.Job.updated_at,
+    schemas.Job.canonical_id,
+]
+FIELDS = [column.key for column in EXPORT_COLUMNS] + ["tags"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+async def _tags_by_job(db: AsyncSession, job_ids: Sequence[int]) -> Dict[int, List[str]]:
+    rows = await db.execute(
+        select(schemas.JobTag.job_id, schemas.Tag.name)
+        .join(schemas.Tag, schemas.Tag.id == schemas.JobTag.tag_id)
+        .where(schemas.JobTag.job_id.in_(job_ids))
+        .order_by(schemas.JobTag.job_id, schemas.Tag.name)
+    )
+    tags = defaultdict(list)
+    for job_id, name in rows:
+        tags[job_id].append(name)
+    return tags
+
+
+async def iter_job_rows(db: AsyncSession, statement, chunk_size: int = EXPORT_CHUNK_SIZE) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Stream the jobs selected by a statement in chunks of row dictionaries.
+
+    Args:
+        db: Async database session
+        statement: Select of EXPORT_COLUMNS
+        chunk_size: Rows fetched from the cursor at a time
+
+    Yields:
+        Lists of at most chunk_size rows, each with its job's tag names
+    """
+    result = await db.stream(statement.execution_options(yield_per=chunk_size))
+    async for partition in result.mappings().partitions():
+        rows = [dict(row) for row in partition]
+        tags = await _tags_by_job(db, [row["id"] for row in rows])
+        for row in rows:
+            row["tags"] = tags.get(row["id"], [])
+        yield rows
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def encode_ndjson(rows: Iterable[Dict[str, Any]]) -> bytes:
+    return "".join(json.dumps(row, default=_json_default) + "\n" for row in rows).encode()
+
+
+def csv_header() -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(FIELDS)
+    return buffer.getvalue().encode()
+
+
+def encode_csv(rows: Iterable[Dict[str, Any]]) -> bytes:
+    """CSV lines of rows, with tags joined by commas and dates in ISO format."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([
+            ",".join(value) if field == "tags"
+            else value.isoformat() if isinstance(value, datetime)
+            else value
+            for field, value in ((field, row[field]) for field in FIELDS)
+        ])
+    return buffer.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file collecting the bytes written since the last drain.
+
+    The Parquet writer records file offsets in the footer, so the position
+    keeps counting even though drained bytes are dropped.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _parquet_schema():
+    return pa.schema([
+        ("id", pa.int64()),
+        ("title", pa.string()),
+        ("company", pa.string()),
+        ("location", pa.string()),
+        ("description", pa.string()),
+        ("salary_min", pa.float64()),
+        ("salary_max", pa.float64()),
+        ("salary_text", pa.string()),
+        ("url", pa.string()),
+        ("source", pa.string()),
+        ("is_remote", pa.bool_()),
+        ("posted_date", pa.timestamp("us")),
+        ("created_at", pa.timestamp("us")),
+        ("updated_at", pa.timestamp("us")),
+        ("canonical_id", pa.int64()),
+        ("tags", pa.list_(pa.string())),
+    ])
+
+
+async def stream_export(db: AsyncSession, statement, format: str,
+                        chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+    """
+    Encode the jobs selected by a statement, one chunk of rows at a time.
+
+    Args:
+        db: Async database session
+        statement: Select of EXPORT_COLUMNS
+        format: ``ndjson``, ``csv`` or ``parquet`` (one row group per chunk)
+        chunk_size: Rows fetched and encoded at a time (default: EXPORT_CHUNK_SIZE)
+
+    Yields:
+        Encoded bytes
+    """
+    chunks = iter_job_rows(db, statement, chunk_size or EXPORT_CHUNK_SIZE)
+    if format == "ndjson":
+        async for rows in chunks:
+            yield encode_ndjson(rows)
+    elif format == "csv":
+        yield csv_header()
+        async for rows in chunks:
+            yield encode_csv(rows)
+    elif format == "parquet":
+        schema = _parquet_schema()
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema)
+        try:
+            async for rows in chunks:
+                writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()
+    else:
+        raise ValueError(f"Unknown export format: {format}")
+
+
+def export_filename(format: str, now: Optional[datetime] = None) -> str:
+    return f"jobs-{(now or datetime.utcnow()):%Y%m%d-%H%M%S}.{format}"
@@ -0,0 +1,132 @@
+"""Facet counts for job searches: jobs per source, company, tag, remote and salary range.
+
+Every facet is counted under the search's filters in a single query, so
+a filter sidebar takes one round trip however many facets it shows.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import case, func, literal, null, select, true, union_all
+from sqlalchemy.orm import Query, Session
+
+from . import schemas
+
+# Facets returned by /jobs/search, in response order
+SOURCE = "source"
+COMPANY = "company"
+TAG = "tag"
+REMOTE = "is_remote"
+SALARY = "salary"
+FACETS = (SOURCE, COMPANY, TAG, REMOTE, SALARY)
+
+# Most frequent values kept per facet
+FACET_LIMIT = 20
+
+# Yearly salary_min ranges counted by the salary facet, None meaning unbounded
+SALARY_BUCKETS: List[Tuple[Optional[int], Optional[int]]] = [
+    (None, 40000), (40000, 60000), (60000, 80000), (80000, 100000), (100000, 150000), (150000, None),
+]
+
+_TOTAL = "total"
+
+
+def salary_bucket_label(low: Optional[int], high: Optional[int]) -> str:
+    """Label a salary bucket as "low-high", "<high" or "low+"."""
+    if low is None:
+        return f"<{high}"
+    if high is None:
+        return f"{low}+"
+    return f"{low}-{high}"
+
+
+_salary_order = {salary_bucket_label(low, high): n for n, (low, high) in enumerate(SALARY_BUCKETS)}
+
+
+def _salary_bucket(salary_min):
+    # Buckets are checked in order, so each only tests its upper bound; no salary gives NULL
+    return case(*(
+        (salary_min < high if high is not None else salary_min >= low, salary_bucket_label(low, high))
+        for low, high in SALARY_BUCKETS
+    ))
+
+
+def facets_statement(jobs_query: Query):
+    """
+    Build one statement counting the jobs matched by a query per facet value.
+
+    The matched jobs are selected once, as a common table expression, and
+    each facet is a GROUP BY over it; the grouped counts are combined with
+    UNION ALL and cut to the FACET_LIMIT most frequent values per facet.
+
+    Args:
+        jobs_query: ORM Query over schemas.Job yielding each job at most once
+
+    Returns:
+        A Select of (facet, value, count) rows, with a single "total" row
+        holding the number of jobs matched
+    """
+    Job = schemas.Job
+    matched = jobs_query.with_entities(
+        Job.id.label("id"), Job.source, Job.company, Job.is_remote, Job.salary_min,
+    ).order_by(None).cte("matched")
+    count = func.count()
+
+    def grouped(facet: str, value, source=matched, key=None, present=None):
+        # Group on key (default: the value itself), skipping rows where present is false
+        key = value if key is None else key
+        statement = select(
+            literal(facet).label("facet"), value.label("value"), count.label("count"),
+            func.row_number().over(order_by=(count.desc(), value)).label("position"),
+        ).select_from(source)
+        return statement.where(key.isnot(None) if present is None else present).group_by(key)
+
+    # Tags are counted per tag_id, so only one name is looked up per tag
+    tag_counts = (
+        select(schemas.JobTag.tag_id, func.count().label("count"))
+        .join(matched, schemas.JobTag.job_id == matched.c.id)
+        .group_by(schemas.JobTag.tag_id)
+        .subquery()
+    )
+    counts = union_all(
+        select(
+            literal(_TOTAL).label("facet"), null().label("value"), count.label("count"), literal(1).label("position"),
+        ).select_from(matched),
+        grouped(SOURCE, matched.c.source),
+        grouped(COMPANY, matched.c.company),
+        select(
+            literal(TAG).label("facet"), schemas.Tag.name.label("value"), tag_counts.c.count,
+            func.row_number().over(order_by=(tag_counts.c.count.desc(), schemas.Tag.name)).label("position"),
+        ).join(schemas.Tag, schemas.Tag.id == tag_counts.c.tag_id),
+        # Grouped on the label, so NULL joins False in a single "false" row
+        grouped(REMOTE, case((matched.c.is_remote, "true"), else_="false"), present=true()),
+        grouped(SALARY, _salary_bucket(matched.c.salary_min), present=matched.c.salary_min.isnot(None)),
+    ).subquery()
+    return (
+        select(counts.c.facet, counts.c.value, counts.c.count)
+        .where(counts.c.position <= FACET_LIMIT)
+        .order_by(counts.c.facet, counts.c.count.desc(), counts.c.value)
+    )
+
+
+def compute_facets(db: Session, jobs_query: Query) -> Tuple[int, Dict[str, List[Dict[str, Any]]]]:
+    """
+    Count the jobs matched by a query, in total and per facet value, in one query.
+
+    Args:
+        db: Database session
+        jobs_query: ORM Query over schemas.Job yielding each job at most once
+
+    Returns:
+        The number of jobs matched, and for each facet a list of
+        {"value": ..., "count": ...} entries, most frequent first
+    """
+    total = 0
+    facets: Dict[str, List[Dict[str, Any]]] = {facet: [] for facet in FACETS}
+    for facet, value, count in db.execute(facets_statement(jobs_query)):
+        if facet == _TOTAL:
+            total = count
+            continue
+        if facet == REMOTE:
+            value = value == "true"
+        facets[facet].append({"value": value, "count": count})
+    facets[SALARY].sort(key=lambda entry: _salary_order[entry["value"]])
+    return total, facets
@@ -0,0 +1,196 @@
+from sqlalchemy import select, insert, delete
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence, Set
+
+from . import schemas
+from .dataversion import bump_data_version
+from .dedup import DEDUP_ENABLED, index_jobs
+from .salary import parse_salaries, salary_fields
+from .stats import increment_stat_counters, refresh_stat_counters
+from .tagging import TagExtractor, get_tag_extractor
+
+# Maximum number of bound values in a single IN (...) lookup
+LOOKUP_CHUNK_SIZE = 500
+
+
+def _chunks(items: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _insert_ignoring_conflicts(db: Session, table, index_elements: List[str]):
+    """Build an INSERT that skips rows violating the given unique columns.
+
+    Uses ``ON CONFLICT DO NOTHING`` on SQLite and PostgreSQL. Other dialects
+    get a plain INSERT, so callers must filter out existing rows beforehand.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing(index_elements=index_elements)
+    if dialect == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing(index_elements=index_elements)
+    return insert(table)
+
+
+def find_existing_urls(db: Session, urls: Iterable[str]) -> Set[str]:
+    """Return the subset of ``urls`` that is already stored in the jobs table."""
+    urls = list({url for url in urls if url})
+    existing = set()
+    for chunk in _chunks(urls, LOOKUP_CHUNK_SIZE):
+        existing.update(db.scalars(select(schemas.Job.url).where(schemas.Job.url.in_(chunk))))
+    return existing
+
+
+def _job_rows(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Turn scraped job dicts into uniform rows for an executemany INSERT."""
+    table = schemas.Job.__table__
+    keys = {key for job in jobs for key in job if key in table.columns and key != "id"}
+    defaults = {}
+    for key in keys:
+        default = table.columns[key].default
+        defaults[key] = default.arg if default is not None and default.is_scalar else None
+    return [{key: job.get(key, defaults[key]) for key in keys} for job in jobs]
+
+
+def _fill_salaries(jobs: List[Dict[str, Any]]) -> None:
+    """Parse the salary text of jobs that have it but no salary yet, in place."""
+    unparsed = [job for job in jobs if job.get("salary_text") and job.get("salary_min") is None]
+    for job, salary in zip(unparsed, parse_salaries(job["salary_text"] for job in unparsed)):
+        job.update(salary_fields(salary))
+
+
+def _resolve_tag_ids(db: Session, names: Set[str]) -> Dict[str, int]:
+    """Map tag names to ids, creating any tags that don't exist yet."""
+    names = sorted(names)
+    tag_ids = {}
+    for chunk in _chunks(names, LOOKUP_CHUNK_SIZE):
+        tag_ids.update(db.execute(select(schemas.Tag.name, schemas.Tag.id).where(schemas.Tag.name.in_(chunk))).all())
+
+    missing = [name for name in names if name not in tag_ids]
+    if missing:
+        db.execute(_insert_ignoring_conflicts(db, schemas.Tag.__table__, ["name"]), [{"name": name} for name in missing])
+        for chunk in _chunks(missing, LOOKUP_CHUNK_SIZE):
+            tag_ids.update(db.execute(select(schemas.Tag.name, schemas.Tag.id).where(schemas.Tag.name.in_(chunk))).all())
+    return tag_ids
+
+
+def _insert_job_tags(db: Session, job_ids: Sequence[int], tag_sets: Sequence[Set[str]]) -> None:
+    """Link each job to its set of tag names, creating missing tags."""
+    tag_ids = _resolve_tag_ids(db, set().union(*tag_sets))
+    job_tags = [
+        {"job_id": job_id, "tag_id": tag_ids[name]}
+        for job_id, names in zip(job_ids, tag_sets)
+        for name in names
+    ]
+    if job_tags:
+        db.execute(_insert_ignoring_conflicts(db, schemas.JobTag.__table__, ["job_id", "tag_id"]), job_tags)
+
+
+def ingest_jobs(db: Session, jobs: Iterable[Dict[str, Any]], extractor: Optional[TagExtractor] = None) -> int:
+    """
+    Store a batch of scraped jobs and their tags in a single transaction.
+
+    Jobs whose URL is already stored are skipped, as are jobs without a URL.
+    Jobs with salary text but no parsed salary get it parsed.
+    Near-duplicates of stored jobs are stored, linked to their canonical
+    job through ``canonical_id``.
+    The whole batch costs one URL lookup, one bulk job insert, one tag
+    lookup/insert, one bulk job-tag insert (per chunk of LOOKUP_CHUNK_SIZE
+    values) and one stats counter upsert instead of several commits per job.
+
+    Args:
+        db: Database session
+        jobs: Job dictionaries as returned by the scrapers
+        extractor: Tag extractor to use (default: the configured vocabulary)
+
+    Returns:
+        Number of jobs inserted
+    """
+    extractor = extractor or get_tag_extractor()
+
+    # Deduplicate within the batch, keeping the first listing for each URL
+    jobs_by_url = {}
+    for job_data in jobs:
+        if job_data.get("url"):
+            jobs_by_url.setdefault(job_data["url"], job_data)
+
+    try:
+        existing = find_existing_urls(db, jobs_by_url)
+        new_jobs = [job_data for url, job_data in jobs_by_url.items() if url not in existing]
+        if not new_jobs:
+            return 0
+
+        _fill_salaries(new_jobs)
+        db.execute(_insert_ignoring_conflicts(db, schemas.Job.__table__, ["url"]), _job_rows(new_jobs))
+
+        # Fetch the ids of the rows we just inserted
+        job_ids = {}
+        new_urls = [job_data["url"] for job_data in new_jobs]
+        for chunk in _chunks(new_urls, LOOKUP_CHUNK_SIZE):
+            job_ids.update(db.execute(select(schemas.Job.url, schemas.Job.id).where(schemas.Job.url.in_(chunk))).all())
+
+        # Tag all new jobs at once
+        tagged = [job_data for job_data in new_jobs if job_data["url"] in job_ids]
+        tag_sets = extractor.extract_many(tagged)
+        _insert_job_tags(db, [job_ids[job_data["url"]] for job_data in tagged], tag_sets)
+
+        # Link near-duplicates to their canonical job and leave them out of the stats
+        duplicates = {}
+        if DEDUP_ENABLED:
+            duplicates = index_jobs(db, [(job_ids[job_data["url"]], job_data) for job_data in tagged])
+        counted = [i for i, job_data in enumerate(tagged) if job_ids[job_data["url"]] not in duplicates]
+        increment_stat_counters(db, [tagged[i] for i in counted], [tag_sets[i] for i in counted])
+        bump_data_version(db)
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return len(new_jobs)
+
+
+def retag_jobs(db: Session, extractor: Optional[TagExtractor] = None, batch_size: int = LOOKUP_CHUNK_SIZE) -> int:
+    """
+    Recompute the tags of every stored job, e.g. after the vocabulary changed.
+
+    Jobs are processed in id order, batch_size at a time, and each batch's
+    tags are replaced in its own transaction.
+
+    Args:
+        db: Database session
+        extractor: Tag extractor to use (default: the configured vocabulary)
+        batch_size: Number of jobs to load and retag per transaction
+
+    Returns:
+        Number of jobs retagged
+    """
+    extractor = extractor or get_tag_extractor()
+    last_id = 0
+    retagged = 0
+
+    while True:
+        rows = db.execute(
+            select(schemas.Job.id, schemas.Job.title, schemas.Job.description)
+            .where(schemas.Job.id > last_id)
+            .order_by(schemas.Job.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            # Tag counts changed wholesale, so rebuild the stats counters
+            refresh_stat_counters(db)
+            return retagged
+
+        job_ids = [row.id for row in rows]
+        try:
+            db.execute(delete(schemas.JobTag).where(schemas.JobTag.job_id.in_(job_ids)))
+            _insert_job_tags(db, job_ids, [extractor.extract(row.title, row.description) for row in rows])
+            bump_data_version(db)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        last_id = job_ids[-1]
+        retagged += len(rows)
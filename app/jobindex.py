@@ -0,0 +1,250 @@
+"""In-process read index of the filterable job columns, for /jobs listings.
+
+The columns /jobs filters and sorts on are kept in NumPy arrays, newest job
+first, with a packed bitset per tag. Filtered listings are resolved with
+vectorized masks and only the requested page is loaded from the database.
+The index is off unless JOB_INDEX_ENABLED=1 and requires numpy.
+"""
+import importlib.util
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from . import schemas
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+if HAS_NUMPY:
+    import numpy as np
+
+JOB_INDEX_ENABLED = os.getenv("JOB_INDEX_ENABLED", "0") == "1"
+
+# Seconds after which the index is rebuilt from scratch, picking up jobs
+# edited in place (e.g. salaries re-parsed or jobs retagged) that the
+# incremental refresh after each scrape commit, which only adds jobs, misses
+JOB_INDEX_REBUILD_INTERVAL = float(os.getenv("JOB_INDEX_REBUILD_INTERVAL", "3600"))
+
+# Jobs read from the database per query while loading
+LOAD_BATCH_SIZE = 10000
+
+# Jobs masked per step when resolving a page; a multiple of 8 so blocks start on a bitset byte
+SCAN_BLOCK_SIZE = 32768
+
+# Stand-ins for posted_date NULL, placed where the dialect sorts NULLs in descending order
+_NULL_LAST = -(1 << 62)
+_NULL_FIRST = 1 << 62
+_NULLS_FIRST_DIALECTS = {"postgresql", "oracle"}
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _timestamp(value: datetime) -> int:
+    return (value - _EPOCH) // _MICROSECOND
+
+
+class JobIndex:
+    """Filterable job columns held in memory, in /jobs listing order.
+
+    Jobs are sorted newest first, ties broken by id, as /jobs orders them
+    with offset pagination. The arrays are replaced, never modified, so a
+    lookup in progress keeps reading a consistent snapshot while the index
+    is refreshed.
+    """
+
+    # Filters page() resolves; listings using any other filter are served from SQL
+    FILTERS = ("is_remote", "min_salary", "tag", "days")
+
+    def __init__(self, enabled: bool = JOB_INDEX_ENABLED, rebuild_interval: float = JOB_INDEX_REBUILD_INTERVAL):
+        self.enabled = enabled and HAS_NUMPY
+        self.rebuild_interval = rebuild_interval
+        self.loaded = False
+        self.generation: Optional[int] = None
+        self.hits = 0
+        self.fallbacks = 0
+        self.load_seconds = 0.0
+        self._lock = threading.Lock()
+        self._rebuild_at = 0.0
+        self._last_id = 0
+        # (columns, tag bitsets), swapped in one assignment
+        self._snapshot: Tuple[Dict[str, Any], Dict[str, Any]] = ({}, {})
+
+    def supports(self, **filters: Any) -> bool:
+        """Whether a listing with these filters can be resolved by the index."""
+        return self.enabled and all(value is None for name, value in filters.items() if name not in self.FILTERS)
+
+    def sync(self, db: Session, generation: Optional[int] = None) -> None:
+        """
+        Bring the index up to date before a lookup.
+
+        Loads it on first use or when a rebuild is due, and otherwise adds
+        the jobs inserted since the last refresh when the response cache
+        generation, bumped after each scrape commit, has changed.
+
+        Args:
+            db: Database session
+            generation: Current response cache generation
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if not self.loaded or time.monotonic() >= self._rebuild_at:
+                self._load(db, full=True)
+            elif generation != self.generation:
+                self._load(db, full=False)
+            self.generation = generation
+
+    def load(self, db: Session) -> None:
+        """Build the index from every stored job."""
+        with self._lock:
+            self._load(db, full=True)
+
+    def refresh(self, db: Session) -> None:
+        """Add the jobs inserted since the index was last loaded or refreshed."""
+        with self._lock:
+            self._load(db, full=False)
+
+    def _load(self, db: Session, full: bool) -> None:
+        start = time.perf_counter()
+        last_id = 0 if full else self._last_id
+        Job = schemas.Job
+        null_posted = _NULL_FIRST if db.get_bind().dialect.name in _NULLS_FIRST_DIALECTS else _NULL_LAST
+
+        ids, posted, remote, salary, canonical = [], [], [], [], []
+        while True:
+            rows = db.execute(
+                select(Job.id, Job.posted_date, Job.is_remote, Job.salary_min, Job.canonical_id)
+                .where(Job.id > last_id).order_by(Job.id).limit(LOAD_BATCH_SIZE)
+            ).all()
+            for job_id, posted_date, is_remote, salary_min, canonical_id in rows:
+                ids.append(job_id)
+                posted.append(null_posted if posted_date is None else _timestamp(posted_date))
+                # -1 for a NULL is_remote, which matches neither filter, as in SQL
+                remote.append(-1 if is_remote is None else int(is_remote))
+                salary.append(float("nan") if salary_min is None else salary_min)
+                canonical.append(canonical_id is None)
+            if len(rows) < LOAD_BATCH_SIZE:
+                break
+            last_id = rows[-1].id
+        if not ids and not full:
+            return
+
+        # Tags of the jobs just read, not of any inserted since
+        tag_rows = db.execute(
+            select(schemas.JobTag.job_id, schemas.Tag.name).join(schemas.Tag)
+            .where(schemas.JobTag.job_id > (0 if full else self._last_id), schemas.JobTag.job_id <= ids[-1])
+        ).all() if ids else []
+
+        new = {
+            "ids": np.array(ids, dtype=np.int64),
+            "posted": np.array(posted, dtype=np.int64),
+            "remote": np.array(remote, dtype=np.int8),
+            "salary": np.array(salary, dtype=np.float64),
+            "canonical": np.array(canonical, dtype=bool),
+        }
+        # New jobs go after the indexed ones, which stay in listing order, until everything is sorted
+        old_columns, old_tags = self._snapshot
+        old_count = 0 if full or not old_columns else len(old_columns["ids"])
+        columns = {
+            name: np.concatenate([old_columns[name], values]) if old_count else values
+            for name, values in new.items()
+        }
+        count = len(columns["ids"])
+        tags = {
+            name: np.concatenate([np.unpackbits(bits, count=old_count).view(bool), np.zeros(len(ids), dtype=bool)])
+            for name, bits in (old_tags.items() if old_count else ())
+        }
+        if tag_rows:
+            positions = old_count + np.searchsorted(new["ids"], np.array([row[0] for row in tag_rows], dtype=np.int64))
+            names = np.array([row[1] for row in tag_rows], dtype=object)
+            for name in set(names.tolist()):
+                tags.setdefault(name, np.zeros(count, dtype=bool))[positions[names == name]] = True
+
+        # Listing order: newest first, then by id
+        order = np.lexsort((columns["ids"], -columns["posted"]))
+        self._snapshot = (
+            {name: values[order] for name, values in columns.items()},
+            {name: np.packbits(values[order]) for name, values in tags.items()},
+        )
+
+        if ids or full:
+            self._last_id = ids[-1] if ids else 0
+        if full:
+            self._rebuild_at = time.monotonic() + self.rebuild_interval
+        self.loaded = True
+        self.load_seconds = time.perf_counter() - start
+
+    def page(self, is_remote: Optional[bool] = None, min_salary: Optional[float] = None, tag: Optional[str] = None,
+             days: Optional[int] = None, collapse: bool = True, skip: int = 0, limit: int = 100) -> List[int]:
+        """
+        Resolve a /jobs listing to the ids of one page of jobs.
+
+        Args:
+            is_remote: Only remote (True) or onsite (False) jobs
+            min_salary: Minimum salary_min
+            tag: Only jobs with this tag
+            days: Only jobs posted within this many days
+            collapse: Leave out near-duplicates of earlier postings
+            skip: Number of matching jobs to skip
+            limit: Maximum number of ids to return
+
+        Returns:
+            Job ids in listing order
+        """
+        columns, tags = self._snapshot
+        if not columns or (tag and tag not in tags):
+            return []
+        threshold = _timestamp(datetime.utcnow() - timedelta(days=days)) if days else None
+
+        # Jobs are masked a block at a time, stopping once the page is filled
+        wanted = skip + limit
+        matches, found = [], 0
+        count = len(columns["ids"])
+        for start in range(0, count, SCAN_BLOCK_SIZE):
+            stop = min(start + SCAN_BLOCK_SIZE, count)
+            mask = columns["canonical"][start:stop].copy() if collapse else np.ones(stop - start, dtype=bool)
+            if is_remote is not None:
+                mask &= columns["remote"][start:stop] == is_remote
+            if min_salary:
+                # NaN, for jobs without a salary, compares false
+                mask &= columns["salary"][start:stop] >= min_salary
+            if tag:
+                mask &= np.unpackbits(tags[tag][start // 8:(stop + 7) // 8], count=stop - start).view(bool)
+            if threshold is not None:
+                posted = columns["posted"][start:stop]
+                mask &= (posted >= threshold) & (posted != _NULL_FIRST)
+            matches.append(np.flatnonzero(mask) + start)
+            found += len(matches[-1])
+            if found >= wanted:
+                break
+        if not matches:
+            return []
+        positions = np.concatenate(matches)[skip:wanted]
+        return columns["ids"][positions].tolist()
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes held by the index's arrays."""
+        columns, tags = self._snapshot
+        return sum(values.nbytes for values in columns.values()) + sum(bits.nbytes for bits in tags.values())
+
+    def stats(self) -> Dict[str, Any]:
+        columns, tags = self._snapshot
+        return {
+            "enabled": self.enabled,
+            "loaded": self.loaded,
+            "jobs": len(columns["ids"]) if columns else 0,
+            "tags": len(tags),
+            "memory_bytes": self.memory_bytes,
+            "load_seconds": round(self.load_seconds, 3),
+            "generation": self.generation,
+            "hits": self.hits,
+            "fallbacks": self.fallbacks,
+        }
+
+
+job_index = JobIndex()
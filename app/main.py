@@ -1,19 +1,40 @@
-from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks, Query
+from fastapi import FastAPI, Depends, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
-from typing import List, Optional
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, defer, selectinload
+from sqlalchemy import select
+from typing import List, Optional, Literal, Union
 from datetime import datetime, timedelta
 
 from . import models, schemas
-from .database import engine, get_db
-from .scraper.indeed import IndeedScraper
-# You would import other scrapers similarly
-# from .scraper.linkedin import LinkedInScraper
-# from .scraper.vtjobs import VTJobsScraper
+from .database import SessionLocal, engine, get_async_db, get_db
+from .dataversion import data_version_query
+from .jobindex import job_index
+from .migrations import upgrade_database
+from .scrape_queue import enqueue_scrape
+from .search import ensure_fulltext_index, filter_contains, filter_keyword, filter_prefix
+from .pagination import decode_cursor, encode_cursor, fetch_keyset_page
+from .stats import ensure_stat_counters, read_stats
+from .cache import render_json, response_cache
+from .facets import compute_facets
+from .export import EXPORT_COLUMNS, HAS_PYARROW, MEDIA_TYPES, export_filename, stream_export
+from .scraper.fetchcache import fetch_metrics
+from .metrics import CONTENT_TYPE, MetricsMiddleware, registry
+from .profiling import ProfilingMiddleware, profiler
 
-# Create tables in the database
-schemas.Base.metadata.create_all(bind=engine)
+# Create or migrate the tables in the database
+upgrade_database(engine)
+ensure_fulltext_index(engine)
+
+# Build the stats counters of a database that has jobs but no counters yet
+with SessionLocal() as db:
+    ensure_stat_counters(db)
+
+# Load the in-memory job index, if enabled
+if job_index.enabled:
+    with SessionLocal() as db:
+        job_index.load(db)
 
 app = FastAPI(
     title="Vermont Jobs API",
@@ -30,55 +51,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize scrapers
-indeed_scraper = IndeedScraper()
-# linkedin_scraper = LinkedInScraper()
-# vtjobs_scraper = VTJobsScraper()
-
-# Background task to run scrapers and update the database
-def run_scrapers(db: Session):
-    """Run all scrapers and update the database with new job listings."""
-    keywords = ["software developer", "data analyst", "web developer", "engineer"]
-    
-    for keyword in keywords:
-        # Run Indeed scraper
-        indeed_jobs = indeed_scraper.search(keyword)
-        for job_data in indeed_jobs:
-            # Check if job already exists by URL
-            existing_job = db.query(schemas.Job).filter(schemas.Job.url == job_data["url"]).first()
-            
-            if not existing_job:
-                # Get full job details (description)
-                if "url" in job_data and job_data["url"]:
-                    details = indeed_scraper.get_job_details(job_data["url"])
-                    job_data["description"] = details.get("description", job_data.get("description", ""))
-                
-                # Create new job record
-                new_job = schemas.Job(**job_data)
-                db.add(new_job)
-                db.commit()
-                db.refresh(new_job)
-                
-                # Extract and add tags (this would be more sophisticated in production)
-                keywords_to_check = ["python", "javascript", "react", "sql", "remote", "junior", "senior"]
-                for keyword in keywords_to_check:
-                    if keyword.lower() in job_data["title"].lower() or keyword.lower() in job_data.get("description", "").lower():
-                        # Check if tag exists
-                        tag = db.query(schemas.Tag).filter(schemas.Tag.name == keyword).first()
-                        if not tag:
-                            tag = schemas.Tag(name=keyword)
-                            db.add(tag)
-                            db.commit()
-                            db.refresh(tag)
-                        
-                        # Add relationship
-                        job_tag = schemas.JobTag(job_id=new_job.id, tag_id=tag.id)
-                        db.add(job_tag)
-                        db.commit()
-        
-        # Add similar blocks for other scrapers
-        # linkedin_jobs = linkedin_scraper.search(keyword)
-        # vtjobs_jobs = vtjobs_scraper.search(keyword)
+# Record request latency per route; added after CORS so it also times the CORS middleware
+app.add_middleware(MetricsMiddleware)
+
+# Profile requests sent with X-Profile: 1 or ?profile=1, when PROFILING_ENABLED=1
+app.add_middleware(ProfilingMiddleware)
+
+async def sync_cache_version(db: AsyncSession):
+    """Invalidate cached responses when another process has changed jobs since the last check."""
+    if response_cache.version_due():
+        response_cache.observe_version(await db.scalar(data_version_query()))
 
 # API Routes
 @app.get("/", tags=["General"])
@@ -90,14 +72,33 @@ async def root():
         "documentation": "/docs",
     }
 
-@app.post("/jobs/scrape", tags=["Admin"])
-async def scrape_jobs(background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
-    """Trigger a job scraping run (admin endpoint)."""
-    background_tasks.add_task(run_scrapers, db)
-    return {"message": "Job scraping started in the background"}
+@app.post("/jobs/scrape", status_code=202, tags=["Admin"])
+def scrape_jobs(db: Session = Depends(get_db)):
+    """
+    Queue a job scraping run (admin endpoint).
+    
+    The run is executed by the scrape worker (`python -m app.worker`).
+    Triggers made while a run is still queued join that run instead of
+    queuing another one.
+    """
+    run, created = enqueue_scrape(db)
+    return {
+        "message": "Job scraping queued",
+        "run_id": run.id,
+        "status": run.status,
+        "coalesced": not created,
+    }
 
-@app.get("/jobs", response_model=List[models.Job], tags=["Jobs"])
-async def get_jobs(
+@app.get("/jobs/scrape/{run_id}", response_model=models.ScrapeRun, tags=["Admin"])
+def get_scrape_run(run_id: int, db: Session = Depends(get_db)):
+    """Get the status and progress of a scrape run (admin endpoint)."""
+    run = db.get(schemas.ScrapeRun, run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Scrape run not found")
+    return models.ScrapeRun.from_orm(run)
+
+def _filter_jobs(
+    db: Session,
     keyword: Optional[str] = None,
     company: Optional[str] = None,
     location: Optional[str] = None,
@@ -105,37 +106,29 @@ async def get_jobs(
     min_salary: Optional[float] = None,
     tag: Optional[str] = None,
     days: Optional[int] = None,
-    skip: int = 0, 
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    company_prefix: Optional[str] = None,
+    location_prefix: Optional[str] = None,
 ):
-    """
-    Get all jobs with optional filtering.
-    
-    - **keyword**: Search in job title and description
-    - **company**: Filter by company name
-    - **location**: Filter by job location
-    - **is_remote**: Filter for remote jobs
-    - **min_salary**: Filter by minimum salary
-    - **tag**: Filter by job tag
-    - **days**: Filter for jobs posted within last X days
-    - **skip**: Number of records to skip (pagination)
-    - **limit**: Maximum number of records to return (pagination)
-    """
+    """Build the filtered jobs query and its keyword relevance ordering, if any."""
     query = db.query(schemas.Job)
+    rank = None
+    dialect = db.get_bind().dialect.name
     
     # Apply filters
     if keyword:
-        query = query.filter(or_(
-            schemas.Job.title.ilike(f"%{keyword}%"),
-            schemas.Job.description.ilike(f"%{keyword}%")
-        ))
+        query, rank = filter_keyword(query, keyword, dialect)
     
     if company:
-        query = query.filter(schemas.Job.company.ilike(f"%{company}%"))
+        query = query.filter(filter_contains(schemas.Job.company_lower, company))
     
     if location:
-        query = query.filter(schemas.Job.location.ilike(f"%{location}%"))
+        query = query.filter(filter_contains(schemas.Job.location_lower, location))
+    
+    if company_prefix:
+        query = query.filter(filter_prefix(schemas.Job.company_lower, company_prefix, dialect))
+    
+    if location_prefix:
+        query = query.filter(filter_prefix(schemas.Job.location_lower, location_prefix, dialect))
     
     if is_remote is not None:
         query = query.filter(schemas.Job.is_remote == is_remote)
@@ -150,66 +143,327 @@ async def get_jobs(
         date_threshold = datetime.utcnow() - timedelta(days=days)
         query = query.filter(schemas.Job.posted_date >= date_threshold)
     
-    # Apply pagination
-    jobs = query.order_by(schemas.Job.posted_date.desc()).offset(skip).limit(limit).all()
+    return query, rank
+
+def _search_jobs(db: Session, search: models.JobSearch):
+    """Build the jobs query for a JobSearch: the /jobs filters plus source, maximum salary, tags and posting dates."""
+    query, rank = _filter_jobs(db, keyword=search.keyword, company=search.company, location=search.location,
+                               is_remote=search.is_remote, min_salary=search.min_salary,
+                               company_prefix=search.company_prefix, location_prefix=search.location_prefix)
+    
+    if search.source:
+        query = query.filter(schemas.Job.source == search.source)
+    
+    if search.max_salary:
+        query = query.filter(schemas.Job.salary_max <= search.max_salary)
+    
+    # Jobs with every tag, without joining one row per tag
+    for tag in search.tags or []:
+        query = query.filter(schemas.Job.id.in_(
+            select(schemas.JobTag.job_id).join(schemas.Tag).where(schemas.Tag.name == tag)
+        ))
+    
+    if search.posted_after:
+        query = query.filter(schemas.Job.posted_date >= search.posted_after)
     
-    return jobs
+    if search.posted_before:
+        query = query.filter(schemas.Job.posted_date < search.posted_before)
+    
+    return query, rank
+
+def _fetch_jobs_by_id(session: Session, job_ids: List[int], fields: str):
+    """Load jobs and their tags by id, in the order given."""
+    query = session.query(schemas.Job).options(selectinload(schemas.Job.tags)).filter(schemas.Job.id.in_(job_ids))
+    if fields == "summary":
+        query = query.options(defer(schemas.Job.description))
+    jobs = {job.id: job for job in query}
+    return [jobs[job_id] for job_id in job_ids if job_id in jobs]
+
+@app.get("/jobs", response_model=Union[List[models.Job], List[models.JobSummary]], tags=["Jobs"])
+async def get_jobs(
+    keyword: Optional[str] = None,
+    company: Optional[str] = None,
+    location: Optional[str] = None,
+    is_remote: Optional[bool] = None,
+    min_salary: Optional[float] = None,
+    tag: Optional[str] = None,
+    days: Optional[int] = None,
+    company_prefix: Optional[str] = None,
+    location_prefix: Optional[str] = None,
+    sort: Literal["date", "relevance"] = "date",
+    skip: int = 0, 
+    limit: int = 100,
+    paginate: Literal["offset", "cursor"] = "offset",
+    cursor: Optional[str] = None,
+    fields: Literal["full", "summary"] = "full",
+    collapse: bool = True,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get all jobs with optional filtering.
+    
+    - **keyword**: Search in job title and description
+    - **company**: Filter by company name, any part of it, ignoring case
+    - **location**: Filter by job location, any part of it, ignoring case
+    - **is_remote**: Filter for remote jobs
+    - **min_salary**: Filter by minimum salary
+    - **tag**: Filter by job tag
+    - **days**: Filter for jobs posted within last X days
+    - **company_prefix**, **location_prefix**: Filter by the start of the company name or location, ignoring
+      case; served by an index, so best for names that few jobs share
+    - **sort**: `date` (newest first) or `relevance` (best keyword match first)
+    - **skip**: Number of records to skip (pagination)
+    - **limit**: Maximum number of records to return (pagination)
+    - **paginate**: `offset` (skip/limit) or `cursor` (keyset pagination)
+    - **cursor**: Continue after the page that returned this cursor (implies `paginate=cursor`)
+    - **fields**: `full`, or `summary` to leave out job descriptions
+    - **collapse**: Only list the first posting of near-duplicate jobs found across sources and keywords
+    
+    In cursor mode the `X-Next-Cursor` response header holds the cursor for
+    the next page and is absent on the last page. Cursor pages stay stable
+    while new jobs are added and cost the same at any depth.
+    """
+    if cursor is not None:
+        paginate = "cursor"
+    if paginate == "cursor" and sort == "relevance":
+        raise HTTPException(status_code=400, detail="Cursor pagination only supports sort=date")
+    
+    filters = dict(keyword=keyword, company=company, location=location, is_remote=is_remote,
+                   min_salary=min_salary, tag=tag, days=days, company_prefix=company_prefix,
+                   location_prefix=location_prefix)
+    
+    def render(session: Session):
+        model = models.JobSummary if fields == "summary" else models.Job
+        
+        # Structured filters in date order are resolved by the in-memory index, if enabled
+        if paginate == "offset" and job_index.supports(**filters):
+            job_index.sync(session, response_cache.generation)
+            job_ids = job_index.page(is_remote=is_remote, min_salary=min_salary, tag=tag, days=days,
+                                     collapse=collapse, skip=skip, limit=limit)
+            job_index.hits += 1
+            return render_json([model.from_orm(job) for job in _fetch_jobs_by_id(session, job_ids, fields)])
+        if job_index.enabled:
+            job_index.fallbacks += 1
+        
+        query, rank = _filter_jobs(session, **filters)
+        if collapse:
+            query = query.filter(schemas.Job.canonical_id.is_(None))
+        query = query.options(selectinload(schemas.Job.tags))
+        if fields == "summary":
+            query = query.options(defer(schemas.Job.description))
+        headers = {}
+        
+        if paginate == "cursor":
+            try:
+                position = decode_cursor(cursor) if cursor else None
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            
+            jobs = fetch_keyset_page(query, position, limit, session.get_bind().dialect.name)
+            if len(jobs) == limit and jobs:
+                headers["X-Next-Cursor"] = encode_cursor(jobs[-1].posted_date, jobs[-1].id)
+        else:
+            if sort == "relevance" and rank is not None:
+                query = query.order_by(rank)
+            
+            # Apply pagination, keeping jobs posted on the same date in insertion order
+            jobs = (
+                query.order_by(schemas.Job.posted_date.desc(), schemas.Job.id)
+                .offset(skip).limit(limit).all()
+            )
+        
+        return render_json([model.from_orm(job) for job in jobs], headers)
+    
+    params = dict(filters, sort=sort, skip=skip if paginate == "offset" else None,
+                  limit=limit, paginate=paginate, cursor=cursor, fields=fields, collapse=collapse)
+    await sync_cache_version(db)
+    return await response_cache.get_or_render_async("jobs", params, lambda: db.run_sync(render))
+
+@app.get("/jobs/export", tags=["Jobs"])
+async def export_jobs(
+    format: Literal["ndjson", "csv", "parquet"] = "ndjson",
+    keyword: Optional[str] = None,
+    company: Optional[str] = None,
+    location: Optional[str] = None,
+    is_remote: Optional[bool] = None,
+    min_salary: Optional[float] = None,
+    tag: Optional[str] = None,
+    days: Optional[int] = None,
+    company_prefix: Optional[str] = None,
+    location_prefix: Optional[str] = None,
+    collapse: bool = True,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Export every job matching the filters, in id order.
+    
+    - **format**: `ndjson` (one JSON object per line), `csv` or `parquet` (requires pyarrow)
+    
+    Takes the same filters as `GET /jobs`. The response is streamed while
+    rows are read from the database, so memory use doesn't grow with the
+    number of jobs exported.
+    """
+    if format == "parquet" and not HAS_PYARROW:
+        raise HTTPException(status_code=400, detail="Parquet export requires pyarrow")
+    
+    query, _ = _filter_jobs(db.sync_session, keyword=keyword, company=company, location=location,
+                            is_remote=is_remote, min_salary=min_salary, tag=tag, days=days,
+                            company_prefix=company_prefix, location_prefix=location_prefix)
+    if collapse:
+        query = query.filter(schemas.Job.canonical_id.is_(None))
+    statement = query.with_entities(*EXPORT_COLUMNS).order_by(schemas.Job.id).statement
+    return StreamingResponse(
+        stream_export(db, statement, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{export_filename(format)}"'},
+    )
+
+def job_search(
+    keyword: Optional[str] = None,
+    company: Optional[str] = None,
+    location: Optional[str] = None,
+    source: Optional[str] = None,
+    is_remote: Optional[bool] = None,
+    min_salary: Optional[float] = None,
+    max_salary: Optional[float] = None,
+    tags: Optional[List[str]] = Query(None),
+    posted_after: Optional[datetime] = None,
+    posted_before: Optional[datetime] = None,
+    company_prefix: Optional[str] = None,
+    location_prefix: Optional[str] = None,
+) -> models.JobSearch:
+    """Read a JobSearch from the query string; lists such as tags are repeated parameters."""
+    return models.JobSearch(
+        keyword=keyword, company=company, location=location, source=source, is_remote=is_remote,
+        min_salary=min_salary, max_salary=max_salary, tags=tags, posted_after=posted_after,
+        posted_before=posted_before, company_prefix=company_prefix, location_prefix=location_prefix,
+    )
+
+@app.get("/jobs/search", response_model=models.JobSearchResult, tags=["Jobs"])
+async def search_jobs(
+    search: models.JobSearch = Depends(job_search),
+    sort: Literal["date", "relevance"] = "date",
+    skip: int = 0,
+    limit: int = 100,
+    fields: Literal["full", "summary"] = "full",
+    collapse: bool = True,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Search jobs and count the matches per facet, in one request.
+    
+    - **keyword**, **company**, **location**, **company_prefix**, **location_prefix**, **is_remote**,
+      **min_salary**: As for `GET /jobs`
+    - **source**: Filter by job source
+    - **max_salary**: Filter by maximum salary
+    - **tags**: Only jobs with every tag given (repeat the parameter for several tags)
+    - **posted_after**, **posted_before**: Filter by posting date
+    
+    Returns a page of jobs, the total number of matches and, for `source`,
+    `company`, `tag`, `is_remote` and `salary` (yearly minimum salary
+    ranges), the number of matching jobs per value. Facet counts apply the
+    same filters as the page and are computed in a single query.
+    """
+    def render(session: Session):
+        query, rank = _search_jobs(session, search)
+        if collapse:
+            query = query.filter(schemas.Job.canonical_id.is_(None))
+        total, facets = compute_facets(session, query)
+        
+        query = query.options(selectinload(schemas.Job.tags))
+        if fields == "summary":
+            query = query.options(defer(schemas.Job.description))
+        if sort == "relevance" and rank is not None:
+            query = query.order_by(rank)
+        jobs = query.order_by(schemas.Job.posted_date.desc(), schemas.Job.id).offset(skip).limit(limit).all()
+        
+        model = models.JobSummary if fields == "summary" else models.Job
+        return render_json({"total": total, "jobs": [model.from_orm(job) for job in jobs], "facets": facets})
+    
+    params = dict(search.dict(), sort=sort, skip=skip, limit=limit, fields=fields, collapse=collapse)
+    params["tags"] = tuple(search.tags) if search.tags else None
+    await sync_cache_version(db)
+    return await response_cache.get_or_render_async("search", params, lambda: db.run_sync(render))
 
 @app.get("/jobs/{job_id}", response_model=models.Job, tags=["Jobs"])
-async def get_job(job_id: int, db: Session = Depends(get_db)):
+async def get_job(job_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific job by ID."""
-    job = db.query(schemas.Job).filter(schemas.Job.id == job_id).first()
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    return job
+    def render(session: Session):
+        job = (
+            session.query(schemas.Job)
+            .options(selectinload(schemas.Job.tags))
+            .filter(schemas.Job.id == job_id)
+            .first()
+        )
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return render_json(models.Job.from_orm(job))
+    
+    await sync_cache_version(db)
+    return await response_cache.get_or_render_async("job", {"job_id": job_id}, lambda: db.run_sync(render))
 
 @app.get("/tags", response_model=List[models.Tag], tags=["Tags"])
-async def get_tags(db: Session = Depends(get_db)):
+async def get_tags(db: AsyncSession = Depends(get_async_db)):
     """Get all available job tags."""
-    tags = db.query(schemas.Tag).all()
-    return tags
+    def render(session: Session):
+        tags = session.query(schemas.Tag).all()
+        return render_json([models.Tag.from_orm(tag) for tag in tags])
+    
+    await sync_cache_version(db)
+    return await response_cache.get_or_render_async("tags", {}, lambda: db.run_sync(render))
 
 @app.get("/stats", tags=["Stats"])
-async def get_stats(db: Session = Depends(get_db)):
-    """Get job statistics."""
-    # Total job count
-    total_jobs = db.query(schemas.Job).count()
-    
-    # Jobs by source
-    jobs_by_source = db.query(
-        schemas.Job.source, 
-        db.func.count(schemas.Job.id)
-    ).group_by(schemas.Job.source).all()
-    
-    # Remote vs. on-site jobs
-    remote_jobs = db.query(schemas.Job).filter(schemas.Job.is_remote == True).count()
-    onsite_jobs = total_jobs - remote_jobs
-    
-    # Jobs posted in the last week
-    week_ago = datetime.utcnow() - timedelta(days=7)
-    recent_jobs = db.query(schemas.Job).filter(schemas.Job.posted_date >= week_ago).count()
-    
-    # Top companies by job count
-    top_companies = db.query(
-        schemas.Job.company, 
-        db.func.count(schemas.Job.id)
-    ).group_by(schemas.Job.company).order_by(db.func.count(schemas.Job.id).desc()).limit(10).all()
-    
-    # Popular tags
-    popular_tags = db.query(
-        schemas.Tag.name, 
-        db.func.count(schemas.JobTag.job_id)
-    ).join(schemas.JobTag).group_by(schemas.Tag.name).order_by(db.func.count(schemas.JobTag.job_id).desc()).limit(10).all()
+async def get_stats(fresh: bool = False, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get job statistics.
     
-    return {
-        "total_jobs": total_jobs,
-        "jobs_by_source": dict(jobs_by_source),
-        "remote_jobs": remote_jobs,
-        "onsite_jobs": onsite_jobs,
-        "recent_jobs": recent_jobs,
-        "top_companies": dict(top_companies),
-        "popular_tags": dict(popular_tags)
-    }
+    Statistics are read from counters that are updated as jobs are ingested.
+    
+    - **fresh**: Recompute the counters from the jobs table first
+    """
+    if fresh:
+        stats = render_json(await db.run_sync(read_stats, fresh=True))
+        response_cache.set(response_cache.make_key("stats", {}), stats)
+        return stats.to_response()
+    
+    async def render():
+        return render_json(await db.run_sync(read_stats))
+    
+    await sync_cache_version(db)
+    return await response_cache.get_or_render_async("stats", {}, render)
+
+@app.get("/cache/stats", tags=["Admin"])
+async def get_cache_stats():
+    """Get response cache size and hit/miss/eviction counters (admin endpoint)."""
+    return response_cache.stats()
+
+@app.get("/index/stats", tags=["Admin"])
+async def get_index_stats():
+    """Get the in-memory job index's size, memory footprint and hit/fallback counters (admin endpoint)."""
+    return job_index.stats()
+
+@app.get("/scraper/stats", tags=["Admin"])
+async def get_scraper_stats():
+    """Get fetch cache counters: conditional hits, bytes saved and parses avoided (admin endpoint)."""
+    return fetch_metrics.snapshot()
+
+@app.get("/metrics", tags=["Admin"])
+async def get_metrics():
+    """Get request, SQL and scraper metrics in the Prometheus text format (admin endpoint)."""
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
+@app.get("/profiles", tags=["Admin"])
+async def list_profiles():
+    """List the kept request profiles, newest first, with their duration and SQL time (admin endpoint)."""
+    return profiler.list()
+
+@app.get("/profiles/{profile_id}", tags=["Admin"])
+async def get_profile(profile_id: int):
+    """Get a request profile: its SQL statements with their timings and its sampled call tree (admin endpoint)."""
+    profile = profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile.to_dict()
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,356 @@
+"""Prometheus-style metrics for the API, the database and the scrapers.
+
+Counters and histograms are kept in process and rendered in the Prometheus
+text exposition format by ``GET /metrics``. The scrape worker, a separate
+process, serves its own on WORKER_METRICS_PORT. Recording a value costs a
+lock and a dict lookup, so the hooks stay on in production; set
+METRICS_ENABLED=0 to turn them off.
+"""
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Sequence, Tuple
+from urllib.parse import parse_qsl
+
+from sqlalchemy import event
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") != "0"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds, from a fast SQL query to a slow scrape stage
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Query parameters that make up the filter combination label of the jobs routes
+FILTER_PARAMS = frozenset({
+    "keyword", "company", "location", "company_prefix", "location_prefix", "source", "is_remote", "min_salary", "max_salary",
+    "tag", "tags", "days", "posted_after", "posted_before",
+})
+FILTER_ROUTES = frozenset({"/jobs", "/jobs/search", "/jobs/export"})
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class _Metric:
+    TYPE = ""
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, labelnames: Sequence[str]):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Labels:
+        return tuple(map(labels.__getitem__, self.labelnames))
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.TYPE}"]
+
+
+class Counter(_Metric):
+    """A value that only goes up, per combination of label values."""
+
+    TYPE = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        if not self.registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in values
+        ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, with their count and sum."""
+
+    TYPE = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # Per label values: [count per bucket (the last one above every bound), sum]
+        self._values: Dict[Labels, list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        if not self.registry.enabled:
+            return
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the seconds spent in the with block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return sum(entry[0]) if entry else 0
+
+    def sum(self, **labels: str) -> float:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return entry[1] if entry else 0.0
+
+    def sums(self, labelname: str) -> Dict[str, float]:
+        """Sums of the observations, added up per value of one label."""
+        position = self.labelnames.index(labelname)
+        totals: Dict[str, float] = {}
+        with self._lock:
+            for key, (_, total) in self._values.items():
+                totals[key[position]] = totals.get(key[position], 0.0) + total
+        return totals
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        lines = self.header()
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class MetricsRegistry:
+    """The metrics of a process, rendered together."""
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self._metrics: Dict[str, _Metric] = {}
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(self, name, documentation, labelnames, buckets=buckets))
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        for metric in self._metrics.values():
+            metric.reset()
+
+
+registry = MetricsRegistry()
+
+# API
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "Latency of API requests by route template.", ("method", "route", "status"))
+jobs_filter_duration = registry.histogram(
+    "jobs_filter_duration_seconds", "Latency of job listing requests by the combination of filters used.",
+    ("route", "filters"))
+
+# Database
+db_query_duration = registry.histogram(
+    "db_query_duration_seconds", "Duration of SQL statements by kind.", ("operation",))
+
+# Scrapers
+scraper_pages_fetched = registry.counter(
+    "scraper_pages_fetched_total", "Search and detail pages fetched.", ("source", "kind"))
+scraper_bytes_downloaded = registry.counter(
+    "scraper_bytes_downloaded_total", "Bytes of pages downloaded.", ("source",))
+scraper_parse_duration = registry.histogram(
+    "scraper_parse_duration_seconds", "Time spent parsing fetched pages.", ("source", "kind"))
+scraper_detail_fetch_duration = registry.histogram(
+    "scraper_detail_fetch_duration_seconds", "Latency of job detail page requests, retries included.", ("source",))
+scraper_jobs_inserted = registry.counter(
+    "scraper_jobs_inserted_total", "Jobs stored by scrapes.", ("source",))
+scraper_duplicates_skipped = registry.counter(
+    "scraper_duplicates_skipped_total",
+    "Listings skipped as already stored or already claimed by another search of the run.", ("source", "reason"))
+scrape_stage_duration = registry.histogram(
+    "scrape_stage_duration_seconds",
+    "Time spent by scrapes per stage: request, rate_limit_wait, retry_backoff, parse, filter_new and ingest.",
+    ("stage",))
+
+
+_OPERATIONS = {"select": "select", "insert": "insert", "update": "update", "delete": "delete"}
+
+
+def _operation(statement: str) -> str:
+    head = statement[:6].lower()
+    if head in _OPERATIONS:
+        return _OPERATIONS[head]
+    return "with" if head.startswith("with") else "other"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    db_query_duration.observe(time.perf_counter() - conn.info["query_start"].pop(), operation=_operation(statement))
+
+
+def _handle_error(exception_context):
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(db_engine) -> None:
+    """Time every SQL statement run through a (sync) engine."""
+    if not registry.enabled:
+        return
+    event.listen(db_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(db_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(db_engine, "handle_error", _handle_error)
+
+
+def filter_combination(query_string: bytes) -> str:
+    """The sorted names of the filters set in a query string, or "none"."""
+    names = {name for name, value in parse_qsl(query_string.decode("latin-1")) if value and name in FILTER_PARAMS}
+    return ",".join(sorted(names)) or "none"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording the latency of every request by route template.
+
+    Requests to the job listing routes are also recorded by filter
+    combination. Requests matching no route are labelled "unmatched" so
+    that arbitrary paths don't create new label values.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not registry.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            http_request_duration.observe(elapsed, method=scope["method"], route=path, status=str(status))
+            if path in FILTER_ROUTES:
+                jobs_filter_duration.observe(elapsed, route=path, filters=filter_combination(scope["query_string"]))
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """
+    Serve the metrics over HTTP from a daemon thread, for processes without an API.
+
+    Args:
+        port: Port to listen on (0 picks a free one)
+        host: Interface to listen on
+
+    Returns:
+        The running server; ``server.server_address`` holds the bound port
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
+
+
+class StageTimer:
+    """Adds up the time a scrape spends in each stage, from the stage histogram."""
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._sums = scrape_stage_duration.sums("stage")
+
+    def breakdown(self) -> Dict[str, float]:
+        """Seconds spent per stage since the timer started, and the elapsed "total"."""
+        current = scrape_stage_duration.sums("stage")
+        stages = {
+            stage: round(total - self._sums.get(stage, 0.0), 3)
+            for stage, total in current.items() if total > self._sums.get(stage, 0.0)
+        }
+        stages["total"] = round(time.perf_counter() - self._start, 3)
+        return stages
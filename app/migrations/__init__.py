@@ -0,0 +1,56 @@
+"""Database schema migrations, managed with Alembic.
+
+Usage:
+    python -m app.migrations    # Bring the database at DATABASE_URL up to date
+    alembic upgrade head        # The same, with the Alembic command line
+"""
+from pathlib import Path
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection, Engine
+
+from .. import schemas
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent
+
+
+def alembic_config(connection: Optional[Connection] = None) -> Config:
+    """Alembic configuration running on a connection, or on DATABASE_URL without one."""
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    config.attributes["configure_logger"] = False
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def upgrade_database(db_engine: Engine) -> None:
+    """
+    Create or upgrade the database schema to the latest migration.
+
+    A new database gets the tables straight from the models and is stamped
+    with the latest revision. Databases created before migrations existed
+    are upgraded from the first revision, which only adds what is missing.
+
+    Args:
+        db_engine: Engine of the database to upgrade
+    """
+    with db_engine.begin() as conn:
+        config = alembic_config(conn)
+        current = MigrationContext.configure(conn).get_current_revision()
+        if current is None and not inspect(conn).has_table(schemas.Job.__tablename__):
+            schemas.Base.metadata.create_all(bind=conn)
+            command.stamp(config, "head")
+        else:
+            command.upgrade(config, "head")
+
+
+def main():
+    from ..database import engine
+    upgrade_database(engine)
+    with engine.connect() as conn:
+        print(f"Database is at revision {MigrationContext.configure(conn).get_current_revision()}")
@@ -0,0 +1,49 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+from app import schemas
+from app.database import DATABASE_URL, create_db_engine
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = schemas.Base.metadata
+
+
+def _configure(**kwargs):
+    # Batch mode recreates tables for the ALTERs SQLite doesn't support
+    context.configure(target_metadata=target_metadata, render_as_batch=True, **kwargs)
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL without connecting to the database."""
+    _configure(url=config.get_main_option("sqlalchemy.url") or DATABASE_URL, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run the migrations on the connection passed by app.migrations, or on DATABASE_URL."""
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _configure(connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    engine = create_db_engine(config.get_main_option("sqlalchemy.url") or DATABASE_URL)
+    try:
+        with engine.connect() as connection:
+            _configure(connection=connection)
+            with context.begin_transaction():
+                context.run_migrations()
+    finally:
+        engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
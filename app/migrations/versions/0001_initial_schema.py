@@ -0,0 +1,128 @@
+"""Initial schema: jobs, tags, stat counters, scrape runs and dedup fingerprints
+
+Databases created before migrations were introduced already hold some or
+all of these tables, so only missing tables, columns and indexes are added.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _create_table(inspector, name, *columns):
+    if not inspector.has_table(name):
+        op.create_table(name, *columns)
+
+
+def _create_index(inspector, table, name, columns, **kwargs):
+    if name not in {index["name"] for index in inspector.get_indexes(table)}:
+        op.create_index(name, table, columns, **kwargs)
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    _create_table(
+        inspector, "jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String()),
+        sa.Column("company", sa.String()),
+        sa.Column("location", sa.String()),
+        sa.Column("description", sa.Text()),
+        sa.Column("salary_min", sa.Float(), nullable=True),
+        sa.Column("salary_max", sa.Float(), nullable=True),
+        sa.Column("salary_text", sa.String(), nullable=True),
+        sa.Column("url", sa.String()),
+        sa.Column("posted_date", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+        sa.Column("source", sa.String()),
+        sa.Column("is_remote", sa.Boolean()),
+        sa.Column("canonical_id", sa.Integer(), sa.ForeignKey("jobs.id"), nullable=True),
+    )
+    # Columns added to jobs before migrations existed
+    columns = {column["name"] for column in inspector.get_columns("jobs")}
+    missing = [
+        column for column in (
+            sa.Column("salary_text", sa.String(), nullable=True),
+            sa.Column("canonical_id", sa.Integer(), nullable=True),
+        )
+        if column.name not in columns
+    ]
+    if missing:
+        with op.batch_alter_table("jobs") as batch:
+            for column in missing:
+                batch.add_column(column)
+    inspector = sa.inspect(op.get_bind())
+    for column in ("id", "title", "company", "location", "source", "canonical_id"):
+        _create_index(inspector, "jobs", f"ix_jobs_{column}", [column])
+    _create_index(inspector, "jobs", "ix_jobs_url", ["url"], unique=True)
+    _create_index(inspector, "jobs", "ix_jobs_posted_date_id", [sa.text("posted_date DESC"), sa.text("id DESC")])
+
+    _create_table(
+        inspector, "tags",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String()),
+    )
+    _create_index(inspector, "tags", "ix_tags_id", ["id"])
+    _create_index(inspector, "tags", "ix_tags_name", ["name"], unique=True)
+
+    _create_table(
+        inspector, "job_tags",
+        sa.Column("job_id", sa.Integer(), sa.ForeignKey("jobs.id"), primary_key=True),
+        sa.Column("tag_id", sa.Integer(), sa.ForeignKey("tags.id"), primary_key=True),
+    )
+
+    _create_table(
+        inspector, "job_fingerprints",
+        sa.Column("job_id", sa.Integer(), sa.ForeignKey("jobs.id"), primary_key=True),
+        sa.Column("signature", sa.LargeBinary(), nullable=False),
+    )
+    _create_table(
+        inspector, "job_lsh_buckets",
+        sa.Column("band", sa.Integer(), primary_key=True),
+        sa.Column("bucket", sa.BigInteger(), primary_key=True),
+        sa.Column("job_id", sa.Integer(), sa.ForeignKey("jobs.id"), primary_key=True),
+    )
+
+    _create_table(
+        inspector, "stat_counters",
+        sa.Column("dimension", sa.String(), primary_key=True),
+        sa.Column("key", sa.String(), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+    )
+    _create_index(inspector, "stat_counters", "ix_stat_counters_dimension_count", ["dimension", "count"])
+
+    _create_table(
+        inspector, "scrape_runs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("triggers", sa.Integer(), nullable=False),
+        sa.Column("requested_at", sa.DateTime()),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(), nullable=True),
+        sa.Column("worker", sa.String(), nullable=True),
+        sa.Column("jobs_found", sa.Integer(), nullable=False),
+        sa.Column("jobs_inserted", sa.Integer(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+    )
+    _create_index(inspector, "scrape_runs", "ix_scrape_runs_id", ["id"])
+    active = sa.text("status IN ('queued', 'running')")
+    _create_index(inspector, "scrape_runs", "uq_scrape_runs_active_status", ["status"], unique=True,
+                  sqlite_where=active, postgresql_where=active)
+
+
+def downgrade() -> None:
+    # Full-text index created by app.search.ensure_fulltext_index
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("DROP TABLE IF EXISTS jobs_fts")
+    for table in ("scrape_runs", "stat_counters", "job_lsh_buckets", "job_fingerprints", "job_tags", "tags", "jobs"):
+        op.drop_table(table)
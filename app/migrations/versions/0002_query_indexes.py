@@ -0,0 +1,98 @@
+"""Indexes for the /jobs filters and lowercased company/location columns
+
+- (is_remote, posted_date, id) for remote filters in listing order
+- salary_min for minimum salary filters
+- company_lower / location_lower, filled from company and location, for
+  case-insensitive prefix filters
+- job_tags (tag_id, job_id) for tag filters
+- ix_jobs_canonical_id only covers duplicates, so the planner doesn't pick
+  it for "canonical_id IS NULL", which matches most jobs
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# Rows whose lowercased columns are filled per statement
+BATCH_SIZE = 5000
+
+_LOWERCASED = ("company_lower", "location_lower")
+
+
+def _index_names(table):
+    return {index["name"] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def _fill_lowercased() -> None:
+    """Fill the lowercased columns with Python's lower(), as the model's defaults do.
+
+    SQL lower() only folds ASCII letters in SQLite.
+    """
+    conn = op.get_bind()
+    jobs = sa.table("jobs", sa.column("id"), sa.column("company"), sa.column("location"),
+                    *(sa.column(name) for name in _LOWERCASED))
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(jobs.c.id, jobs.c.company, jobs.c.location)
+            .where(jobs.c.id > last_id).order_by(jobs.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        last_id = rows[-1].id
+        conn.execute(
+            jobs.update().where(jobs.c.id == sa.bindparam("job_id")),
+            [
+                {"job_id": row.id, "company_lower": row.company and row.company.lower(),
+                 "location_lower": row.location and row.location.lower()}
+                for row in rows
+            ],
+        )
+
+
+def upgrade() -> None:
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("jobs")}
+    missing = [name for name in _LOWERCASED if name not in columns]
+    if missing:
+        with op.batch_alter_table("jobs") as batch:
+            for name in missing:
+                batch.add_column(sa.Column(name, sa.String(), nullable=True))
+        _fill_lowercased()
+
+    indexes = _index_names("jobs")
+    if "ix_jobs_canonical_id" in indexes:
+        op.drop_index("ix_jobs_canonical_id", table_name="jobs")
+    duplicates = sa.text("canonical_id IS NOT NULL")
+    op.create_index("ix_jobs_canonical_id", "jobs", ["canonical_id"],
+                    sqlite_where=duplicates, postgresql_where=duplicates)
+    if "ix_jobs_is_remote_posted_date" not in indexes:
+        op.create_index("ix_jobs_is_remote_posted_date", "jobs",
+                        ["is_remote", sa.text("posted_date DESC"), sa.text("id DESC")])
+    if "ix_jobs_salary_min" not in indexes:
+        op.create_index("ix_jobs_salary_min", "jobs", ["salary_min"])
+    for name in _LOWERCASED:
+        if f"ix_jobs_{name}" not in indexes:
+            op.create_index(f"ix_jobs_{name}", "jobs", [name], postgresql_ops={name: "text_pattern_ops"})
+
+    if "ix_job_tags_tag_id_job_id" not in _index_names("job_tags"):
+        op.create_index("ix_job_tags_tag_id_job_id", "job_tags", ["tag_id", "job_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_tags_tag_id_job_id", table_name="job_tags")
+    for name in _LOWERCASED:
+        op.drop_index(f"ix_jobs_{name}", table_name="jobs")
+    op.drop_index("ix_jobs_salary_min", table_name="jobs")
+    op.drop_index("ix_jobs_is_remote_posted_date", table_name="jobs")
+    op.drop_index("ix_jobs_canonical_id", table_name="jobs")
+    op.create_index("ix_jobs_canonical_id", "jobs", ["canonical_id"])
+    with op.batch_alter_table("jobs") as batch:
+        for name in _LOWERCASED:
+            batch.drop_column(name)
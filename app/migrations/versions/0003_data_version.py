@@ -0,0 +1,29 @@
+"""Data version counter, advanced by every transaction that changes stored jobs
+
+API processes compare it between requests to invalidate their response
+caches when jobs were inserted or updated by another process.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    data_version = op.create_table(
+        "data_version",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+    )
+    op.bulk_insert(data_version, [{"id": 1, "version": 0}])
+
+
+def downgrade() -> None:
+    op.drop_table("data_version")
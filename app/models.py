@@ -1,6 +1,6 @@
 from pydantic import BaseModel, HttpUrl
 from datetime import datetime
-from typing import List, Optional, Union, Any
+from typing import Dict, List, Optional, Union, Any
 
 # Tag Models
 class TagBase(BaseModel):
@@ -13,6 +13,7 @@ class Tag(TagBase):
     id: int
 
     class Config:
+        orm_mode = True
         from_attributes = True
 
 # Job Models
@@ -26,6 +27,7 @@ class JobBase(BaseModel):
     is_remote: bool = False
     salary_min: Optional[float] = None
     salary_max: Optional[float] = None
+    salary_text: Optional[str] = None
     posted_date: Optional[datetime] = None
 
 class JobCreate(JobBase):
@@ -41,15 +43,39 @@ class JobUpdate(BaseModel):
     is_remote: Optional[bool] = None
     salary_min: Optional[float] = None
     salary_max: Optional[float] = None
+    salary_text: Optional[str] = None
     posted_date: Optional[datetime] = None
 
 class Job(JobBase):
     id: int
     created_at: datetime
     updated_at: datetime
+    canonical_id: Optional[int] = None
     tags: List[Tag] = []
 
     class Config:
+        orm_mode = True
+        from_attributes = True
+
+# Job listing without the description, for lightweight list responses
+class JobSummary(BaseModel):
+    id: int
+    title: str
+    company: str
+    location: str
+    url: str
+    source: str
+    is_remote: bool = False
+    salary_min: Optional[float] = None
+    salary_max: Optional[float] = None
+    posted_date: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+    canonical_id: Optional[int] = None
+    tags: List[Tag] = []
+
+    class Config:
+        orm_mode = True
         from_attributes = True
 
 # JobSearch Model for filtering jobs
@@ -63,4 +89,45 @@ class JobSearch(BaseModel):
     max_salary: Optional[float] = None
     tags: Optional[List[str]] = None
     posted_after: Optional[datetime] = None
-    posted_before: Optional[datetime] = None
\ No newline at end of file
+    posted_before: Optional[datetime] = None
+    company_prefix: Optional[str] = None
+    location_prefix: Optional[str] = None
+
+# Number of matching jobs with one facet value
+class FacetCount(BaseModel):
+    value: Union[bool, str]
+    count: int
+
+# A page of search results with facet counts under the same filters
+class JobSearchResult(BaseModel):
+    total: int
+    jobs: Union[List[Job], List[JobSummary]]
+    facets: Dict[str, List[FacetCount]]
+
+# Scrape run status and progress
+class ScrapeRun(BaseModel):
+    id: int
+    status: str
+    triggers: int
+    requested_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    worker: Optional[str] = None
+    jobs_found: int = 0
+    jobs_inserted: int = 0
+    error: Optional[str] = None
+    elapsed_seconds: Optional[float] = None
+    jobs_per_second: Optional[float] = None
+
+    class Config:
+        orm_mode = True
+        from_attributes = True
+
+    @classmethod
+    def from_orm(cls, run):
+        model = super().from_orm(run)
+        if run.started_at:
+            elapsed = ((run.finished_at or datetime.utcnow()) - run.started_at).total_seconds()
+            model.elapsed_seconds = round(elapsed, 3)
+            model.jobs_per_second = round(run.jobs_inserted / elapsed, 3) if elapsed > 0 else None
+        return model
@@ -0,0 +1,79 @@
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, tuple_
+
+from . import schemas
+
+# Dialects that sort NULLs before other values in descending order
+_NULLS_FIRST_DIALECTS = {"postgresql", "oracle"}
+
+
+def encode_cursor(posted_date: Optional[datetime], job_id: int) -> str:
+    """Encode the sort key of the last job on a page as an opaque cursor."""
+    payload = json.dumps([posted_date.isoformat() if posted_date else None, job_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """
+    Decode a cursor created by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        posted_date, job_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (datetime.fromisoformat(posted_date) if posted_date else None), int(job_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def order_by_keyset(query):
+    """Order jobs newest first, breaking ties by id, matching ix_jobs_posted_date_id."""
+    return query.order_by(schemas.Job.posted_date.desc(), schemas.Job.id.desc())
+
+
+def fetch_keyset_page(query, cursor: Optional[Tuple[Optional[datetime], int]], limit: int, dialect: str) -> List:
+    """
+    Fetch the page of jobs following a cursor in keyset order.
+
+    posted_date is nullable and an ``OR posted_date IS NULL`` term would
+    stop the database from seeking into the index, so dated and undated
+    jobs are read as two segments, each with an index range scan, in the
+    order the dialect sorts NULLs.
+
+    Args:
+        query: ORM Query over schemas.Job with the filters applied
+        cursor: Decoded cursor of the previous page, or None for the first page
+        limit: Maximum number of jobs to return
+        dialect: Name of the database dialect
+
+    Returns:
+        Up to ``limit`` jobs
+    """
+    column = schemas.Job.posted_date
+    segments = [("dated", column.isnot(None)), ("undated", column.is_(None))]
+    if dialect in _NULLS_FIRST_DIALECTS:
+        segments.reverse()
+
+    if cursor is not None:
+        posted_date, job_id = cursor
+        current = "undated" if posted_date is None else "dated"
+        while segments[0][0] != current:
+            segments.pop(0)
+        if posted_date is None:
+            segments[0] = (current, and_(column.is_(None), schemas.Job.id < job_id))
+        else:
+            # Row values compare as NULL against undated jobs, excluding them
+            segments[0] = (current, tuple_(column, schemas.Job.id) < tuple_(posted_date, job_id))
+
+    jobs = []
+    for _, condition in segments:
+        jobs += order_by_keyset(query.filter(condition)).limit(limit - len(jobs)).all()
+        if len(jobs) >= limit:
+            break
+    return jobs
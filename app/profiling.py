@@ -0,0 +1,338 @@
+"""Opt-in profiling of API requests, for chasing slow searches.
+
+With PROFILING_ENABLED=1, a request sent with the ``X-Profile: 1`` header
+or ``?profile=1`` is profiled: its call stack is sampled into a call tree
+and every SQL statement it executes is recorded with its parameters and
+duration. PROFILE_SAMPLE_RATE also profiles a random fraction of
+requests; those are kept only when slower than PROFILE_SLOW_MS. The last
+PROFILE_BUFFER_SIZE profiles are kept in memory and served by
+``GET /profiles``. When profiling is disabled, the SQL hooks aren't
+installed and the middleware passes requests straight through.
+"""
+import contextvars
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from types import CodeType
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl
+
+from sqlalchemy import event
+
+from .cache import bypass_cache
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "0") == "1"
+
+# Fraction of requests profiled without being asked to
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+
+# Milliseconds above which a sampled profile is kept; requested profiles are always kept
+PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", "500"))
+
+# Number of profiles kept, the oldest dropped first
+PROFILE_BUFFER_SIZE = int(os.getenv("PROFILE_BUFFER_SIZE", "20"))
+
+# Milliseconds between samples of a profiled request's call stack
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "1"))
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+# Share of the sampled time below which a call is left out of the call tree
+CALL_TREE_MIN_SHARE = 0.01
+
+# Call tree roots for samples taken outside the profiled request's frames
+IDLE = "(event loop idle, awaiting I/O)"
+OTHER_TASKS = "(other tasks on the event loop)"
+GREENLET = "(greenlet, synchronous code run by AsyncSession.run_sync)"
+
+# Characters of a statement's parameters kept
+PARAMETERS_LIMIT = 500
+
+_current: contextvars.ContextVar[Optional["RequestProfile"]] = contextvars.ContextVar("request_profile", default=None)
+
+
+class RequestProfile:
+    """The call profile and SQL statements of one request."""
+
+    def __init__(self, method: str, path: str, query_string: str, requested: bool):
+        self.id: Optional[int] = None
+        self.method = method
+        self.path = path
+        self.query_string = query_string
+        self.requested = requested
+        self.started_at = datetime.utcnow()
+        self.status: Optional[int] = None
+        self.duration_ms = 0.0
+        self.statements: List[Dict[str, Any]] = []
+        self.call_tree = ""
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "query": self.query_string,
+            "status": self.status,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms, 3),
+            "requested": self.requested,
+            "sql_count": len(self.statements),
+            "sql_ms": round(sum(statement["duration_ms"] for statement in self.statements), 3),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.summary(), statements=self.statements, call_tree=self.call_tree)
+
+
+class StackSampler:
+    """Samples the call stack of one thread from a background thread into a call tree.
+
+    Unlike cProfile, sampling follows coroutines, which are only on the
+    stack while they run, and leaves the sampled thread running at full
+    speed. Each sample is weighted by the time since the previous one, so
+    the tree reads in milliseconds of wall time.
+
+    Stacks are cut at the root frame, the profiling middleware's. Samples
+    without it are the event loop waiting, e.g. on the database thread,
+    other tasks running, or code in a greenlet, whose stack doesn't lead
+    back to the coroutine that spawned it; each gets a root of its own.
+    """
+
+    def __init__(self, thread_id: int, root: Optional[CodeType] = None,
+                 interval: float = PROFILE_INTERVAL_MS / 1000):
+        """
+        Args:
+            thread_id: Identifier of the thread to sample
+            root: Code of the outermost frame kept (default: keep whole stacks)
+            interval: Seconds between samples
+        """
+        self.thread_id = thread_id
+        self.root = root
+        self.interval = interval
+        self.samples = 0
+        # Frame name -> [seconds, callees], from the outermost frame
+        self._root: Dict[str, list] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            codes = []
+            while frame is not None and frame.f_code is not self.root:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            stack = [f"{os.path.basename(code.co_filename)}:{code.co_firstlineno}({code.co_name})"
+                     for code in reversed(codes)]
+            if frame is None and self.root is not None:
+                if not any(code.co_name == "_run_once" for code in codes):
+                    stack.insert(0, GREENLET)
+                elif codes and codes[0].co_name == "select":
+                    stack = [IDLE]
+                else:
+                    stack = [OTHER_TASKS]
+            node = self._root
+            for name in stack:
+                entry = node.setdefault(name, [0.0, {}])
+                entry[0] += elapsed
+                node = entry[1]
+            self.samples += 1
+
+    def render(self, min_share: float = CALL_TREE_MIN_SHARE) -> str:
+        """
+        The call tree as indented text, heaviest calls first.
+
+        Args:
+            min_share: Share of the sampled time below which a call is left out
+
+        Returns:
+            One line per call: milliseconds, share of the sampled time and frame
+        """
+        total = sum(seconds for seconds, _ in self._root.values())
+        lines = [f"{self.samples} samples, {total * 1000:.1f} ms"]
+
+        def walk(node: Dict[str, list], depth: int) -> None:
+            for name, (seconds, callees) in sorted(node.items(), key=lambda item: -item[1][0]):
+                if seconds < total * min_share:
+                    continue
+                lines.append(f"{'  ' * depth}{seconds * 1000:8.1f} ms {seconds / total:6.1%}  {name}")
+                walk(callees, depth + 1)
+
+        walk(self._root, 0)
+        return "\n".join(lines)
+
+
+class Profiler:
+    """Decides which requests are profiled and keeps the latest profiles.
+
+    The call stack is sampled on the event loop thread, which every
+    request shares, so only one request is profiled at a time; others
+    arriving meanwhile are served unprofiled. Work from concurrent requests
+    interleaved on the loop still shows up in the call tree, while the SQL
+    statements are only those of the profiled request.
+    """
+
+    def __init__(self, enabled: bool = PROFILING_ENABLED, sample_rate: float = PROFILE_SAMPLE_RATE,
+                 slow_ms: float = PROFILE_SLOW_MS, buffer_size: int = PROFILE_BUFFER_SIZE):
+        """
+        Args:
+            enabled: Whether requests may be profiled at all
+            sample_rate: Fraction of requests profiled without being asked to
+            slow_ms: Milliseconds above which a sampled profile is kept
+            buffer_size: Number of profiles kept
+        """
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.busy = 0
+        self._profiles: deque = deque(maxlen=buffer_size)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._active = threading.Lock()
+
+    def sampled(self) -> bool:
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def store(self, profile: RequestProfile) -> bool:
+        """Keep a finished profile if it was requested or is slow enough; returns whether it was kept."""
+        if not profile.requested and profile.duration_ms < self.slow_ms:
+            return False
+        with self._lock:
+            if profile.id is None:
+                profile.id = next(self._ids)
+            self._profiles.append(profile)
+        return True
+
+    def next_id(self) -> int:
+        with self._lock:
+            return next(self._ids)
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Summaries of the kept profiles, newest first."""
+        with self._lock:
+            profiles = list(self._profiles)
+        return [profile.summary() for profile in reversed(profiles)]
+
+    def get(self, profile_id: int) -> Optional[RequestProfile]:
+        with self._lock:
+            return next((profile for profile in self._profiles if profile.id == profile_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+        self.busy = 0
+
+
+profiler = Profiler()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("profile_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    starts = conn.info.get("profile_query_start")
+    if profile is None or not starts:
+        return
+    profile.statements.append({
+        "statement": statement,
+        "parameters": repr(parameters)[:PARAMETERS_LIMIT],
+        "duration_ms": round((time.perf_counter() - starts.pop()) * 1000, 3),
+    })
+
+
+def _handle_error(exception_context):
+    starts = exception_context.connection.info.get("profile_query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(db_engine) -> None:
+    """Record the SQL statements of profiled requests run through a (sync) engine."""
+    if not profiler.enabled:
+        return
+    event.listen(db_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(db_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(db_engine, "handle_error", _handle_error)
+
+
+def _requested(scope) -> bool:
+    if any(name == PROFILE_HEADER and value == b"1" for name, value in scope["headers"]):
+        return True
+    query_string = scope["query_string"]
+    return b"profile=1" in query_string and ("profile", "1") in parse_qsl(query_string.decode("latin-1"))
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling requests that ask for it, and a sample of the others.
+
+    A requested profile is always kept and its id returned in the
+    ``X-Profile-Id`` response header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not profiler.enabled or scope["path"].startswith("/profiles"):
+            await self.app(scope, receive, send)
+            return
+        requested = _requested(scope)
+        if not requested and not profiler.sampled():
+            await self.app(scope, receive, send)
+            return
+        if not profiler._active.acquire(blocking=False):
+            profiler.busy += 1
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            profile = RequestProfile(scope["method"], scope["path"], scope["query_string"].decode("latin-1"), requested)
+            if requested:
+                profile.id = profiler.next_id()
+
+            async def send_with_profile_id(message):
+                if message["type"] == "http.response.start":
+                    profile.status = message["status"]
+                    if profile.id is not None:
+                        message["headers"] = list(message.get("headers", [])) + [
+                            (PROFILE_ID_HEADER, str(profile.id).encode())
+                        ]
+                await send(message)
+
+            sampler = StackSampler(threading.get_ident(), root=ProfilingMiddleware.__call__.__code__)
+            token = _current.set(profile)
+            # A requested profile must show the request's work, not a cache hit
+            bypass = bypass_cache.set(requested)
+            start = time.perf_counter()
+            sampler.start()
+            try:
+                await self.app(scope, receive, send_with_profile_id)
+            finally:
+                sampler.stop()
+                profile.duration_ms = (time.perf_counter() - start) * 1000
+                _current.reset(token)
+                bypass_cache.reset(bypass)
+                if requested or profile.duration_ms >= profiler.slow_ms:
+                    profile.call_tree = sampler.render()
+                profiler.store(profile)
+        finally:
+            profiler._active.release()
@@ -0,0 +1,186 @@
+"""Parse salary text from job listings into yearly ranges.
+
+Usage:
+    python -m app.salary    # Re-parse the salary text of stored jobs without a salary
+"""
+import argparse
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from . import schemas
+from .dataversion import bump_data_version
+
+# Pay periods and how many of them make a year (40 hours a week, 52 weeks a year)
+PERIODS_PER_YEAR = {
+    "hour": 2080,
+    "day": 260,
+    "week": 52,
+    "biweek": 26,
+    "semimonth": 24,
+    "month": 12,
+    "year": 1,
+}
+
+_PERIOD_ALIASES = {
+    "hour": "hour", "hourly": "hour", "hr": "hour",
+    "day": "day", "daily": "day",
+    "week": "week", "weekly": "week", "wk": "week",
+    "biweekly": "biweek", "bi-weekly": "biweek",
+    "semimonthly": "semimonth", "semi-monthly": "semimonth",
+    "month": "month", "monthly": "month", "mo": "month",
+    "year": "year", "yearly": "year", "yr": "year", "annum": "year", "annually": "year", "annual": "year",
+}
+
+_AMOUNT = r"(\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)\s*(k\b)?"
+_PERIOD = "|".join(sorted(map(re.escape, _PERIOD_ALIASES), key=len, reverse=True))
+
+# An amount, optionally a second one after a dash or "to", optionally a period
+# after "/", "per", "a" or "an". Compiled once for the whole process.
+_SALARY = re.compile(
+    rf"(\$)?\s*{_AMOUNT}"
+    rf"(?:\s*(?:-|–|—|to)\s*(\$)?\s*{_AMOUNT})?"
+    rf"(?:\s*(?:/|per\b|an?\b|each\b)?\s*({_PERIOD})\b)?",
+    re.IGNORECASE,
+)
+
+# Without a period, amounts up to this are taken as hourly and amounts from
+# YEARLY_MIN as yearly; anything in between is too ambiguous to guess.
+HOURLY_MAX = 300
+YEARLY_MIN = 10000
+
+
+class Salary(NamedTuple):
+    """Salary range converted to a yearly amount, and the period it was quoted in."""
+    salary_min: float
+    salary_max: float
+    period: str
+
+
+def _amount(number: str, thousands: Optional[str]) -> float:
+    value = float(number.replace(",", ""))
+    return value * 1000 if thousands else value
+
+
+def parse_salary(text: Optional[str]) -> Optional[Salary]:
+    """
+    Parse salary text such as "$50,000 - $70,000 a year", "$80K" or "$20/hr".
+
+    Only amounts with a dollar sign or a pay period count as salaries; a
+    K suffix alone doesn't, as in "401k match". Amounts without a period
+    are taken as hourly or yearly by their size.
+
+    Args:
+        text: Salary text from a listing
+
+    Returns:
+        The yearly salary range, or None if the text holds no salary
+    """
+    if not text:
+        return None
+    for match in _SALARY.finditer(text):
+        dollar, low, low_k, high_dollar, high, high_k, period = match.groups()
+        if not (dollar or high_dollar or period):
+            continue
+        # "$80-100K" applies the K to both ends
+        low_value = _amount(low, low_k or (high_k if high and "," not in low else None))
+        high_value = _amount(high, high_k) if high else low_value
+        if high_value < low_value:
+            low_value, high_value = high_value, low_value
+
+        if period:
+            period = _PERIOD_ALIASES[period.lower()]
+        elif high_value <= HOURLY_MAX:
+            period = "hour"
+        elif low_value >= YEARLY_MIN:
+            period = "year"
+        else:
+            continue
+        per_year = PERIODS_PER_YEAR[period]
+        return Salary(low_value * per_year, high_value * per_year, period)
+    return None
+
+
+def parse_salaries(texts: Iterable[Optional[str]]) -> List[Optional[Salary]]:
+    """
+    Parse a column of salary texts at once.
+
+    Listings repeat the same few salary strings, so each distinct string
+    is parsed only once.
+
+    Args:
+        texts: Salary texts, e.g. a list or a dataframe column
+
+    Returns:
+        The parsed salary of each text, in order
+    """
+    texts = list(texts)
+    parsed = {text: parse_salary(text) for text in set(texts)}
+    return [parsed[text] for text in texts]
+
+
+def salary_fields(salary: Optional[Salary]) -> Dict[str, Optional[float]]:
+    """Job columns holding a parsed salary."""
+    if salary is None:
+        return {"salary_min": None, "salary_max": None}
+    return {"salary_min": salary.salary_min, "salary_max": salary.salary_max}
+
+
+def backfill_salaries(db: Session, batch_size: int = 1000, reparse: bool = False) -> int:
+    """
+    Parse the stored salary text of jobs, a batch per transaction.
+
+    Args:
+        db: Database session
+        batch_size: Jobs parsed per transaction
+        reparse: Also re-parse jobs that already have a salary, e.g. after the parser improved
+
+    Returns:
+        Number of jobs whose salary changed
+    """
+    Job = schemas.Job
+    updated = 0
+    last_id = 0
+    while True:
+        query = (
+            select(Job.id, Job.salary_text, Job.salary_min, Job.salary_max)
+            .where(Job.id > last_id, Job.salary_text.is_not(None))
+            .order_by(Job.id).limit(batch_size)
+        )
+        if not reparse:
+            query = query.where(Job.salary_min.is_(None))
+        rows = db.execute(query).all()
+        if not rows:
+            return updated
+        last_id = rows[-1].id
+
+        changes = [
+            dict(salary_fields(salary), id=row.id)
+            for row, salary in zip(rows, parse_salaries(row.salary_text for row in rows))
+            if (row.salary_min, row.salary_max) != tuple(salary_fields(salary).values())
+        ]
+        if changes:
+            db.execute(update(Job), changes)
+            bump_data_version(db)
+        db.commit()
+        updated += len(changes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse the salary text of stored jobs")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Jobs parsed per transaction")
+    parser.add_argument("--reparse", action="store_true", help="Also re-parse jobs that already have a salary")
+    args = parser.parse_args()
+
+    from .database import SessionLocal, engine
+    from .migrations import upgrade_database
+    upgrade_database(engine)
+    with SessionLocal() as db:
+        updated = backfill_salaries(db, args.batch_size, args.reparse)
+    print(f"Updated the salary of {updated} jobs")
+
+
+if __name__ == "__main__":
+    main()
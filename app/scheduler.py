@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import os
+import random
+from typing import Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from .scraper import ScrapeBudget
+
+logger = logging.getLogger(__name__)
+
+
+class Schedule:
+    """How often a source is scraped, for which keywords, and with what budget."""
+
+    def __init__(self, source: str, keywords: Iterable[str], interval: float, jitter: float = 0.1,
+                 max_requests: Optional[int] = None, max_seconds: Optional[float] = None):
+        """
+        Args:
+            source: Source name of the scraper to run
+            keywords: Search keywords run on every scrape
+            interval: Seconds between the starts of consecutive scrapes
+            jitter: Fraction of the interval by which each delay is randomly shifted
+            max_requests: Maximum requests per scrape (default: no limit)
+            max_seconds: Maximum seconds per scrape (default: no limit)
+        """
+        self.source = source
+        self.keywords = list(keywords)
+        self.interval = interval
+        self.jitter = jitter
+        self.max_requests = max_requests
+        self.max_seconds = max_seconds
+
+    def budget(self) -> ScrapeBudget:
+        return ScrapeBudget(max_requests=self.max_requests, max_seconds=self.max_seconds)
+
+    def __repr__(self) -> str:
+        return f"Schedule({self.source!r}, every {self.interval:g}s, {len(self.keywords)} keywords)"
+
+
+class ScheduleState(NamedTuple):
+    """Outcome of a schedule's latest scrape."""
+    runs: int
+    failures: int
+    next_delay: float
+
+
+def _env_number(name: str, default: float) -> Optional[float]:
+    """Read a number from the environment, where 0 means no limit."""
+    value = float(os.getenv(name, default))
+    return value or None
+
+
+def load_schedules(sources: Iterable[str], keywords: Iterable[str]) -> List[Schedule]:
+    """
+    Build a schedule for each source from environment variables.
+
+    ``SCRAPE_INTERVAL``, ``SCRAPE_JITTER``, ``SCRAPE_MAX_REQUESTS`` and
+    ``SCRAPE_MAX_SECONDS`` apply to every source. ``SCRAPE_INTERVAL_<SOURCE>``
+    and ``SCRAPE_KEYWORDS_<SOURCE>`` (comma-separated) override the
+    interval and keywords of one source.
+
+    Args:
+        sources: Source names to schedule
+        keywords: Default search keywords
+
+    Returns:
+        List of schedules
+    """
+    keywords = list(keywords)
+    interval = float(os.getenv("SCRAPE_INTERVAL", "21600"))
+    jitter = float(os.getenv("SCRAPE_JITTER", "0.1"))
+    max_requests = _env_number("SCRAPE_MAX_REQUESTS", 0)
+    max_seconds = _env_number("SCRAPE_MAX_SECONDS", 0)
+
+    schedules = []
+    for source in sources:
+        suffix = source.upper()
+        source_keywords = os.getenv(f"SCRAPE_KEYWORDS_{suffix}")
+        schedules.append(Schedule(
+            source,
+            [keyword.strip() for keyword in source_keywords.split(",") if keyword.strip()]
+            if source_keywords else keywords,
+            float(os.getenv(f"SCRAPE_INTERVAL_{suffix}", interval)),
+            jitter=jitter,
+            max_requests=int(max_requests) if max_requests else None,
+            max_seconds=max_seconds,
+        ))
+    return schedules
+
+
+class Scheduler:
+    """Runs each schedule's scrape periodically in one event loop.
+
+    Every schedule has its own loop, so a slow or failing source doesn't
+    delay the others. Delays are shifted randomly by the schedule's jitter
+    and first runs are spread over the first jittered interval, so sources
+    don't all fire at once. After a failed scrape the delay doubles, up to
+    ``max_backoff``, until a scrape succeeds again.
+    """
+
+    def __init__(self, schedules: Iterable[Schedule],
+                 job: Callable[[Schedule, ScrapeBudget], Awaitable[object]],
+                 max_backoff: float = 86400.0, rng: Optional[random.Random] = None):
+        """
+        Args:
+            schedules: Schedules to run
+            job: Coroutine function running one scrape, raising if it failed
+            max_backoff: Maximum seconds between scrapes of a failing source
+            rng: Random number generator for the jitter (default: a new one)
+        """
+        self.schedules = list(schedules)
+        self.job = job
+        self.max_backoff = max_backoff
+        self.rng = rng or random.Random()
+        self.state: Dict[str, ScheduleState] = {}
+
+    def initial_delay(self, schedule: Schedule) -> float:
+        """Seconds before a schedule's first scrape."""
+        return self.rng.uniform(0, schedule.interval * schedule.jitter)
+
+    def next_delay(self, schedule: Schedule, failures: int = 0) -> float:
+        """Seconds until a schedule's next scrape after ``failures`` consecutive failures."""
+        delay = schedule.interval * 2 ** failures
+        if failures:
+            delay = min(delay, max(self.max_backoff, schedule.interval))
+        return delay * self.rng.uniform(1 - schedule.jitter, 1 + schedule.jitter)
+
+    async def run_once(self, schedule: Schedule, failures: int = 0) -> int:
+        """
+        Run one scrape of a schedule.
+
+        Args:
+            schedule: Schedule to run
+            failures: Consecutive failures before this scrape
+
+        Returns:
+            Consecutive failures after this scrape
+        """
+        budget = schedule.budget()
+        try:
+            await self.job(schedule, budget)
+        except Exception:
+            logger.exception(f"Scheduled scrape of {schedule.source} failed")
+            failures += 1
+        else:
+            failures = 0
+        logger.info(f"Scheduled scrape of {schedule.source} used {budget.requests} requests "
+                    f"in {budget.elapsed:.1f}s")
+        return failures
+
+    async def _loop(self, schedule: Schedule) -> None:
+        runs = failures = 0
+        await asyncio.sleep(self.initial_delay(schedule))
+        while True:
+            failures = await self.run_once(schedule, failures)
+            runs += 1
+            delay = self.next_delay(schedule, failures)
+            self.state[schedule.source] = ScheduleState(runs, failures, delay)
+            await asyncio.sleep(delay)
+
+    async def run(self) -> None:
+        """Run every schedule until cancelled."""
+        logger.info(f"Scheduling {', '.join(map(repr, self.schedules)) or 'nothing'}")
+        await asyncio.gather(*(self._loop(schedule) for schedule in self.schedules))
@@ -1,9 +1,18 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Text, Index, LargeBinary, BigInteger
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime
 
 from .database import Base
 
+
+def _lowercased(source: str):
+    """Column default holding the lowercased value of another column."""
+    def default(context):
+        value = context.get_current_parameters().get(source)
+        return value.lower() if value else value
+    return default
+
+
 class Job(Base):
     __tablename__ = "jobs"
 
@@ -12,17 +21,44 @@ class Job(Base):
     company = Column(String, index=True)
     location = Column(String, index=True)
     description = Column(Text)
-    salary_min = Column(Float, nullable=True)
+    salary_min = Column(Float, nullable=True, index=True)
     salary_max = Column(Float, nullable=True)
+    salary_text = Column(String, nullable=True)  # Salary as listed, parsed into salary_min/max by app.salary
     url = Column(String, unique=True, index=True)
     posted_date = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     source = Column(String, index=True)  # e.g., "indeed", "linkedin", "vtjobs"
     is_remote = Column(Boolean, default=False)
+    # First stored posting of a near-duplicate job, or None if this is the canonical posting
+    canonical_id = Column(Integer, ForeignKey("jobs.id"), nullable=True)
+    # Lowercased company and location, for index range scans on prefix filters
+    company_lower = Column(String, default=_lowercased("company"))
+    location_lower = Column(String, default=_lowercased("location"))
     
     # Relationship with tags
-    tags = relationship("JobTag", back_populates="job")
+    job_tags = relationship("JobTag", back_populates="job")
+    # Tag objects through job_tags, for loading tags in a single query
+    tags = relationship("Tag", secondary="job_tags", viewonly=True, order_by="Tag.name")
+    
+    __table_args__ = (
+        # Serves the default newest-first ordering and keyset pagination
+        Index("ix_jobs_posted_date_id", posted_date.desc(), id.desc()),
+        # Only duplicates are indexed: most jobs are canonical, so "canonical_id IS NULL"
+        # is better served by the posted_date indexes
+        Index("ix_jobs_canonical_id", canonical_id, sqlite_where=canonical_id.isnot(None),
+              postgresql_where=canonical_id.isnot(None)),
+        # Serves is_remote filters in the same order
+        Index("ix_jobs_is_remote_posted_date", is_remote, posted_date.desc(), id.desc()),
+        # text_pattern_ops lets PostgreSQL use the index for LIKE 'prefix%' in any locale
+        Index("ix_jobs_company_lower", company_lower, postgresql_ops={"company_lower": "text_pattern_ops"}),
+        Index("ix_jobs_location_lower", location_lower, postgresql_ops={"location_lower": "text_pattern_ops"}),
+    )
+    
+    @validates("company", "location")
+    def _set_lowercased(self, key, value):
+        setattr(self, f"{key}_lower", value.lower() if value else value)
+        return value
 
 
 class Tag(Base):
@@ -42,5 +78,73 @@ class JobTag(Base):
     tag_id = Column(Integer, ForeignKey("tags.id"), primary_key=True)
     
     # Relationships
-    job = relationship("Job", back_populates="tags")
-    tag = relationship("Tag", back_populates="jobs")
\ No newline at end of file
+    job = relationship("Job", back_populates="job_tags")
+    tag = relationship("Tag", back_populates="jobs")
+    
+    __table_args__ = (
+        # The primary key serves lookups by job; this one serves tag filters
+        Index("ix_job_tags_tag_id_job_id", tag_id, job_id),
+    )
+
+
+class JobFingerprint(Base):
+    __tablename__ = "job_fingerprints"
+
+    job_id = Column(Integer, ForeignKey("jobs.id"), primary_key=True)
+    signature = Column(LargeBinary, nullable=False)  # MinHash signature, see app.dedup
+
+
+class JobLSHBucket(Base):
+    __tablename__ = "job_lsh_buckets"
+
+    # Jobs whose signatures hash to the same bucket in a band are duplicate candidates
+    band = Column(Integer, primary_key=True)
+    bucket = Column(BigInteger, primary_key=True)
+    job_id = Column(Integer, ForeignKey("jobs.id"), primary_key=True)
+
+
+class StatCounter(Base):
+    __tablename__ = "stat_counters"
+
+    # e.g. dimension "source" with key "indeed", or "tag" with key "python"
+    dimension = Column(String, primary_key=True)
+    key = Column(String, primary_key=True)
+    count = Column(Integer, default=0, nullable=False)
+    
+    __table_args__ = (
+        # Serves top-N lookups such as the most common companies
+        Index("ix_stat_counters_dimension_count", "dimension", "count"),
+    )
+
+
+class ScrapeRun(Base):
+    __tablename__ = "scrape_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String, nullable=False, default="queued")  # queued, running, succeeded or failed
+    triggers = Column(Integer, nullable=False, default=1)  # Scrape requests coalesced into this run
+    requested_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    worker = Column(String, nullable=True)
+    jobs_found = Column(Integer, nullable=False, default=0)  # Listings returned by the searches, new or not
+    jobs_inserted = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    
+    __table_args__ = (
+        # At most one queued and one running scrape, so concurrent triggers coalesce
+        Index(
+            "uq_scrape_runs_active_status", "status", unique=True,
+            sqlite_where=status.in_(["queued", "running"]),
+            postgresql_where=status.in_(["queued", "running"]),
+        ),
+    )
+
+
+class DataVersion(Base):
+    __tablename__ = "data_version"
+
+    # A single row, advanced by every transaction that changes stored jobs (see app.dataversion)
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,160 @@
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import exists, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+
+from . import schemas
+
+# Scrape run states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+def enqueue_scrape(db: Session) -> Tuple[schemas.ScrapeRun, bool]:
+    """
+    Queue a scrape run, coalescing with a run that is already queued.
+
+    A unique index allows a single queued run, so concurrent triggers
+    from several API workers end up on the same run.
+
+    Args:
+        db: Database session
+
+    Returns:
+        The queued run, and whether this call created it
+    """
+    ScrapeRun = schemas.ScrapeRun
+    for _ in range(3):
+        queued = db.scalar(select(ScrapeRun).where(ScrapeRun.status == QUEUED))
+        if queued is not None:
+            db.execute(update(ScrapeRun).where(ScrapeRun.id == queued.id).values(triggers=ScrapeRun.triggers + 1))
+            db.commit()
+            db.refresh(queued)
+            return queued, False
+
+        run = ScrapeRun(status=QUEUED)
+        db.add(run)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another trigger queued a run first; join it
+            db.rollback()
+            continue
+        db.refresh(run)
+        return run, True
+    raise RuntimeError("Could not queue a scrape run")
+
+
+def claim_next_run(db: Session, worker: str) -> Optional[schemas.ScrapeRun]:
+    """
+    Start the queued run unless another run is already in progress.
+
+    The claim is a single conditional UPDATE, and the unique index allows
+    only one running run, so concurrent workers never scrape at once.
+
+    Args:
+        db: Database session
+        worker: Name of the claiming worker
+
+    Returns:
+        The claimed run, or None if nothing was claimed
+    """
+    ScrapeRun = schemas.ScrapeRun
+    running = aliased(ScrapeRun)
+    now = datetime.utcnow()
+    next_id = select(ScrapeRun.id).where(ScrapeRun.status == QUEUED).order_by(ScrapeRun.id).limit(1)
+    try:
+        result = db.execute(
+            update(ScrapeRun)
+            .where(ScrapeRun.id == next_id.scalar_subquery(), ~exists().where(running.status == RUNNING))
+            .values(status=RUNNING, started_at=now, heartbeat_at=now, worker=worker)
+            .returning(ScrapeRun.id)
+        )
+        run_id = result.scalar()
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return None
+    return db.get(ScrapeRun, run_id) if run_id is not None else None
+
+
+def start_run(db: Session, worker: str) -> Optional[schemas.ScrapeRun]:
+    """
+    Start a run right away, for scrapes that don't go through the queue.
+
+    Nothing is started while another run is queued or running, and the
+    unique index allows only one running run, so scheduled scrapes never
+    overlap queued ones or each other.
+
+    Args:
+        db: Database session
+        worker: Name of the starting worker
+
+    Returns:
+        The started run, or None if another run is queued or running
+    """
+    ScrapeRun = schemas.ScrapeRun
+    if db.scalar(select(exists().where(ScrapeRun.status.in_([QUEUED, RUNNING])))):
+        return None
+    now = datetime.utcnow()
+    run = ScrapeRun(status=RUNNING, started_at=now, heartbeat_at=now, worker=worker)
+    db.add(run)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another worker started a run first
+        db.rollback()
+        return None
+    db.refresh(run)
+    return run
+
+
+def record_progress(db: Session, run_id: int, found: int = 0, inserted: int = 0) -> None:
+    """Add found and inserted job counts to a running scrape and refresh its heartbeat."""
+    ScrapeRun = schemas.ScrapeRun
+    db.execute(
+        update(ScrapeRun).where(ScrapeRun.id == run_id).values(
+            jobs_found=ScrapeRun.jobs_found + found,
+            jobs_inserted=ScrapeRun.jobs_inserted + inserted,
+            heartbeat_at=datetime.utcnow(),
+        )
+    )
+    db.commit()
+
+
+def finish_run(db: Session, run_id: int, error: Optional[str] = None) -> None:
+    """Mark a scrape run as succeeded, or as failed with an error message."""
+    ScrapeRun = schemas.ScrapeRun
+    db.execute(
+        update(ScrapeRun).where(ScrapeRun.id == run_id).values(
+            status=FAILED if error else SUCCEEDED, error=error, finished_at=datetime.utcnow(),
+        )
+    )
+    db.commit()
+
+
+def fail_stale_runs(db: Session, timeout: float) -> int:
+    """
+    Fail running scrapes whose worker stopped reporting progress.
+
+    Args:
+        db: Database session
+        timeout: Seconds without a heartbeat after which a run is considered dead
+
+    Returns:
+        Number of runs marked as failed
+    """
+    ScrapeRun = schemas.ScrapeRun
+    cutoff = datetime.utcnow() - timedelta(seconds=timeout)
+    result = db.execute(
+        update(ScrapeRun)
+        .where(ScrapeRun.status == RUNNING, ScrapeRun.heartbeat_at < cutoff)
+        .values(status=FAILED, error="Worker stopped responding", finished_at=datetime.utcnow())
+    )
+    db.commit()
+    return result.rowcount
+
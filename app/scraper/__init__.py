@@ -0,0 +1,12 @@
+from .base import SCRAPERS, BaseScraper, create_scrapers, register_scraper
+from .fetchcache import FetchCache, fetch_metrics
+from .http import FetchResult, HttpClient
+from .orchestrator import ScrapeBudget, scrape_sources
+
+# Import the built-in sources so they register themselves
+from . import indeed  # noqa: E402,F401
+
+__all__ = [
+    "SCRAPERS", "BaseScraper", "FetchCache", "FetchResult", "HttpClient", "ScrapeBudget", "create_scrapers",
+    "fetch_metrics", "register_scraper", "scrape_sources",
+]
@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Type
+
+logger = logging.getLogger(__name__)
+
+class BaseScraper(ABC):
+    """Interface implemented by every job source.
+
+    Subclasses set ``SOURCE_NAME`` and implement ``search``. Sources that
+    page through results override ``iter_search`` to fetch pages lazily,
+    and sources whose search results lack descriptions override
+    ``get_jobs_details``.
+    Decorate the class with ``register_scraper`` to include it in scrape runs.
+    """
+    
+    SOURCE_NAME: str = ""
+    
+    # Listings per results page, or 0 when a search is a single request
+    PAGE_SIZE: int = 0
+    
+    # Maximum number of searches run against this source at once
+    search_concurrency: int = 2
+    
+    # Listings buffered between a streaming search and its consumer
+    stream_buffer: int = 100
+    
+    @classmethod
+    def from_env(cls) -> "BaseScraper":
+        """Create the scraper with settings from environment variables."""
+        return cls()
+    
+    @abstractmethod
+    def search(self, keywords: str = "", location: str = "Vermont") -> List[Dict[str, Any]]:
+        """
+        Search the source for jobs matching the criteria.
+        
+        Args:
+            keywords: Job search keywords
+            location: Job location
+            
+        Returns:
+            List of job listings
+        """
+    
+    def iter_search(self, keywords: str = "", location: str = "Vermont", max_pages: Optional[int] = None,
+                    max_results: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield job listings matching the criteria.
+        
+        Args:
+            keywords: Job search keywords
+            location: Job location
+            max_pages: Maximum number of results pages, for sources that page
+            max_results: Maximum number of listings (default: no limit)
+            
+        Yields:
+            Job listings
+        """
+        for count, job_data in enumerate(self.search(keywords, location)):
+            if max_results is not None and count >= max_results:
+                return
+            yield job_data
+    
+    async def aiter_search(self, keywords: str = "", location: str = "Vermont", max_pages: Optional[int] = None,
+                           max_results: Optional[int] = None,
+                           executor: Optional[Executor] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Asynchronously yield the listings of ``iter_search``.
+        
+        The search runs in a worker thread and hands listings over as they
+        are parsed. At most ``stream_buffer`` listings wait for the
+        consumer; beyond that the worker stops fetching pages.
+        
+        Args:
+            keywords: Job search keywords
+            location: Job location
+            max_pages: Maximum number of results pages, for sources that page
+            max_results: Maximum number of listings (default: no limit)
+            executor: Executor running the search (default: the loop's default executor)
+            
+        Yields:
+            Job listings
+        """
+        listings = self.iter_search(keywords, location, max_pages=max_pages, max_results=max_results)
+        async for job_data in iterate_in_thread(listings, self.stream_buffer, executor):
+            yield job_data
+    
+    async def get_jobs_details(self, job_urls: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get detailed information for many jobs.
+        
+        Args:
+            job_urls: URLs of the job listings
+            
+        Returns:
+            Dictionary mapping each URL to its detailed job information, or
+            to a failed ``http.FetchResult`` if the page couldn't be fetched
+        """
+        return {}
+
+
+class _StreamEnd:
+    """Marks the end of a threaded iteration, carrying its exception if any."""
+    
+    def __init__(self, error: Optional[BaseException] = None):
+        self.error = error
+
+
+async def iterate_in_thread(iterator: Iterator[Any], buffer: int = 100,
+                            executor: Optional[Executor] = None) -> AsyncIterator[Any]:
+    """
+    Consume a blocking iterator in a worker thread and yield its items.
+    
+    Args:
+        iterator: Iterator whose ``next`` may block
+        buffer: Maximum number of items produced ahead of the consumer
+        executor: Executor running the iteration (default: the loop's default executor)
+        
+    Yields:
+        The iterator's items
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    slots = threading.Semaphore(buffer)
+    stopped = threading.Event()
+    
+    def put(item: Any) -> None:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            # The loop closed after the consumer went away
+            stopped.set()
+    
+    def produce() -> None:
+        try:
+            for item in iterator:
+                while not slots.acquire(timeout=0.1):
+                    if stopped.is_set():
+                        return
+                if stopped.is_set():
+                    return
+                put(item)
+        except BaseException as e:
+            put(_StreamEnd(e))
+        else:
+            put(_StreamEnd())
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+    
+    producer = loop.run_in_executor(executor, produce)
+    try:
+        while True:
+            item = await queue.get()
+            if isinstance(item, _StreamEnd):
+                if item.error is not None:
+                    raise item.error
+                break
+            slots.release()
+            yield item
+    finally:
+        stopped.set()
+        await producer
+
+
+# Registered scraper classes by source name
+SCRAPERS: Dict[str, Type[BaseScraper]] = {}
+
+def register_scraper(scraper_class: Type[BaseScraper]) -> Type[BaseScraper]:
+    """Class decorator adding a scraper to the registry under its SOURCE_NAME."""
+    if not scraper_class.SOURCE_NAME:
+        raise ValueError(f"{scraper_class.__name__} must define SOURCE_NAME")
+    SCRAPERS[scraper_class.SOURCE_NAME] = scraper_class
+    return scraper_class
+
+def create_scrapers(names: Optional[Iterable[str]] = None) -> Dict[str, BaseScraper]:
+    """
+    Instantiate registered scrapers.
+    
+    Args:
+        names: Source names to create (default: every registered source)
+        
+    Returns:
+        Dictionary mapping each source name to its scraper
+    """
+    names = list(SCRAPERS) if names is None else [name.strip() for name in names if name.strip()]
+    unknown = [name for name in names if name not in SCRAPERS]
+    if unknown:
+        raise ValueError(f"Unknown job sources: {', '.join(unknown)}")
+    return {name: SCRAPERS[name].from_env() for name in names}
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, NamedTuple, Optional
+
+# Per-user cache directory, outside the source tree
+DEFAULT_CACHE_PATH = os.path.join(
+    os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "vermont-jobs", "fetch_cache.db"
+)
+
+
+class FetchMetrics:
+    """Thread-safe counters describing how much work the fetch cache saved and how fetching went."""
+
+    FIELDS = (
+        "requests", "not_modified", "unchanged", "bytes_downloaded", "bytes_saved",
+        "parses", "parses_avoided", "duplicate_details_skipped",
+        "retries", "failed_requests", "circuit_rejections", "details_failed",
+    )
+
+    def __init__(self):
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, **counts: int) -> None:
+        with self._lock:
+            self._counts.update(counts)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {field: self._counts[field] for field in self.FIELDS}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+fetch_metrics = FetchMetrics()
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    raise TypeError(f"Cannot cache {type(value).__name__} values")
+
+
+def _decode(value: Dict[str, Any]) -> Any:
+    if set(value) == {"$datetime"}:
+        return datetime.fromisoformat(value["$datetime"])
+    return value
+
+
+class CacheEntry(NamedTuple):
+    """A cached page: its validators, content hash and parsed result."""
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_hash: str
+    size: int
+    parsed: Any
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Request headers asking the server to answer 304 if the page is unchanged."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class FetchCache:
+    """Persistent per-URL cache of fetched pages, kept in a SQLite file.
+
+    Stores each page's ETag and Last-Modified validators, a hash of its
+    body and the parsed result, so an unchanged page is neither downloaded
+    (on a 304) nor parsed (on a matching hash) again.
+    """
+
+    def __init__(self, path: str = ":memory:", metrics: Optional[FetchMetrics] = None):
+        """
+        Args:
+            path: SQLite database file, its directory created if missing (default: in memory, not persisted)
+            metrics: Counters to update (default: the module-level fetch_metrics)
+        """
+        self.path = path
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.metrics = metrics if metrics is not None else fetch_metrics
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS fetch_cache ("
+            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, content_hash TEXT NOT NULL, "
+            "size INTEGER NOT NULL, parsed TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def content_hash(body: bytes) -> str:
+        return hashlib.sha256(body).hexdigest()
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, content_hash, size, parsed FROM fetch_cache WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, content_hash, size, parsed = row
+        return CacheEntry(etag, last_modified, content_hash, size, json.loads(parsed, object_hook=_decode))
+
+    def set(self, url: str, entry: CacheEntry) -> None:
+        parsed = json.dumps(entry.parsed, default=_encode)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fetch_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, entry.etag, entry.last_modified, entry.content_hash, entry.size, parsed, time.time()),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM fetch_cache")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
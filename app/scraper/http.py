@@ -0,0 +1,292 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Mapping, NamedTuple, Optional
+
+import aiohttp
+import requests
+
+from ..metrics import scrape_stage_duration
+from .fetchcache import FetchMetrics, fetch_metrics
+from .ratelimit import HostRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying: throttling and server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of sending a request while a source's circuit is open."""
+
+
+class FetchResult(NamedTuple):
+    """Outcome of fetching a page: its body, or why it couldn't be fetched."""
+    url: str
+    status: Optional[int]
+    text: Optional[str]
+    error: Optional[str] = None
+    attempts: int = 1
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for retryable responses."""
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 60.0,
+                 rng: Optional[random.Random] = None):
+        """
+        Args:
+            max_retries: Retries after the first attempt
+            base_delay: Upper bound in seconds of the first retry's delay
+            max_delay: Longest delay in seconds, also capping Retry-After
+            rng: Random number generator for the jitter (default: a new one)
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng or random.Random()
+
+    def delay(self, retry: int, retry_after: Optional[float] = None) -> float:
+        """
+        Seconds to wait before a retry.
+
+        Args:
+            retry: Number of the retry, starting at 0
+            retry_after: Delay requested by the server, honored up to max_delay
+
+        Returns:
+            The delay
+        """
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** retry))
+
+
+class CircuitBreaker:
+    """Stops requests to a source after repeated failures.
+
+    After ``failure_threshold`` consecutive failed requests the circuit
+    opens and requests are rejected for ``reset_timeout`` seconds. Then a
+    single trial request is let through: success closes the circuit,
+    failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self._trial or time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def release(self) -> None:
+        """Give up a request without an outcome, e.g. when it was cancelled, letting another trial through."""
+        with self._lock:
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    logger.warning(f"Opening circuit after {self.failures} consecutive failures")
+                self.opened_at = time.monotonic()
+                self._trial = False
+
+
+class HttpClient:
+    """HTTP layer shared by a scraper's requests.
+
+    Every request waits for its host's token bucket. Throttling and server
+    errors are retried with exponential backoff, honoring Retry-After, and
+    throttling also slows the host's rate down. Requests that still fail
+    count towards a circuit breaker, which pauses the whole source while
+    it is open. Other error statuses, such as 404, are returned as is.
+    """
+
+    def __init__(self, rate: float = 2.0, burst: Optional[float] = None, retry: Optional[RetryPolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None, metrics: Optional[FetchMetrics] = None):
+        """
+        Args:
+            rate: Allowed requests per second for each host
+            burst: Number of requests a host may receive back to back (default: rate)
+            retry: Retry policy (default: 3 retries starting at up to 1 second)
+            breaker: Circuit breaker (default: opens for 60 seconds after 5 failures)
+            metrics: Counters to update (default: the module-level fetch_metrics)
+        """
+        self.limiter = HostRateLimiter(rate, burst)
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.metrics = metrics if metrics is not None else fetch_metrics
+
+    def _check_circuit(self, url: str) -> None:
+        if not self.breaker.allow():
+            self.metrics.record(circuit_rejections=1)
+            raise CircuitOpenError(f"Circuit open, not requesting {url}")
+
+    def _retry_delay(self, url: str, retry: int, status: Optional[int], headers: Mapping[str, str]) -> float:
+        """Prepare a retry after a failed attempt and return how long to wait."""
+        if status == 429:
+            self.limiter.throttled(url)
+        self.metrics.record(retries=1)
+        return self.retry.delay(retry, retry_after_seconds(headers.get("Retry-After")))
+
+    def _finish(self, url: str, failed: bool) -> None:
+        if failed:
+            self.metrics.record(failed_requests=1)
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+            self.limiter.succeeded(url)
+
+    def get(self, session: requests.Session, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Send a GET request through a requests session.
+
+        Args:
+            session: Session sending the request
+            url: Page URL
+            **kwargs: Passed to ``session.get``
+
+        Returns:
+            The final response, which may have an error status
+
+        Raises:
+            CircuitOpenError: The source's circuit is open
+            requests.RequestException: Every attempt failed to connect
+        """
+        self._check_circuit(url)
+        try:
+            for retry in range(self.retry.max_retries + 1):
+                with scrape_stage_duration.time(stage="rate_limit_wait"):
+                    self.limiter.wait(url)
+                try:
+                    with scrape_stage_duration.time(stage="request"):
+                        response = session.get(url, **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    if retry == self.retry.max_retries:
+                        self._finish(url, failed=True)
+                        raise
+                    logger.warning(f"Retrying {url} after {e}")
+                    with scrape_stage_duration.time(stage="retry_backoff"):
+                        time.sleep(self._retry_delay(url, retry, None, {}))
+                    continue
+                except Exception:
+                    # Errors that aren't retried, e.g. a broken chunked body or too many redirects
+                    self._finish(url, failed=True)
+                    raise
+
+                if response.status_code in RETRY_STATUSES and retry < self.retry.max_retries:
+                    logger.warning(f"Retrying {url} after HTTP {response.status_code}")
+                    with scrape_stage_duration.time(stage="retry_backoff"):
+                        time.sleep(self._retry_delay(url, retry, response.status_code, response.headers))
+                    continue
+                self._finish(url, failed=response.status_code in RETRY_STATUSES)
+                return response
+        except BaseException:
+            # Let the next request be a trial if this one was, whatever interrupted it
+            self.breaker.release()
+            raise
+
+    async def aget(self, session: aiohttp.ClientSession, url: str, **kwargs: Any) -> FetchResult:
+        """
+        Fetch a page through an aiohttp session.
+
+        Args:
+            session: Session sending the request
+            url: Page URL
+            **kwargs: Passed to ``session.get``
+
+        Returns:
+            The page, or a failed result with the reason
+        """
+        try:
+            self._check_circuit(url)
+        except CircuitOpenError as e:
+            return FetchResult(url, None, None, error=str(e), attempts=0)
+
+        try:
+            for retry in range(self.retry.max_retries + 1):
+                with scrape_stage_duration.time(stage="rate_limit_wait"):
+                    await self.limiter.acquire(url)
+                attempts = retry + 1
+                try:
+                    with scrape_stage_duration.time(stage="request"):
+                        async with session.get(url, **kwargs) as response:
+                            status, headers = response.status, response.headers
+                            text = await response.text() if status < 400 else None
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if retry == self.retry.max_retries:
+                        self._finish(url, failed=True)
+                        return FetchResult(url, None, None, error=str(e) or type(e).__name__, attempts=attempts)
+                    logger.warning(f"Retrying {url} after {e!r}")
+                    with scrape_stage_duration.time(stage="retry_backoff"):
+                        await asyncio.sleep(self._retry_delay(url, retry, None, {}))
+                    continue
+                except Exception:
+                    # Errors that aren't retried, e.g. a body that can't be decoded
+                    self._finish(url, failed=True)
+                    raise
+
+                if status in RETRY_STATUSES and retry < self.retry.max_retries:
+                    logger.warning(f"Retrying {url} after HTTP {status}")
+                    with scrape_stage_duration.time(stage="retry_backoff"):
+                        await asyncio.sleep(self._retry_delay(url, retry, status, headers))
+                    continue
+                self._finish(url, failed=status in RETRY_STATUSES)
+                if status >= 400:
+                    return FetchResult(url, status, None, error=f"HTTP {status}", attempts=attempts)
+                return FetchResult(url, status, text, attempts=attempts)
+        except BaseException:
+            self.breaker.release()
+            raise
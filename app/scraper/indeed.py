@@ -1,20 +1,49 @@
 import requests
-from bs4 import BeautifulSoup
+import aiohttp
+import asyncio
 import logging
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Callable, Union
+import itertools
+import os
 import re
 import time
 
+from ..metrics import (scrape_stage_duration, scraper_bytes_downloaded, scraper_detail_fetch_duration,
+                       scraper_pages_fetched, scraper_parse_duration)
+from ..salary import parse_salary, salary_fields
+from .base import BaseScraper, register_scraper
+from .fetchcache import DEFAULT_CACHE_PATH, CacheEntry, FetchCache
+from .http import CircuitBreaker, FetchResult, HttpClient, RetryPolicy
+from .parsing import PageParser
+
 logger = logging.getLogger(__name__)
 
-class IndeedScraper:
+class IndeedScraper(BaseScraper):
     """Scraper for Indeed job listings in Vermont"""
     
     BASE_URL = "https://www.indeed.com/jobs"
     SOURCE_NAME = "indeed"
     
-    def __init__(self):
+    # Listings per results page, as advanced by the start= parameter
+    PAGE_SIZE = 10
+    
+    def __init__(self, fetch_cache: Optional[FetchCache] = None, parser: Optional[str] = None,
+                 max_pages: Optional[int] = 1, max_results: Optional[int] = None,
+                 http: Optional[HttpClient] = None):
+        """
+        Args:
+            fetch_cache: Cache of fetched pages for conditional requests (default: no caching)
+            parser: HTML parser backend (default: the fastest installed one)
+            max_pages: Maximum number of results pages per search (None for no limit)
+            max_results: Maximum number of listings per search (None for no limit)
+            http: Rate-limited, retrying HTTP client (default: 2 requests/s per host)
+        """
+        self.fetch_cache = fetch_cache
+        self.http = http or HttpClient()
+        self.max_pages = max_pages
+        self.max_results = max_results
+        self.parser = PageParser(parser)
         self.session = requests.Session()
         self.session.headers.update({
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
@@ -23,35 +52,7 @@ class IndeedScraper:
     
     def _parse_salary(self, salary_text: str) -> Dict[str, Optional[float]]:
         """Parse salary information from job listing."""
-        if not salary_text:
-            return {"salary_min": None, "salary_max": None}
-        
-        # Handle different salary formats
-        # Example patterns: "$50,000 - $70,000 a year", "$20 an hour"
-        salary_text = salary_text.lower()
-        
-        # Yearly salary range
-        range_match = re.search(r'\$(\d+[,\d]*)\s*-\s*\$(\d+[,\d]*)\s*a\s*year', salary_text)
-        if range_match:
-            min_salary = float(range_match.group(1).replace(',', ''))
-            max_salary = float(range_match.group(2).replace(',', ''))
-            return {"salary_min": min_salary, "salary_max": max_salary}
-        
-        # Single yearly salary
-        single_year_match = re.search(r'\$(\d+[,\d]*)\s*a\s*year', salary_text)
-        if single_year_match:
-            salary = float(single_year_match.group(1).replace(',', ''))
-            return {"salary_min": salary, "salary_max": salary}
-        
-        # Hourly rate
-        hourly_match = re.search(r'\$(\d+[,.\d]*)\s*an\s*hour', salary_text)
-        if hourly_match:
-            hourly_rate = float(hourly_match.group(1).replace(',', ''))
-            # Convert to yearly (40 hours/week, 52 weeks/year)
-            yearly = hourly_rate * 40 * 52
-            return {"salary_min": yearly, "salary_max": yearly}
-        
-        return {"salary_min": None, "salary_max": None}
+        return salary_fields(parse_salary(salary_text))
     
     def _parse_date(self, date_text: str) -> Optional[datetime]:
         """Parse posting date from job listing."""
@@ -94,76 +95,182 @@ class IndeedScraper:
         Returns:
             List of job listings
         """
-        params = {
-            "q": keywords,
-            "l": location,
-            "sort": "date"
-        }
+        return list(self.iter_search(keywords, location))
+    
+    def iter_search(self, keywords: str = "", location: str = "Vermont", max_pages: Optional[int] = None,
+                    max_results: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Search Indeed and yield job listings as each results page is parsed.
         
-        url = f"{self.BASE_URL}"
-        jobs = []
+        The next page is only requested once the caller has consumed the
+        listings of the previous one. Iteration stops at an empty page, at a
+        page that only repeats listings already yielded (Indeed serves the
+        last page again past the end of the results), or at a limit.
         
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
+        Args:
+            keywords: Job search keywords
+            location: Job location (default: Vermont)
+            max_pages: Maximum number of results pages (default: the scraper's max_pages)
+            max_results: Maximum number of listings (default: the scraper's max_results)
             
-            soup = BeautifulSoup(response.text, "html.parser")
-            job_listings = soup.select("div.job_seen_beacon")
+        Yields:
+            Job listings
+        """
+        max_pages = self.max_pages if max_pages is None else max_pages
+        max_results = self.max_results if max_results is None else max_results
+        seen_urls = set()
+        yielded = 0
+        
+        for page in itertools.count():
+            if max_pages is not None and page >= max_pages:
+                return
             
-            for job in job_listings:
-                try:
-                    # Extract job data
-                    title_elem = job.select_one("h2.jobTitle span")
-                    company_elem = job.select_one("span.companyName")
-                    location_elem = job.select_one("div.companyLocation")
-                    salary_elem = job.select_one("span.salary-snippet")
-                    date_elem = job.select_one("span.date")
-                    
-                    # Get URL
-                    job_id = job.get("data-jk", "")
-                    job_url = f"https://www.indeed.com/viewjob?jk={job_id}" if job_id else None
-                    
-                    # Check for remote
-                    is_remote = False
-                    if location_elem and "remote" in location_elem.text.lower():
-                        is_remote = True
-                    
-                    # Create job object
-                    job_data = {
-                        "title": title_elem.text.strip() if title_elem else "Unknown Title",
-                        "company": company_elem.text.strip() if company_elem else "Unknown Company",
-                        "location": location_elem.text.strip() if location_elem else "Unknown Location",
-                        "url": job_url,
-                        "source": self.SOURCE_NAME,
-                        "is_remote": is_remote,
-                        "posted_date": self._parse_date(date_elem.text if date_elem else ""),
-                    }
-                    
-                    # Parse salary if available
-                    if salary_elem:
-                        salary_data = self._parse_salary(salary_elem.text)
-                        job_data.update(salary_data)
-                    else:
-                        job_data.update({"salary_min": None, "salary_max": None})
-                    
-                    # Attempt to get job description
-                    # This would typically require visiting the job detail page
-                    # For simplicity, we'll just use a placeholder here
-                    job_data["description"] = "Full description requires visiting the job page."
-                    
-                    jobs.append(job_data)
-                    
-                except Exception as e:
-                    logger.error(f"Error parsing job listing: {e}")
-                    continue
-                    
-            return jobs
+            params = {
+                "q": keywords,
+                "l": location,
+                "sort": "date"
+            }
+            if page:
+                params["start"] = page * self.PAGE_SIZE
             
-        except requests.RequestException as e:
-            logger.error(f"Error fetching Indeed jobs: {e}")
-            return []
+            try:
+                jobs = self._fetch(self.BASE_URL, self._parse_search_results, params=params, kind="search")
+            except requests.RequestException as e:
+                logger.error(f"Error fetching Indeed jobs: {e}")
+                return
+            
+            new_jobs = [job_data for job_data in jobs if job_data["url"] is None or job_data["url"] not in seen_urls]
+            if not new_jobs:
+                return
+            
+            for job_data in new_jobs:
+                seen_urls.add(job_data["url"])
+                yield job_data
+                yielded += 1
+                if max_results is not None and yielded >= max_results:
+                    return
+    
+    def _parse_search_results(self, html: str) -> List[Dict[str, Any]]:
+        """Parse the job listings out of a search results page."""
+        jobs = []
+        job_listings = self.parser.select(html, "div.job_seen_beacon")
+        
+        for job in job_listings:
+            try:
+                # Extract job data
+                title_elem = job.select_one("h2.jobTitle span")
+                company_elem = job.select_one("span.companyName")
+                location_elem = job.select_one("div.companyLocation")
+                salary_elem = job.select_one("span.salary-snippet")
+                date_elem = job.select_one("span.date")
+                
+                # Get URL
+                job_id = job.get("data-jk", "")
+                job_url = f"https://www.indeed.com/viewjob?jk={job_id}" if job_id else None
+                
+                # Check for remote
+                is_remote = False
+                if location_elem and "remote" in location_elem.text.lower():
+                    is_remote = True
+                
+                # Create job object
+                job_data = {
+                    "title": title_elem.text.strip() if title_elem else "Unknown Title",
+                    "company": company_elem.text.strip() if company_elem else "Unknown Company",
+                    "location": location_elem.text.strip() if location_elem else "Unknown Location",
+                    "url": job_url,
+                    "source": self.SOURCE_NAME,
+                    "is_remote": is_remote,
+                    "posted_date": self._parse_date(date_elem.text if date_elem else ""),
+                }
+                
+                # Parse salary if available
+                salary_text = salary_elem.text.strip() if salary_elem else None
+                job_data["salary_text"] = salary_text or None
+                job_data.update(self._parse_salary(salary_text))
+                
+                # Attempt to get job description
+                # This would typically require visiting the job detail page
+                # For simplicity, we'll just use a placeholder here
+                job_data["description"] = "Full description requires visiting the job page."
+                
+                jobs.append(job_data)
+                
+            except Exception as e:
+                logger.error(f"Error parsing job listing: {e}")
+                continue
+                
+        return jobs
+    
+    def _fetch(self, url: str, parse: Callable[[str], Any], params: Optional[Dict[str, Any]] = None,
+               kind: str = "detail") -> Any:
+        """
+        Fetch a page with the session and parse it.
+        
+        Requests go through the scraper's HTTP client, so they are rate
+        limited and retried. With a fetch cache, the request carries the page's cached validators.
+        A 304 response or a body with the cached hash returns the cached
+        parse result without parsing the page again.
+        
+        Args:
+            url: Page URL
+            parse: Function turning the page HTML into a result
+            params: Query string parameters
+            kind: Page kind recorded in the scraper metrics ("search" or "detail")
+            
+        Returns:
+            The parsed page
+        """
+        cache = self.fetch_cache
+        request_args = {"params": params} if params else {}
+        if cache is None:
+            response = self.http.get(self.session, url, **request_args)
+            response.raise_for_status()
+            self._record_page(kind, len(response.content))
+            return self._parse(parse, response.text, kind)
+        
+        key = requests.Request("GET", url, params=params).prepare().url
+        entry = cache.get(key)
+        if entry is not None:
+            request_args["headers"] = entry.conditional_headers()
+        response = self.http.get(self.session, url, **request_args)
+        
+        if response.status_code == 304 and entry is not None:
+            cache.metrics.record(requests=1, not_modified=1, bytes_saved=entry.size, parses_avoided=1)
+            self._record_page(kind, 0)
+            return entry.parsed
+        response.raise_for_status()
+        
+        body = response.content
+        content_hash = cache.content_hash(body)
+        etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+        cache.metrics.record(requests=1, bytes_downloaded=len(body))
+        self._record_page(kind, len(body))
+        
+        if entry is not None and entry.content_hash == content_hash:
+            cache.metrics.record(unchanged=1, parses_avoided=1)
+            parsed = entry.parsed
+        else:
+            cache.metrics.record(parses=1)
+            parsed = self._parse(parse, response.text, kind)
+        
+        cache.set(key, CacheEntry(etag, last_modified, content_hash, len(body), parsed))
+        return parsed
+    
+    def _record_page(self, kind: str, size: int) -> None:
+        scraper_pages_fetched.inc(source=self.SOURCE_NAME, kind=kind)
+        scraper_bytes_downloaded.inc(size, source=self.SOURCE_NAME)
+    
+    def _parse(self, parse: Callable[[str], Any], html: str, kind: str) -> Any:
+        start = time.perf_counter()
+        try:
+            return parse(html)
+        finally:
+            elapsed = time.perf_counter() - start
+            scraper_parse_duration.observe(elapsed, source=self.SOURCE_NAME, kind=kind)
+            scrape_stage_duration.observe(elapsed, stage="parse")
 
-    def get_job_details(self, job_url: str) -> Dict[str, Any]:
+    def get_job_details(self, job_url: str) -> Union[Dict[str, Any], FetchResult]:
         """
         Get detailed information for a specific job.
         
@@ -171,26 +278,110 @@ class IndeedScraper:
             job_url: URL of the job listing
             
         Returns:
-            Dictionary with detailed job information
+            Dictionary with detailed job information, or the failed FetchResult
         """
         try:
-            # Add a delay to avoid getting blocked
-            time.sleep(1)
-            
-            response = self.session.get(job_url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # Extract job description
-            description_elem = soup.select_one("div#jobDescriptionText")
-            description = description_elem.text.strip() if description_elem else "No description available."
-            
-            return {"description": description}
-            
+            with scraper_detail_fetch_duration.time(source=self.SOURCE_NAME):
+                return self._fetch(job_url, self._parse_job_details)
         except requests.RequestException as e:
             logger.error(f"Error fetching job details: {e}")
-            return {"description": "Failed to retrieve job description."}
+            status = e.response.status_code if e.response is not None else None
+            return FetchResult(job_url, status, None, error=str(e))
+
+    def _parse_job_details(self, html: str) -> Dict[str, Any]:
+        """Parse the detail fields out of a job page."""
+        # Extract job description
+        description_elem = self.parser.select_one(html, "div#jobDescriptionText")
+        description = description_elem.text.strip() if description_elem else "No description available."
+        
+        return {"description": description}
+
+
+@register_scraper
+class AsyncIndeedScraper(IndeedScraper):
+    """Indeed scraper that fetches job detail pages concurrently.
+
+    Detail pages are fetched by a bounded pool of aiohttp workers. Requests
+    are paced by the HTTP client's per-host token buckets, shared with the
+    search requests, so throughput follows the allowed request rate rather
+    than the number of jobs.
+    """
+    
+    def __init__(self, concurrency: int = 5, rate: float = 2.0, burst: Optional[float] = None,
+                 timeout: float = 30.0, fetch_cache: Optional[FetchCache] = None, parser: Optional[str] = None,
+                 max_pages: Optional[int] = 1, max_results: Optional[int] = None,
+                 http: Optional[HttpClient] = None):
+        """
+        Args:
+            concurrency: Maximum number of detail requests in flight
+            rate: Allowed requests per second for each host
+            burst: Number of requests a host may receive back to back (default: rate)
+            timeout: Total timeout in seconds for a single request
+            fetch_cache: Cache of fetched search pages for conditional requests (default: no caching)
+            parser: HTML parser backend (default: the fastest installed one)
+            max_pages: Maximum number of results pages per search (None for no limit)
+            max_results: Maximum number of listings per search (None for no limit)
+            http: HTTP client (default: one limited to ``rate`` and ``burst``)
+        """
+        super().__init__(fetch_cache=fetch_cache, parser=parser, max_pages=max_pages, max_results=max_results,
+                         http=http or HttpClient(rate, burst))
+        self.concurrency = concurrency
+        self.timeout = timeout
+    
+    @classmethod
+    def from_env(cls) -> "AsyncIndeedScraper":
+        cache_path = os.getenv("SCRAPER_CACHE_PATH", DEFAULT_CACHE_PATH)
+        return cls(
+            concurrency=int(os.getenv("SCRAPER_CONCURRENCY", "5")),
+            fetch_cache=FetchCache(cache_path) if cache_path else None,
+            parser=os.getenv("SCRAPER_HTML_PARSER"),
+            max_pages=int(os.getenv("SCRAPER_MAX_PAGES", "5")) or None,
+            max_results=int(os.getenv("SCRAPER_MAX_RESULTS", "0")) or None,
+            http=HttpClient(
+                rate=float(os.getenv("SCRAPER_RATE_LIMIT", "2.0")),
+                retry=RetryPolicy(max_retries=int(os.getenv("SCRAPER_MAX_RETRIES", "3"))),
+                breaker=CircuitBreaker(
+                    failure_threshold=int(os.getenv("SCRAPER_BREAKER_THRESHOLD", "5")),
+                    reset_timeout=float(os.getenv("SCRAPER_BREAKER_RESET", "60")),
+                ),
+            ),
+        )
+    
+    async def _fetch_job_details(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                                 job_url: str) -> Union[Dict[str, Any], FetchResult]:
+        async with semaphore:
+            with scraper_detail_fetch_duration.time(source=self.SOURCE_NAME):
+                result = await self.http.aget(session, job_url)
+        if not result.ok:
+            logger.error(f"Error fetching job details from {job_url}: {result.error}")
+            return result
+        self._record_page("detail", len(result.text.encode()))
+        return self._parse(self._parse_job_details, result.text, "detail")
+    
+    async def get_jobs_details(self, job_urls: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get detailed information for many jobs concurrently.
+        
+        Args:
+            job_urls: URLs of the job listings
+            
+        Returns:
+            Dictionary mapping each URL to its detailed job information, or
+            to the failed FetchResult if the page couldn't be fetched
+        """
+        urls = list(dict.fromkeys(url for url in job_urls if url))
+        if not urls:
+            return {}
+        
+        semaphore = asyncio.Semaphore(self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        
+        async with aiohttp.ClientSession(headers=dict(self.session.headers), timeout=timeout) as session:
+            results = await asyncio.gather(*(
+                self._fetch_job_details(session, semaphore, url) for url in urls
+            ))
+        
+        return dict(zip(urls, results))
 
 # Usage example:
 if __name__ == "__main__":
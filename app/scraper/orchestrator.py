@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import math
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from ..metrics import scrape_stage_duration, scraper_duplicates_skipped, scraper_jobs_inserted
+from .base import BaseScraper
+from .fetchcache import fetch_metrics
+from .http import FetchResult
+
+logger = logging.getLogger(__name__)
+
+JobList = List[Dict[str, Any]]
+
+
+class ScrapeBudget:
+    """Limits the requests and time a scrape run may use.
+
+    Search result pages and job detail pages are charged as they are
+    consumed. The budget is checked between batches, so a run stops within
+    one batch of its limits.
+    """
+
+    def __init__(self, max_requests: Optional[int] = None, max_seconds: Optional[float] = None):
+        """
+        Args:
+            max_requests: Maximum number of requests sent (default: no limit)
+            max_seconds: Maximum run time in seconds (default: no limit)
+        """
+        self.max_requests = max_requests
+        self.max_seconds = max_seconds
+        self.requests = 0
+        self.started = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def exhausted(self) -> bool:
+        if self.max_requests is not None and self.requests >= self.max_requests:
+            return True
+        return self.max_seconds is not None and self.elapsed >= self.max_seconds
+
+    def spend(self, requests: int) -> None:
+        self.requests += requests
+
+
+async def scrape_sources(
+    scrapers: Dict[str, BaseScraper],
+    keywords: Iterable[str],
+    filter_new: Callable[[JobList], JobList],
+    ingest: Callable[[JobList], int],
+    location: str = "Vermont",
+    batch_size: int = 25,
+    budget: Optional[ScrapeBudget] = None,
+    on_error: Optional[Callable[[str, str, Exception], None]] = None,
+) -> Dict[str, int]:
+    """
+    Run every (source, keyword) search concurrently and ingest results as they arrive.
+
+    Each search streams its listings from a worker thread, limited per
+    source by the scraper's ``search_concurrency``, so a slow source only
+    delays its own searches. The thread pool is sized to fit every
+    source's limit at once. Every ``batch_size`` listings pass through
+    ``filter_new``, the source's detail fetching and ``ingest`` while the
+    search keeps fetching its next pages. The two database stages share
+    one session, so they run in worker threads one at a time. A listing
+    found by several keywords only has its details fetched and is only
+    ingested by the first search that claims its URL. Listings whose
+    details fail to fetch are not ingested, so a later search retries
+    them. Once the budget is exhausted, searches stop fetching and
+    remaining batches are dropped.
+
+    Args:
+        scrapers: Scrapers by source name
+        keywords: Search keywords to run against every source
+        filter_new: Drops listings that are already stored
+        ingest: Stores new listings and returns how many were inserted
+        location: Job location passed to every search
+        batch_size: Number of streamed listings processed together
+        budget: Requests and time the run may use (default: no limit)
+        on_error: Called with the source, keyword and exception of a failed search
+
+    Returns:
+        Dictionary mapping each source name to its number of inserted jobs
+    """
+    keywords = list(keywords)
+    budget = budget if budget is not None else ScrapeBudget()
+    semaphores = {name: asyncio.Semaphore(scraper.search_concurrency) for name, scraper in scrapers.items()}
+    db_lock = asyncio.Lock()
+    inserted: Counter = Counter()
+    claimed_urls = set()
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=sum(scraper.search_concurrency for scraper in scrapers.values()) + 1,
+                                  thread_name_prefix="scraper")
+
+    async def in_thread(func: Callable[..., Any], *args: Any) -> Any:
+        return await loop.run_in_executor(executor, partial(func, *args))
+
+    async def in_db(stage: Callable[[JobList], Any], jobs: JobList, label: str) -> Any:
+        async with db_lock:
+            # Timed once the lock is held, so waiting for another search's stage isn't counted
+            with scrape_stage_duration.time(stage=label):
+                return await in_thread(stage, jobs)
+
+    async def process(name: str, scraper: BaseScraper, listings: JobList) -> None:
+        unstored = await in_db(filter_new, listings, "filter_new")
+        if len(listings) > len(unstored):
+            scraper_duplicates_skipped.inc(len(listings) - len(unstored), source=name, reason="stored")
+        new_jobs = []
+        for job_data in unstored:
+            if job_data["url"] not in claimed_urls:
+                claimed_urls.add(job_data["url"])
+                new_jobs.append(job_data)
+        skipped = len(unstored) - len(new_jobs)
+        if skipped:
+            fetch_metrics.record(duplicate_details_skipped=skipped)
+            scraper_duplicates_skipped.inc(skipped, source=name, reason="claimed")
+        if not new_jobs or budget.exhausted:
+            return
+
+        budget.spend(len(new_jobs))
+        details_by_url = await scraper.get_jobs_details(job_data["url"] for job_data in new_jobs)
+        fetched = []
+        for job_data in new_jobs:
+            details = details_by_url.get(job_data["url"])
+            if isinstance(details, FetchResult):
+                # Leave the job for a later search to fetch again rather than storing it without details
+                claimed_urls.discard(job_data["url"])
+                continue
+            if details:
+                job_data["description"] = details.get("description", job_data.get("description", ""))
+            fetched.append(job_data)
+        failed = len(new_jobs) - len(fetched)
+        if failed:
+            fetch_metrics.record(details_failed=failed)
+        if not fetched:
+            return
+
+        count = await in_db(ingest, fetched, "ingest")
+        inserted[name] += count
+        scraper_jobs_inserted.inc(count, source=name)
+
+    async def scrape(name: str, scraper: BaseScraper, keyword: str) -> None:
+        try:
+            async with semaphores[name]:
+                if budget.exhausted:
+                    return
+                batch: JobList = []
+                listings = pages = 0
+                search = scraper.aiter_search(keyword, location, executor=executor)
+                async with aclosing(search):
+                    async for job_data in search:
+                        # Charge a results page when its first listing arrives
+                        listings += 1
+                        page = math.ceil(listings / scraper.PAGE_SIZE) if scraper.PAGE_SIZE else 1
+                        budget.spend(page - pages)
+                        pages = page
+                        batch.append(job_data)
+                        if len(batch) >= batch_size:
+                            await process(name, scraper, batch)
+                            batch = []
+                            if budget.exhausted:
+                                logger.info(f"Scrape budget exhausted, stopping {name} search for {keyword!r}")
+                                return
+                if batch:
+                    await process(name, scraper, batch)
+        except Exception as e:
+            # One failing source or keyword shouldn't abort the rest of the run
+            logger.exception(f"Error scraping {name} for {keyword!r}")
+            if on_error is not None:
+                on_error(name, keyword, e)
+
+    try:
+        await asyncio.gather(*(
+            scrape(name, scraper, keyword) for name, scraper in scrapers.items() for keyword in keywords
+        ))
+    finally:
+        executor.shutdown(wait=False)
+    return {name: inserted[name] for name in scrapers}
@@ -0,0 +1,120 @@
+import importlib.util
+import re
+from typing import Any, Callable, List, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Parser backends from fastest to slowest. selectolax and lxml are optional.
+BACKENDS = ("selectolax", "lxml", "html.parser")
+
+_BACKEND_MODULES = {"selectolax": "selectolax", "lxml": "lxml", "html.parser": None}
+
+# Selectors of the form tag, tag.class or tag#id, which can be strained
+_SIMPLE_SELECTOR = re.compile(r"^(?P<tag>[a-zA-Z][\w-]*)(?:\.(?P<cls>[\w-]+)|#(?P<id>[\w-]+))?$")
+
+
+def available_backends() -> List[str]:
+    """Parser backends usable in this environment, fastest first."""
+    return [
+        name for name in BACKENDS
+        if _BACKEND_MODULES[name] is None or importlib.util.find_spec(_BACKEND_MODULES[name]) is not None
+    ]
+
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    """
+    Pick the parser backend to use.
+
+    Args:
+        name: A backend from BACKENDS, or None/"auto" for the fastest installed one
+
+    Returns:
+        The backend name
+    """
+    if name in (None, "", "auto"):
+        return available_backends()[0]
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend {name!r}, expected one of {', '.join(BACKENDS)}")
+    if name not in available_backends():
+        raise ImportError(f"HTML parser backend {name!r} requires the {_BACKEND_MODULES[name]} package")
+    return name
+
+
+def _has_class(name: str) -> Callable[[Any], bool]:
+    def match(value: Any) -> bool:
+        if not value:
+            return False
+        classes = value.split() if isinstance(value, str) else value
+        return name in classes
+    return match
+
+
+def _strainer(selector: str) -> Optional[SoupStrainer]:
+    """A SoupStrainer building only the elements a simple selector matches."""
+    match = _SIMPLE_SELECTOR.match(selector)
+    if match is None:
+        return None
+    if match["cls"]:
+        return SoupStrainer(match["tag"], class_=_has_class(match["cls"]))
+    if match["id"]:
+        return SoupStrainer(match["tag"], id=match["id"])
+    return SoupStrainer(match["tag"])
+
+
+class _SelectolaxNode:
+    """Adapts a selectolax node to the subset of the BeautifulSoup Tag API the scrapers use."""
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node):
+        self._node = node
+
+    def select_one(self, selector: str) -> Optional["_SelectolaxNode"]:
+        node = self._node.css_first(selector)
+        return _SelectolaxNode(node) if node is not None else None
+
+    def select(self, selector: str) -> List["_SelectolaxNode"]:
+        return [_SelectolaxNode(node) for node in self._node.css(selector)]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        value = self._node.attributes.get(name)
+        return default if value is None else value
+
+    @property
+    def text(self) -> str:
+        return self._node.text()
+
+
+class PageParser:
+    """Finds elements in HTML pages with a selectable parser backend.
+
+    Returned elements support ``select_one``, ``select``, ``get`` and
+    ``text`` like BeautifulSoup tags. With the BeautifulSoup backends, a
+    top-level ``tag``, ``tag.class`` or ``tag#id`` selector only builds the
+    matching subtrees instead of the whole document.
+    """
+
+    def __init__(self, backend: Optional[str] = None):
+        """
+        Args:
+            backend: A backend from BACKENDS (default: the fastest installed one)
+        """
+        self.backend = resolve_backend(backend)
+        if self.backend == "selectolax":
+            from selectolax.lexbor import LexborHTMLParser
+            self._lexbor = LexborHTMLParser
+
+    def select(self, html: str, selector: str) -> List[Any]:
+        """Return every element of the page matching a CSS selector."""
+        if self.backend == "selectolax":
+            return [_SelectolaxNode(node) for node in self._lexbor(html).css(selector)]
+        soup = BeautifulSoup(html, self.backend, parse_only=_strainer(selector))
+        return soup.select(selector)
+
+    def select_one(self, html: str, selector: str) -> Optional[Any]:
+        """Return the first element of the page matching a CSS selector, if any."""
+        if self.backend == "selectolax":
+            node = self._lexbor(html).css_first(selector)
+            return _SelectolaxNode(node) if node is not None else None
+        soup = BeautifulSoup(html, self.backend, parse_only=_strainer(selector))
+        return soup.select_one(selector)
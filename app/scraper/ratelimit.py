@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """Token-bucket rate limiter.
+
+    Tokens are added continuously at ``rate`` per second up to ``capacity``.
+    Each request consumes one token; callers wait when the bucket is empty.
+    A bucket can be shared by event loop tasks and worker threads.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def try_acquire(self) -> float:
+        """Take a token if one is available.
+
+        Returns:
+            0 if a token was taken, otherwise the number of seconds to wait
+        """
+        # The lock is only held for the arithmetic, so taking it never
+        # blocks the event loop noticeably.
+        with self._lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def set_rate(self, rate: float) -> None:
+        """Change the refill rate, keeping the tokens accumulated so far."""
+        with self._lock:
+            self._refill()
+            self.rate = float(rate)
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        while True:
+            delay = self.try_acquire()
+            if not delay:
+                return
+            await asyncio.sleep(delay)
+
+    def wait(self) -> None:
+        """Block the calling thread until a token is available and take it."""
+        while True:
+            delay = self.try_acquire()
+            if not delay:
+                return
+            time.sleep(delay)
+
+
+class HostRateLimiter:
+    """Keeps one token bucket per host so each site gets its own request rate.
+
+    Rates adapt to the host: each throttling response (429) halves the
+    host's rate down to ``min_rate``, and each successful request adds back
+    a tenth of ``rate``, up to ``rate``.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, min_rate: Optional[float] = None):
+        """
+        Args:
+            rate: Allowed requests per second for each host
+            capacity: Number of requests a host may receive back to back (default: rate)
+            min_rate: Lowest rate a throttling host is slowed down to (default: rate / 16)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate if min_rate is not None else rate / 16
+        self.buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = TokenBucket(self.rate, self.capacity)
+        return bucket
+
+    async def acquire(self, url: str) -> None:
+        await self.bucket_for(url).acquire()
+
+    def wait(self, url: str) -> None:
+        self.bucket_for(url).wait()
+
+    def throttled(self, url: str) -> None:
+        """Slow down requests to a host that asked us to back off."""
+        bucket = self.bucket_for(url)
+        bucket.set_rate(max(self.min_rate, bucket.rate / 2))
+
+    def succeeded(self, url: str) -> None:
+        """Speed requests to a host back up towards the configured rate."""
+        bucket = self.bucket_for(url)
+        if bucket.rate < self.rate:
+            bucket.set_rate(min(self.rate, bucket.rate + self.rate / 10))
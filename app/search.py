@@ -0,0 +1,158 @@
+import os
+import re
+from typing import Optional, Tuple
+
+from sqlalchemy import DDL, and_, event, inspect, or_, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import column, table
+
+from . import schemas
+
+# Use the full-text index for keyword searches when the database has one
+FULLTEXT_ENABLED = os.getenv("FULLTEXT_SEARCH", "1").lower() not in ("0", "false", "no")
+
+FTS_TABLE = "jobs_fts"
+
+# SQLite: external-content FTS5 table kept in sync with jobs by triggers
+_SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, content='jobs', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF title, description ON jobs BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+]
+
+# PostgreSQL: GIN expression index, maintained by the database itself
+_PG_DOCUMENT = "to_tsvector('english', coalesce(jobs.title, '') || ' ' || coalesce(jobs.description, ''))"
+_PG_DDL = [
+    "CREATE INDEX IF NOT EXISTS ix_jobs_fts ON jobs USING gin "
+    "(to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, '')))",
+]
+
+for statement in _SQLITE_DDL:
+    event.listen(schemas.Job.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in _PG_DDL:
+    event.listen(schemas.Job.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+event.listen(
+    schemas.Job.__table__, "after_drop", DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect="sqlite")
+)
+
+_fts = table(FTS_TABLE, column("rowid"), column("rank"))
+
+
+def ensure_fulltext_index(engine: Engine) -> None:
+    """Create the full-text index on a database whose jobs table predates it.
+
+    New databases get the index together with the jobs table. On SQLite a
+    newly created FTS table is populated from the existing rows.
+    """
+    dialect = engine.dialect.name
+    with engine.begin() as conn:
+        if dialect == "sqlite":
+            existed = inspect(conn).has_table(FTS_TABLE)
+            for statement in _SQLITE_DDL:
+                conn.execute(text(statement))
+            if not existed:
+                conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+        elif dialect == "postgresql":
+            for statement in _PG_DDL:
+                conn.execute(text(statement))
+
+
+def _sqlite_match_query(keyword: str) -> Optional[str]:
+    """Turn free text into an FTS5 query matching every word as a prefix."""
+    words = re.findall(r"\w+", keyword)
+    return " ".join(f'"{word}"*' for word in words) or None
+
+
+def filter_keyword(query, keyword: str, dialect: str) -> Tuple[object, Optional[object]]:
+    """
+    Restrict a jobs query to listings matching a search keyword.
+
+    Uses the full-text index when enabled for the dialect, otherwise a
+    substring match on title and description.
+
+    Args:
+        query: ORM Query or Select over schemas.Job
+        keyword: Search text
+        dialect: Name of the database dialect
+
+    Returns:
+        The filtered query and an ORDER BY expression putting the most
+        relevant jobs first, or None if the query can't be ranked
+    """
+    if FULLTEXT_ENABLED and dialect == "sqlite":
+        match_query = _sqlite_match_query(keyword)
+        if match_query:
+            query = query.join(_fts, _fts.c.rowid == schemas.Job.id).filter(
+                text(f"{FTS_TABLE} MATCH :fts_query").bindparams(fts_query=match_query)
+            )
+            # FTS5's rank column is the BM25 score, lower is more relevant
+            return query, _fts.c.rank
+
+    if FULLTEXT_ENABLED and dialect == "postgresql":
+        query = query.filter(
+            text(f"{_PG_DOCUMENT} @@ websearch_to_tsquery('english', :fts_query)").bindparams(fts_query=keyword)
+        )
+        rank = text(
+            f"ts_rank_cd({_PG_DOCUMENT}, websearch_to_tsquery('english', :fts_rank_query)) DESC"
+        ).bindparams(fts_rank_query=keyword)
+        return query, rank
+
+    query = query.filter(or_(
+        schemas.Job.title.ilike(f"%{keyword}%"),
+        schemas.Job.description.ilike(f"%{keyword}%")
+    ))
+    return query, None
+
+
+def filter_contains(column, value: str):
+    """
+    Condition matching rows whose lowercased column contains a value.
+
+    No index serves a substring match, so listings filtered this way walk
+    the posted_date index and stop after a page of matches, which is
+    fastest when the value is common.
+
+    Args:
+        column: Column holding lowercased text, e.g. schemas.Job.company_lower
+        value: Text to find, case-insensitively
+
+    Returns:
+        A filter expression
+    """
+    return column.contains(value.lower(), autoescape=True)
+
+
+def filter_prefix(column, value: str, dialect: str):
+    """
+    Condition matching rows whose lowercased column starts with a value.
+
+    SQLite only uses an index for ``LIKE 'prefix%'`` with
+    case_sensitive_like on, so it gets the equivalent range instead.
+    The range is served by the column's index, which suits prefixes
+    matching few jobs; listings of a common prefix pay for a sort.
+
+    Args:
+        column: Column holding lowercased text, e.g. schemas.Job.company_lower
+        value: Prefix to match, case-insensitively
+        dialect: Name of the database dialect
+
+    Returns:
+        A filter expression that can be served by an index on the column
+    """
+    prefix = value.lower()
+    if dialect == "sqlite":
+        return and_(column >= prefix, column < prefix + "\U0010ffff")
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return column.like(f"{escaped}%", escape="\\")
@@ -0,0 +1,212 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Set
+
+from sqlalchemy import case, delete, func, insert, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from . import schemas
+
+# Counter dimensions kept in the stat_counters table
+TOTAL = "total"
+SOURCE = "source"
+REMOTE = "remote"
+COMPANY = "company"
+TAG = "tag"
+POSTED_DAY = "posted_day"
+
+TOP_N = 10
+RECENT_DAYS = 7
+
+
+def compute_stats(db: Session) -> Dict[str, Any]:
+    """Compute job statistics directly from the jobs and job_tags tables, counting each posting once."""
+    Job = schemas.Job
+    canonical = Job.canonical_id.is_(None)
+    total_jobs = db.scalar(select(func.count(Job.id)).where(canonical))
+
+    jobs_by_source = db.execute(select(Job.source, func.count(Job.id)).where(canonical).group_by(Job.source)).all()
+    remote_jobs = db.scalar(select(func.count(Job.id)).where(canonical, Job.is_remote == True))
+
+    week_ago = datetime.utcnow() - timedelta(days=RECENT_DAYS)
+    recent_jobs = db.scalar(select(func.count(Job.id)).where(canonical, Job.posted_date >= week_ago))
+
+    top_companies = db.execute(
+        select(Job.company, func.count(Job.id)).where(canonical)
+        .group_by(Job.company).order_by(func.count(Job.id).desc()).limit(TOP_N)
+    ).all()
+
+    popular_tags = db.execute(
+        select(schemas.Tag.name, func.count(schemas.JobTag.job_id))
+        .join(schemas.JobTag).join(Job).where(canonical)
+        .group_by(schemas.Tag.name).order_by(func.count(schemas.JobTag.job_id).desc()).limit(TOP_N)
+    ).all()
+
+    return {
+        "total_jobs": total_jobs,
+        "jobs_by_source": dict(jobs_by_source),
+        "remote_jobs": remote_jobs,
+        "onsite_jobs": total_jobs - remote_jobs,
+        "recent_jobs": recent_jobs,
+        "top_companies": dict(top_companies),
+        "popular_tags": dict(popular_tags),
+    }
+
+
+def refresh_stat_counters(db: Session) -> None:
+    """Rebuild every counter in stat_counters from the jobs and job_tags tables, skipping duplicates."""
+    try:
+        _rebuild_stat_counters(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def ensure_stat_counters(db: Session) -> None:
+    """Build the counters if they have never been built, e.g. for a database created before they existed."""
+    total = db.scalar(select(schemas.StatCounter.count).where(
+        schemas.StatCounter.dimension == TOTAL, schemas.StatCounter.key == ""))
+    if total is None and db.scalar(select(func.count(schemas.Job.id))):
+        refresh_stat_counters(db)
+
+
+def _rebuild_stat_counters(db: Session) -> None:
+    Job = schemas.Job
+    StatCounter = schemas.StatCounter
+    columns = [StatCounter.dimension, StatCounter.key, StatCounter.count]
+    canonical = Job.canonical_id.is_(None)
+    remote_key = case((Job.is_remote == True, "true"), else_="false")
+    aggregates = [
+        select(literal(TOTAL), literal(""), func.count(Job.id)).where(canonical),
+        select(literal(SOURCE), func.coalesce(Job.source, ""), func.count(Job.id)).where(canonical)
+        .group_by(Job.source),
+        select(literal(REMOTE), remote_key, func.count(Job.id)).where(canonical).group_by(remote_key),
+        select(literal(COMPANY), func.coalesce(Job.company, ""), func.count(Job.id)).where(canonical)
+        .group_by(Job.company),
+        select(literal(TAG), schemas.Tag.name, func.count(schemas.JobTag.job_id))
+        .join(schemas.JobTag).join(Job).where(canonical).group_by(schemas.Tag.name),
+    ]
+
+    db.execute(delete(StatCounter))
+    for aggregate in aggregates:
+        db.execute(insert(StatCounter).from_select(columns, aggregate))
+    # Day buckets need Python-side formatting to stay dialect independent
+    days = db.execute(
+        select(func.date(Job.posted_date), func.count(Job.id))
+        .where(canonical, Job.posted_date.isnot(None)).group_by(func.date(Job.posted_date))
+    ).all()
+    if days:
+        db.execute(insert(StatCounter), [
+            {"dimension": POSTED_DAY, "key": str(day), "count": count} for day, count in days
+        ])
+
+
+def _remote_key(is_remote: Any) -> str:
+    return "true" if is_remote else "false"
+
+
+def increment_stat_counters(db: Session, jobs: Iterable[Dict[str, Any]],
+                            tag_sets: Iterable[Set[str]] = ()) -> None:
+    """
+    Add newly inserted jobs to the counters, within the caller's transaction.
+
+    Args:
+        db: Database session
+        jobs: Job dictionaries that were just inserted
+        tag_sets: Tag names attached to the inserted jobs
+    """
+    counts: Counter = Counter()
+    for job_data in jobs:
+        counts[(TOTAL, "")] += 1
+        counts[(SOURCE, job_data.get("source") or "")] += 1
+        counts[(REMOTE, _remote_key(job_data.get("is_remote")))] += 1
+        counts[(COMPANY, job_data.get("company") or "")] += 1
+        if job_data.get("posted_date"):
+            counts[(POSTED_DAY, job_data["posted_date"].date().isoformat())] += 1
+    for names in tag_sets:
+        for name in names:
+            counts[(TAG, name)] += 1
+    if not counts:
+        return
+
+    rows = [{"dimension": dimension, "key": key, "count": count} for (dimension, key), count in counts.items()]
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = dialect_insert(schemas.StatCounter)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["dimension", "key"],
+            set_={"count": schemas.StatCounter.count + stmt.excluded.count},
+        )
+        db.execute(stmt, rows)
+    else:
+        # Without an upsert, rebuild the counters from the jobs just inserted
+        _rebuild_stat_counters(db)
+
+
+def _top(db: Session, dimension: str) -> Dict[str, int]:
+    StatCounter = schemas.StatCounter
+    rows = db.execute(
+        select(StatCounter.key, StatCounter.count)
+        .where(StatCounter.dimension == dimension, StatCounter.count > 0)
+        .order_by(StatCounter.count.desc()).limit(TOP_N)
+    ).all()
+    return dict(rows)
+
+
+def _recent_jobs(db: Session) -> int:
+    """Count jobs posted in the last week from the day buckets.
+
+    Whole days after the cutoff come from the counters; only the cutoff day
+    itself is counted in the jobs table, through the posted_date index.
+    """
+    StatCounter = schemas.StatCounter
+    week_ago = datetime.utcnow() - timedelta(days=RECENT_DAYS)
+    next_day = week_ago.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+    whole_days = db.scalar(
+        select(func.coalesce(func.sum(StatCounter.count), 0))
+        .where(StatCounter.dimension == POSTED_DAY, StatCounter.key >= next_day.date().isoformat())
+    )
+    partial_day = db.scalar(
+        select(func.count(schemas.Job.id))
+        .where(schemas.Job.canonical_id.is_(None), schemas.Job.posted_date >= week_ago,
+               schemas.Job.posted_date < next_day)
+    )
+    return whole_days + partial_day
+
+
+def read_stats(db: Session, fresh: bool = False) -> Dict[str, Any]:
+    """
+    Read job statistics from the stat_counters table.
+
+    The counters are maintained by the ingestion path, so reading them
+    doesn't scan the jobs table. They are built once at startup, by
+    ensure_stat_counters, and only rebuilt here when ``fresh`` is set, so a
+    plain read never writes.
+    """
+    StatCounter = schemas.StatCounter
+    if fresh:
+        refresh_stat_counters(db)
+    total_jobs = db.scalar(
+        select(StatCounter.count).where(StatCounter.dimension == TOTAL, StatCounter.key == "")
+    ) or 0
+
+    jobs_by_source = dict(db.execute(
+        select(StatCounter.key, StatCounter.count).where(StatCounter.dimension == SOURCE, StatCounter.count > 0)
+    ).all())
+    remote_jobs = db.scalar(
+        select(StatCounter.count).where(StatCounter.dimension == REMOTE, StatCounter.key == "true")
+    ) or 0
+
+    return {
+        "total_jobs": total_jobs,
+        "jobs_by_source": jobs_by_source,
+        "remote_jobs": remote_jobs,
+        "onsite_jobs": total_jobs - remote_jobs,
+        "recent_jobs": _recent_jobs(db),
+        "top_companies": _top(db, COMPANY),
+        "popular_tags": _top(db, TAG),
+    }
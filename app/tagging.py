@@ -0,0 +1,109 @@
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+# Default vocabulary: canonical tag name -> list of aliases found in listings
+DEFAULT_VOCABULARY_PATH = Path(__file__).parent / "data" / "tag_vocabulary.json"
+
+# Characters that continue a token, so "sql" doesn't match inside "nosql"
+# and "c" doesn't match the start of "c++"
+_TOKEN_CHARS = r"0-9a-z_+#"
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Compile words into a regex alternation shaped like a prefix trie.
+
+    Branches at each node start with distinct characters, so the regex engine
+    never tries more than one branch per character and matching at a position
+    costs at most the length of the longest alias.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        is_end = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if is_end:
+            # Prefer the longer alias, fall back to the word ending here
+            return ("(?:" + body + ")?") if len(branches) > 1 or len(body) > 1 else body + "?"
+        return body
+
+    return build(trie)
+
+
+class TagExtractor:
+    """Finds skill and keyword tags in job listings.
+
+    The vocabulary maps each canonical tag to its aliases. All aliases are
+    compiled once into a single trie-shaped regex anchored on token
+    boundaries, so a listing is scanned a single time regardless of how many
+    tags the vocabulary holds.
+    """
+
+    def __init__(self, vocabulary: Dict[str, Iterable[str]]):
+        """
+        Args:
+            vocabulary: Canonical tag name -> aliases (the tag name itself is always an alias)
+        """
+        self.aliases: Dict[str, str] = {}
+        for tag, aliases in vocabulary.items():
+            for alias in [tag, *aliases]:
+                alias = " ".join(alias.lower().split())
+                if alias:
+                    self.aliases.setdefault(alias, tag)
+
+        if self.aliases:
+            pattern = _trie_pattern(self.aliases)
+            self.pattern = re.compile(rf"(?<![{_TOKEN_CHARS}])(?:{pattern})(?![{_TOKEN_CHARS}])")
+        else:
+            self.pattern = None
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> "TagExtractor":
+        """Load a vocabulary from a JSON file mapping tag names to alias lists."""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @property
+    def tags(self) -> Set[str]:
+        return set(self.aliases.values())
+
+    def extract(self, *texts: Optional[str]) -> Set[str]:
+        """Return the tags found in any of the given texts."""
+        if self.pattern is None:
+            return set()
+        # Whitespace is collapsed so multi-word aliases match across line breaks
+        text = " ".join(" ".join(t.lower().split()) for t in texts if t)
+        return {self.aliases[match] for match in self.pattern.findall(text)}
+
+    def extract_job(self, job_data: Dict) -> Set[str]:
+        """Return the tags for a job listing's title and description."""
+        return self.extract(job_data.get("title"), job_data.get("description"))
+
+    def extract_many(self, jobs: Iterable[Dict]) -> List[Set[str]]:
+        """Return the tags for each job listing in a batch."""
+        return [self.extract_job(job_data) for job_data in jobs]
+
+
+_default_extractor: Optional[TagExtractor] = None
+
+
+def get_tag_extractor() -> TagExtractor:
+    """Return the shared extractor for the configured vocabulary.
+
+    The vocabulary is read from TAG_VOCABULARY_PATH if set, otherwise from
+    the bundled default, and compiled on first use.
+    """
+    global _default_extractor
+    if _default_extractor is None:
+        _default_extractor = TagExtractor.from_file(os.getenv("TAG_VOCABULARY_PATH", DEFAULT_VOCABULARY_PATH))
+    return _default_extractor
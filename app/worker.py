@@ -0,0 +1,201 @@
+"""Scrape worker: runs queued scrape runs outside the API process.
+
+Usage:
+    python -m app.worker              # Poll the queue forever
+    python -m app.worker --once       # Run what is queued, then exit
+    python -m app.worker --schedule   # Also scrape every source on its own interval
+"""
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from . import schemas
+from .cache import response_cache
+from .database import SessionLocal, engine
+from .ingest import find_existing_urls, ingest_jobs
+from .metrics import StageTimer, serve_metrics
+from .migrations import upgrade_database
+from .scheduler import Schedule, Scheduler, load_schedules
+from .scrape_queue import claim_next_run, fail_stale_runs, finish_run, record_progress, start_run
+from .scraper import ScrapeBudget, create_scrapers, scrape_sources
+
+logger = logging.getLogger(__name__)
+
+# Initialize the registered scrapers, optionally limited to SCRAPER_SOURCES
+SCRAPER_SOURCES = os.getenv("SCRAPER_SOURCES")
+scrapers = create_scrapers(SCRAPER_SOURCES.split(",") if SCRAPER_SOURCES else None)
+
+# Keywords searched on every source during a scrape run
+SCRAPE_KEYWORDS = ["software developer", "data analyst", "web developer", "engineer"]
+
+# Seconds without progress after which a running scrape is considered dead
+SCRAPE_RUN_TIMEOUT = float(os.getenv("SCRAPE_RUN_TIMEOUT", "3600"))
+
+# Port the worker serves its metrics on (unset: not served)
+WORKER_METRICS_PORT = os.getenv("WORKER_METRICS_PORT")
+
+def _worker_name() -> str:
+    """Name recorded on the runs this process executes: its host and process id."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def _pipeline(db: Session, run_id: Optional[int] = None) -> Tuple[Callable, Callable]:
+    """Build the filter_new and ingest stages of a scrape storing jobs through ``db``."""
+    def filter_new(jobs):
+        # Every batch of listings counts as found and refreshes the heartbeat,
+        # so a run finding nothing new isn't taken for a dead one
+        if run_id is not None:
+            record_progress(db, run_id, found=len(jobs))
+        # Keep only jobs we haven't stored yet
+        existing_urls = find_existing_urls(db, (job_data["url"] for job_data in jobs))
+        return [
+            job_data for job_data in jobs
+            if job_data.get("url") and job_data["url"] not in existing_urls
+        ]
+
+    def ingest(jobs):
+        # Store a batch of new jobs and their tags in one transaction
+        inserted = ingest_jobs(db, jobs)
+        if inserted:
+            response_cache.bump_generation()
+        if run_id is not None:
+            record_progress(db, run_id, inserted=inserted)
+        return inserted
+
+    return filter_new, ingest
+
+def run_scrapers(db: Session, run_id: Optional[int] = None) -> Dict[str, int]:
+    """
+    Run all scrapers and update the database with new job listings.
+
+    Args:
+        db: Database session
+        run_id: Scrape run whose progress counters to update, if any
+
+    Returns:
+        Dictionary mapping each source name to its number of inserted jobs
+    """
+    filter_new, ingest = _pipeline(db, run_id)
+    return asyncio.run(scrape_sources(scrapers, SCRAPE_KEYWORDS, filter_new, ingest))
+
+async def run_scheduled(schedule: Schedule, budget: ScrapeBudget) -> Dict[str, int]:
+    """
+    Scrape one source for a schedule, raising if any of its searches failed.
+
+    The scrape is recorded as a scrape run, and skipped when another run is
+    already queued or running, so scheduled and queued scrapes never overlap.
+
+    Args:
+        schedule: Schedule naming the source and keywords
+        budget: Requests and time the scrape may use
+
+    Returns:
+        Dictionary mapping the source name to its number of inserted jobs
+    """
+    errors = []
+    with SessionLocal() as db:
+        run = start_run(db, _worker_name())
+        if run is None:
+            logger.info(f"Skipping scheduled scrape of {schedule.source}: another scrape is queued or running")
+            return {schedule.source: 0}
+        filter_new, ingest = _pipeline(db, run.id)
+        try:
+            inserted = await scrape_sources(
+                {schedule.source: scrapers[schedule.source]}, schedule.keywords, filter_new, ingest,
+                budget=budget, on_error=lambda name, keyword, e: errors.append(keyword),
+            )
+        except BaseException as e:
+            # Also on cancellation, so the run doesn't hold up the queue until it goes stale
+            db.rollback()
+            finish_run(db, run.id, error=str(e) or type(e).__name__)
+            raise
+        error = f"{len(errors)} of {len(schedule.keywords)} {schedule.source} searches failed" if errors else None
+        finish_run(db, run.id, error=error)
+    if error:
+        raise RuntimeError(error)
+    logger.info(f"Scheduled scrape of {schedule.source} inserted {inserted[schedule.source]} jobs")
+    return inserted
+
+def execute_run(db: Session, run: schemas.ScrapeRun) -> None:
+    """Run a claimed scrape and record its outcome."""
+    logger.info(f"Starting scrape run {run.id}")
+    timer = StageTimer()
+    try:
+        inserted = run_scrapers(db, run.id)
+    except Exception as e:
+        logger.exception(f"Scrape run {run.id} failed")
+        db.rollback()
+        finish_run(db, run.id, error=str(e) or type(e).__name__)
+        return
+    finish_run(db, run.id)
+    logger.info(f"Finished scrape run {run.id}: {inserted}, seconds per stage {timer.breakdown()}")
+
+def work(once: bool = False, poll_interval: float = 5.0, worker: Optional[str] = None) -> int:
+    """
+    Claim and execute queued scrape runs.
+
+    Args:
+        once: Exit when no run is left to claim instead of polling
+        poll_interval: Seconds to wait between polls of an empty queue
+        worker: Name recorded on claimed runs (default: host and process id)
+
+    Returns:
+        Number of runs executed
+    """
+    worker = worker or _worker_name()
+    executed = 0
+    while True:
+        with SessionLocal() as db:
+            fail_stale_runs(db, SCRAPE_RUN_TIMEOUT)
+            run = claim_next_run(db, worker)
+            if run is not None:
+                execute_run(db, run)
+                executed += 1
+                continue
+        if once:
+            return executed
+        time.sleep(poll_interval)
+
+async def serve(poll_interval: float = 5.0, schedules: Optional[List[Schedule]] = None) -> None:
+    """
+    Run queued scrapes and, if given, scheduled scrapes until cancelled.
+
+    Args:
+        poll_interval: Seconds to wait between polls of an empty queue
+        schedules: Per-source schedules to run alongside the queue
+    """
+    async def poll_queue():
+        while True:
+            if not await asyncio.to_thread(work, once=True):
+                await asyncio.sleep(poll_interval)
+
+    tasks = [poll_queue()]
+    if schedules:
+        tasks.append(Scheduler(schedules, run_scheduled,
+                               max_backoff=float(os.getenv("SCRAPE_MAX_BACKOFF", "86400"))).run())
+    await asyncio.gather(*tasks)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run queued scrape runs")
+    parser.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+    parser.add_argument("--poll-interval", type=float, default=float(os.getenv("SCRAPE_POLL_INTERVAL", "5")),
+                        help="Seconds between polls of an empty queue")
+    parser.add_argument("--schedule", action="store_true", help="Scrape every source periodically")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    upgrade_database(engine)
+    if WORKER_METRICS_PORT:
+        serve_metrics(int(WORKER_METRICS_PORT))
+    if args.schedule:
+        asyncio.run(serve(args.poll_interval, load_schedules(scrapers, SCRAPE_KEYWORDS)))
+    else:
+        work(once=args.once, poll_interval=args.poll_interval)
+
+if __name__ == "__main__":
+    main()
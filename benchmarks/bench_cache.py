@@ -0,0 +1,93 @@
+"""Load test the read endpoints with the response cache on and off.
+
+Fills a SQLite database file with synthetic jobs and replays a mix of
+/jobs, /jobs/{id}, /tags and /stats requests, reporting requests/sec.
+
+Usage:
+    python -m benchmarks.bench_cache --rows 20000 --requests 2000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app import schemas
+from app.cache import response_cache
+from app.database import Base, get_db
+from app.main import app
+from app.stats import ensure_stat_counters
+
+
+def populate(engine, rows: int, seed: int = 0):
+    rng = random.Random(seed)
+    with engine.begin() as conn:
+        conn.execute(insert(schemas.Tag), [{"name": name} for name in ("python", "sql", "react")])
+        conn.execute(insert(schemas.Job), [{
+            "title": f"Developer {n}",
+            "company": f"Company {n % 300}",
+            "location": rng.choice(["Burlington, VT", "Montpelier, VT", "Remote"]),
+            "description": "Lorem ipsum dolor sit amet. " * 40,
+            "url": f"https://example.com/job{n}",
+            "source": rng.choice(["indeed", "linkedin"]),
+            "is_remote": rng.random() < 0.3,
+            "salary_min": rng.choice([None, 50000.0, 70000.0, 90000.0]),
+        } for n in range(rows)])
+
+
+def request_mix(count: int, seed: int = 1):
+    """A skewed mix of dashboard-style requests, as a polling UI would send."""
+    rng = random.Random(seed)
+    paths = [
+        "/jobs", "/jobs?limit=20", "/jobs?is_remote=true", "/jobs?min_salary=70000",
+        "/jobs?location=Burlington", "/jobs?company=Company%201", "/tags", "/stats",
+    ] + [f"/jobs/{n}" for n in range(1, 51)]
+    weights = [20, 10, 8, 8, 5, 5, 10, 20] + [1] * 50
+    return rng.choices(paths, weights=weights, k=count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        populate(engine, args.rows)
+        SessionLocal = sessionmaker(bind=engine)
+        with SessionLocal() as db:
+            ensure_stat_counters(db)
+
+        def override_get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        paths = request_mix(args.requests)
+        try:
+            with TestClient(app) as client:
+                for label, maxsize in [("cache off", 0), ("cache on", 1024)]:
+                    response_cache.maxsize = maxsize
+                    response_cache.bump_generation()
+                    start = time.perf_counter()
+                    for path in paths:
+                        assert client.get(path).status_code == 200
+                    elapsed = time.perf_counter() - start
+                    print(f"{label:<10} {args.requests / elapsed:10.1f} req/s")
+                print(response_cache.stats())
+        finally:
+            app.dependency_overrides.clear()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
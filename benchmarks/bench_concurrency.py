@@ -0,0 +1,147 @@
+"""Load test the API under many concurrent clients with blocking and async DB access.
+
+Fills a SQLite database file with synthetic jobs, serves it with uvicorn
+and replays a mix of cheap /jobs/{id} lookups and slow filtered /jobs
+scans from concurrent clients. The response cache is disabled so every
+request reaches the database. The blocking baseline serves the same
+queries through the synchronous Session from inside ``async def``
+routes, as the endpoints did before the async database layer.
+
+Usage:
+    python -m benchmarks.bench_concurrency --rows 200000 --clients 200
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, insert
+
+from app import models, schemas
+from app.database import Base, SessionLocal
+from app.main import _filter_jobs
+
+# Baseline app: async routes calling the synchronous session on the event loop.
+# Sessions are closed inside the route; with the old get_db dependency their
+# connections are only released by a threadpool teardown, and under this load
+# the blocked event loop starves the pool until its timeout.
+blocking_app = FastAPI()
+
+
+@blocking_app.get("/jobs/{job_id}")
+async def blocking_get_job(job_id: int):
+    with SessionLocal() as db:
+        return models.Job.from_orm(db.query(schemas.Job).filter(schemas.Job.id == job_id).first())
+
+
+@blocking_app.get("/jobs")
+async def blocking_get_jobs(company: str = None, limit: int = 100):
+    with SessionLocal() as db:
+        query, _ = _filter_jobs(db, company=company)
+        jobs = query.order_by(schemas.Job.posted_date.desc(), schemas.Job.id).limit(limit).all()
+        return [models.Job.from_orm(job) for job in jobs]
+
+
+def populate(engine, rows: int, seed: int = 0):
+    rng = random.Random(seed)
+    with engine.begin() as conn:
+        for start in range(0, rows, 10000):
+            conn.execute(insert(schemas.Job), [{
+                "title": f"Developer {n}",
+                "company": f"Company {rng.randrange(3000)}",
+                "location": "Burlington, VT",
+                "description": "Lorem ipsum dolor sit amet. " * 10,
+                "url": f"https://example.com/job{n}",
+                "source": "indeed",
+            } for n in range(start, min(start + 10000, rows))])
+
+
+def serve(app_path: str, db_path: str, port: int) -> subprocess.Popen:
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}", RESPONSE_CACHE_SIZE="0")
+    env.pop("ASYNC_DATABASE_URL", None)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app_path, "--port", str(port), "--log-level", "warning",
+         "--timeout-keep-alive", "300"], env=env,
+    )
+    for _ in range(100):
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited serving {app_path}")
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/jobs/1", timeout=1.0)
+            return process
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError(f"uvicorn did not start serving {app_path}")
+
+
+async def load(port: int, clients: int, requests: int, rows: int, slow_ratio: float):
+    """Run the request mix and return latencies (ms) of the fast and slow requests."""
+    latencies = {"fast": [], "slow": []}
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=120.0) as client:
+        async def worker(seed: int):
+            rng = random.Random(seed)
+            for _ in range(requests):
+                if rng.random() < slow_ratio:
+                    kind, path = "slow", "/jobs?company=No%20Such%20Company"
+                else:
+                    kind, path = "fast", f"/jobs/{rng.randint(1, rows)}"
+                start = time.perf_counter()
+                response = await client.get(path)
+                latencies[kind].append((time.perf_counter() - start) * 1000)
+                assert response.status_code == 200, response.text
+
+        await asyncio.gather(*(worker(seed) for seed in range(clients)))
+    return latencies
+
+
+def percentile(values, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=10, help="Requests per client")
+    parser.add_argument("--slow-ratio", type=float, default=0.05, help="Share of slow filtered scans")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        engine = create_engine(f"sqlite:///{db_path}")
+        Base.metadata.create_all(bind=engine)
+        populate(engine, args.rows)
+        engine.dispose()
+
+        print(f"{args.rows} jobs, {args.clients} clients x {args.requests} requests")
+        print(f"{'':<10} {'req/s':>8} {'fast p50':>9} {'fast p99':>9} {'slow p50':>9} {'max':>9}")
+        for label, app_path in [("blocking", "benchmarks.bench_concurrency:blocking_app"),
+                                ("async", "app.main:app")]:
+            process = serve(app_path, db_path, args.port)
+            try:
+                start = time.perf_counter()
+                latencies = asyncio.run(load(args.port, args.clients, args.requests, args.rows, args.slow_ratio))
+                elapsed = time.perf_counter() - start
+            finally:
+                process.terminate()
+                process.wait()
+            fast, slow = latencies["fast"], latencies["slow"] or [0.0]
+            total = len(fast) + len(latencies["slow"])
+            print(f"{label:<10} {total / elapsed:8.1f} {statistics.median(fast):9.1f} "
+                  f"{percentile(fast, 0.99):9.1f} {statistics.median(slow):9.1f} {max(fast + slow):9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark API-style reads while the scraper ingests jobs into SQLite.
+
+Runs a writer thread that ingests batches of synthetic jobs with
+``app.ingest.ingest_jobs`` while reader threads page through the newest
+jobs, once on a default engine (rollback journal) and once on an engine
+from ``app.database.create_db_engine`` (WAL and the tuned pragmas).
+Reports reader latency, reader errors and writer throughput.
+
+Usage:
+    python -m benchmarks.bench_db_contention --seconds 10 --readers 4
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app import schemas
+from app.database import Base, create_db_engine
+from app.ingest import ingest_jobs
+
+from .bench_ingest import synthetic_jobs
+
+
+def writer(Session, stop: threading.Event, batch_size: int, result: dict):
+    template = synthetic_jobs(batch_size)
+    position = 0
+    with Session() as db:
+        while not stop.is_set():
+            batch = [dict(job, url=f"https://www.indeed.com/viewjob?jk={position + n}")
+                     for n, job in enumerate(template)]
+            position += batch_size
+            result["rows"] += ingest_jobs(db, batch)
+
+
+def reader(Session, stop: threading.Event, result: dict):
+    with Session() as db:
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                db.scalar(select(func.count(schemas.Job.id)))
+                db.query(schemas.Job).order_by(schemas.Job.posted_date.desc(), schemas.Job.id).limit(20).all()
+                db.rollback()
+            except OperationalError:
+                db.rollback()
+                result["errors"] += 1
+                continue
+            result["latencies"].append((time.perf_counter() - start) * 1000)
+
+
+def run(engine, seconds: float, readers: int, batch_size: int):
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    stop = threading.Event()
+    write_result = {"rows": 0}
+    read_result = {"latencies": [], "errors": 0}
+
+    threads = [threading.Thread(target=writer, args=(Session, stop, batch_size, write_result))]
+    threads += [threading.Thread(target=reader, args=(Session, stop, read_result)) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return write_result, read_result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{args.readers} readers, writer batches of {args.batch_size}, {args.seconds:.0f} s per run")
+    print(f"{'':<10} {'reads/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7} {'rows/s':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, make_engine in [
+            ("default", lambda url: create_engine(url, connect_args={"check_same_thread": False})),
+            ("tuned", create_db_engine),
+        ]:
+            url = f"sqlite:///{os.path.join(tmp, label + '.db')}"
+            write_result, read_result = run(make_engine(url), args.seconds, args.readers, args.batch_size)
+            latencies = sorted(read_result["latencies"]) or [0.0]
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            print(f"{label:<10} {len(read_result['latencies']) / args.seconds:8.1f} "
+                  f"{statistics.median(latencies):8.1f} {p99:8.1f} {latencies[-1]:8.1f} "
+                  f"{read_result['errors']:>7} {write_result['rows'] / args.seconds:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
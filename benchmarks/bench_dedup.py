@@ -0,0 +1,134 @@
+"""Benchmark near-duplicate detection on synthetic postings.
+
+Generates postings of which a share are re-posts of earlier ones with a
+few words edited (as when a job is found under another keyword or on
+another site), then finds them with pairwise signature comparison and with
+the LSH index. Pairwise comparison is quadratic, so it is timed on a
+sample and extrapolated. Also reports the overhead of fingerprinting
+during batched ingestion into SQLite.
+
+Usage:
+    python -m benchmarks.bench_dedup --jobs 100000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from app import dedup
+from app.database import Base, create_db_engine
+from app.dedup import LSHIndex, band_keys, job_shingles, minhasher, similarity
+from app.ingest import ingest_jobs
+
+VOCABULARY = [f"word{n}" for n in range(5000)]
+
+
+def synthetic_postings(count: int, duplicate_share: float, seed: int = 0):
+    """Postings and, for each planted duplicate, the index of its original."""
+    rng = random.Random(seed)
+    postings, originals = [], {}
+    for n in range(count):
+        if n and rng.random() < duplicate_share:
+            original = rng.randrange(n)
+            words = postings[original]["description"].split()
+            for _ in range(2):
+                words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+            originals[n] = originals.get(original, original)
+            job = dict(postings[original], description=" ".join(words), source="vtjobs")
+        else:
+            job = {
+                "title": f"{rng.choice(['Senior', 'Junior', 'Lead'])} {rng.choice(VOCABULARY)} Developer",
+                "company": f"Company {rng.randrange(2000)}",
+                "location": "Burlington, VT",
+                "description": " ".join(rng.choice(VOCABULARY) for _ in range(120)),
+                "source": "indeed",
+            }
+        postings.append(dict(job, url=f"https://example.com/job/{n}"))
+    return postings, originals
+
+
+def pairwise(signatures, threshold):
+    found = {}
+    for i, signature in enumerate(signatures):
+        for j in range(i):
+            if similarity(signature, signatures[j]) >= threshold:
+                found[i] = j
+                break
+    return found
+
+
+def with_index(signatures, threshold):
+    index = LSHIndex()
+    found = {}
+    for i, signature in enumerate(signatures):
+        keys = band_keys(signature)
+        matches = index.query(signature, threshold, keys)
+        if matches:
+            found[i] = min(key for key, _ in matches)
+        index.add(i, signature, keys)
+    return found
+
+
+def ingest_time(postings, batch_size, enabled):
+    path = tempfile.mktemp(suffix=".db")
+    engine = create_db_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    dedup_enabled = dedup.DEDUP_ENABLED
+    import app.ingest
+    app.ingest.DEDUP_ENABLED = enabled
+    try:
+        with sessionmaker(bind=engine)() as db:
+            start = time.perf_counter()
+            for offset in range(0, len(postings), batch_size):
+                ingest_jobs(db, postings[offset:offset + batch_size])
+            return time.perf_counter() - start
+    finally:
+        app.ingest.DEDUP_ENABLED = dedup_enabled
+        engine.dispose()
+        os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--duplicates", type=float, default=0.1, help="Share of postings that are re-posts")
+    parser.add_argument("--sample", type=int, default=3000, help="Postings compared pairwise")
+    parser.add_argument("--ingest", type=int, default=20000, help="Postings ingested with and without dedup")
+    args = parser.parse_args()
+
+    postings, originals = synthetic_postings(args.jobs, args.duplicates)
+    print(f"{args.jobs} postings, {len(originals)} planted duplicates, numpy={dedup.HAS_NUMPY}")
+
+    start = time.perf_counter()
+    signatures = []
+    for offset in range(0, len(postings), 500):
+        signatures.extend(minhasher.signatures([job_shingles(job) for job in postings[offset:offset + 500]]))
+    elapsed = time.perf_counter() - start
+    print(f"{'signatures':<28} {elapsed:8.2f} s {args.jobs / elapsed:10.0f} postings/s")
+
+    sample = signatures[:args.sample]
+    start = time.perf_counter()
+    pairwise(sample, dedup.DEDUP_THRESHOLD)
+    elapsed = time.perf_counter() - start
+    projected = elapsed * (args.jobs / len(sample)) ** 2
+    print(f"{'pairwise (projected)':<28} {projected:8.1f} s   ({len(sample)} postings in {elapsed:.2f} s)")
+
+    start = time.perf_counter()
+    found = with_index(signatures, dedup.DEDUP_THRESHOLD)
+    elapsed = time.perf_counter() - start
+    correct = sum(originals.get(i) == j or originals.get(i) == originals.get(j) for i, j in found.items())
+    print(f"{'LSH index':<28} {elapsed:8.2f} s   speedup {projected / elapsed:.0f}x")
+    print(f"{'precision / recall':<28} {correct / max(1, len(found)):8.3f} / {correct / max(1, len(originals)):.3f}")
+
+    subset = postings[:args.ingest]
+    plain = ingest_time(subset, 500, enabled=False)
+    fingerprinted = ingest_time(subset, 500, enabled=True)
+    print(f"ingest {len(subset)} without dedup  {plain:8.2f} s {len(subset) / plain:10.0f} rows/s")
+    print(f"ingest {len(subset)} with dedup     {fingerprinted:8.2f} s {len(subset) / fingerprinted:10.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark sequential vs concurrent Indeed detail-page fetching.
+
+Starts a local stub HTTP server that answers every detail page after a fixed
+latency, then fetches the same set of job URLs with the sequential
+``IndeedScraper.get_job_details`` loop and with ``AsyncIndeedScraper``.
+
+Usage:
+    python -m benchmarks.bench_detail_fetch --jobs 50 --latency 0.1 --rate 10
+"""
+import argparse
+import asyncio
+import threading
+import time
+from aiohttp import web
+
+from app.scraper.http import HttpClient
+from app.scraper.indeed import IndeedScraper, AsyncIndeedScraper
+
+DETAIL_PAGE = "<html><body><div id=\"jobDescriptionText\">{}</div></body></html>"
+
+
+def start_stub_server(latency: float):
+    """Start the stub server on a background thread and return its base URL."""
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    state = {}
+
+    async def handler(request):
+        await asyncio.sleep(latency)
+        body = DETAIL_PAGE.format("Lorem ipsum dolor sit amet. " * 200)
+        return web.Response(text=body, content_type="text/html")
+
+    async def start():
+        server_app = web.Application()
+        server_app.router.add_get("/viewjob", handler)
+        runner = web.AppRunner(server_app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        state["port"] = site._server.sockets[0].getsockname()[1]
+        ready.set()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(start())
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return f"http://127.0.0.1:{state['port']}"
+
+
+def bench_sequential(urls, sleep: float) -> float:
+    # The original sequential path slept a fixed delay before every request,
+    # which a one-token bucket at 1/sleep requests per second reproduces.
+    scraper = IndeedScraper(http=HttpClient(rate=1 / sleep, burst=1))
+    start = time.perf_counter()
+    for url in urls:
+        scraper.get_job_details(url)
+    return time.perf_counter() - start
+
+
+def bench_concurrent(urls, concurrency: int, rate: float) -> float:
+    scraper = AsyncIndeedScraper(concurrency=concurrency, rate=rate)
+    start = time.perf_counter()
+    asyncio.run(scraper.get_jobs_details(urls))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=50, help="Number of detail pages to fetch")
+    parser.add_argument("--latency", type=float, default=0.1, help="Stub server latency in seconds")
+    parser.add_argument("--sleep", type=float, default=1.0, help="Fixed delay of the sequential path")
+    parser.add_argument("--concurrency", type=int, default=10, help="Async worker pool size")
+    parser.add_argument("--rate", type=float, default=10.0, help="Async requests per second per host")
+    args = parser.parse_args()
+
+    base_url = start_stub_server(args.latency)
+    urls = [f"{base_url}/viewjob?jk={i}" for i in range(args.jobs)]
+
+    sequential = bench_sequential(urls, args.sleep)
+    concurrent = bench_concurrent(urls, args.concurrency, args.rate)
+
+    print(f"{args.jobs} detail pages, {args.latency * 1000:.0f} ms latency")
+    print(f"sequential (sleep {args.sleep}s): {sequential:8.2f} s  {args.jobs / sequential:8.1f} pages/s")
+    print(f"async (c={args.concurrency}, {args.rate}/s): {concurrent:8.2f} s  {args.jobs / concurrent:8.1f} pages/s")
+    print(f"speedup: {sequential / concurrent:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Compare server memory when pulling the jobs table through /jobs and /jobs/export.
+
+Fills a SQLite database file with synthetic jobs, then for each request
+starts a fresh uvicorn server, downloads the whole table once and reports
+the time and the server's peak resident memory (VmHWM, Linux only). The
+response cache is disabled so /jobs doesn't keep the rendered body.
+
+Usage:
+    python -m benchmarks.bench_export --rows 1000000
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+import httpx
+from sqlalchemy import create_engine
+
+from app.database import Base
+from benchmarks.bench_concurrency import populate, serve
+
+
+def peak_rss_mb(pid: int) -> float:
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except FileNotFoundError:
+        pass
+    return float("nan")
+
+
+class PeakSampler(threading.Thread):
+    """Keeps the last peak RSS read, in case the server is killed for running out of memory."""
+
+    def __init__(self, pid: int):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.peak = peak_rss_mb(pid)
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(0.1):
+            peak = peak_rss_mb(self.pid)
+            if peak == peak:
+                self.peak = peak
+
+
+def download(port: int, path: str) -> int:
+    size = 0
+    with httpx.stream("GET", f"http://127.0.0.1:{port}{path}", timeout=None) as response:
+        response.raise_for_status()
+        for chunk in response.iter_bytes():
+            size += len(chunk)
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    requests = [
+        ("/jobs (one page)", f"/jobs?limit={args.rows}"),
+        ("/jobs/export ndjson", "/jobs/export?format=ndjson"),
+        ("/jobs/export csv", "/jobs/export?format=csv"),
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "export.db")
+        engine = create_engine(f"sqlite:///{db_path}")
+        Base.metadata.create_all(bind=engine)
+        populate(engine, args.rows)
+        engine.dispose()
+        print(f"{args.rows} jobs")
+
+        for label, path in requests:
+            process = serve("app.main:app", db_path, args.port)
+            try:
+                sampler = PeakSampler(process.pid)
+                idle = sampler.peak
+                sampler.start()
+                start = time.perf_counter()
+                try:
+                    size = download(args.port, path)
+                except httpx.TransportError:
+                    size = None
+                elapsed = time.perf_counter() - start
+                sampler.stopped.set()
+                sampler.join()
+                body = f"{size / 2**20:8.0f} MB body" if size is not None else "  server died"
+                print(f"{label:<22} {elapsed:7.1f} s {body} {sampler.peak:8.0f} MB peak RSS ({idle:.0f} MB idle)")
+            finally:
+                process.terminate()
+                process.wait()
+
+
+if __name__ == "__main__":
+    main()
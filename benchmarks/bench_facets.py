@@ -0,0 +1,142 @@
+"""Benchmark facet counts: one query per facet vs the single grouped query.
+
+Fills a SQLite database file with synthetic tagged jobs and, for a few
+filter sets, reports the latency of counting every facet with a separate
+query each and with app.facets, then the latency of GET /jobs/search
+(page, tags and facets) with the response cache off.
+
+Usage:
+    python -m benchmarks.bench_facets --rows 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app import facets, models, schemas
+from app.cache import response_cache
+from app.database import Base, create_async_db_engine, create_db_engine, get_async_db, to_async_url
+from app.main import _search_jobs, app
+
+TAGS = ["python", "javascript", "react", "sql", "remote", "junior", "senior", "aws", "docker", "excel"]
+
+SEARCHES = [
+    ("no filters", {}),
+    ("is_remote", {"is_remote": True}),
+    ("min_salary", {"min_salary": 90000}),
+    ("tags", {"tags": ["python", "sql"]}),
+    ("company + is_remote", {"company": "company 1", "is_remote": False}),
+]
+
+
+def populate(engine, rows: int, seed: int = 0):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(schemas.Tag), [{"id": n + 1, "name": name} for n, name in enumerate(TAGS)])
+        for start in range(0, rows, 10000):
+            ids = range(start + 1, min(start + 10000, rows) + 1)
+            jobs = []
+            for job_id in ids:
+                company = f"Company {rng.randrange(2000)}"
+                jobs.append({
+                    "id": job_id, "title": f"Job {job_id}", "company": company, "company_lower": company.lower(),
+                    "location": "Vermont", "location_lower": "vermont", "description": "",
+                    "url": f"https://example.com/job{job_id}",
+                    "source": rng.choice(["indeed", "linkedin", "vtjobs"]),
+                    "is_remote": rng.random() < 0.2,
+                    "salary_min": rng.randrange(25, 180) * 1000 if rng.random() < 0.6 else None,
+                    "posted_date": now - timedelta(days=rng.randrange(120)),
+                })
+            conn.execute(insert(schemas.Job), jobs)
+            conn.execute(insert(schemas.JobTag), [
+                {"job_id": job_id, "tag_id": tag_id}
+                for job_id in ids for tag_id in rng.sample(range(1, len(TAGS) + 1), 2)
+            ])
+
+
+def separate_facets(db, query):
+    """Count the total and each facet with its own query, as separate requests per facet would."""
+    Job = schemas.Job
+    matched = query.with_entities(Job.id).order_by(None).subquery()
+    jobs = select(Job).where(Job.id.in_(select(matched.c.id))).subquery()
+    count = func.count()
+    results = {"total": db.scalar(select(count).select_from(jobs))}
+    for name, column in [(facets.SOURCE, jobs.c.source), (facets.COMPANY, jobs.c.company),
+                         (facets.REMOTE, jobs.c.is_remote), (facets.SALARY, facets._salary_bucket(jobs.c.salary_min))]:
+        results[name] = db.execute(
+            select(column, count).where(column.isnot(None)).group_by(column)
+            .order_by(count.desc()).limit(facets.FACET_LIMIT)
+        ).all()
+    results[facets.TAG] = db.execute(
+        select(schemas.Tag.name, count).join(schemas.JobTag).where(schemas.JobTag.job_id.in_(select(matched.c.id)))
+        .group_by(schemas.Tag.name).order_by(count.desc()).limit(facets.FACET_LIMIT)
+    ).all()
+    return results
+
+
+def measure(func, repeats: int):
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_db_engine(url)
+        Base.metadata.create_all(bind=engine)
+        populate(engine, args.rows)
+        db = sessionmaker(bind=engine)()
+
+        print(f"{args.rows} jobs, median of {args.repeats}")
+        print(f"{'search':<22} {'per facet':>10} {'grouped':>10}")
+        for label, search in SEARCHES:
+            query, _ = _search_jobs(db, models.JobSearch(**search))
+            query = query.filter(schemas.Job.canonical_id.is_(None))
+            separate = measure(lambda: separate_facets(db, query), args.repeats)
+            grouped = measure(lambda: facets.compute_facets(db, query), args.repeats)
+            print(f"{label:<22} {separate:8.1f}ms {grouped:8.1f}ms {separate / grouped:6.1f}x")
+        db.close()
+
+        async_engine = create_async_db_engine(to_async_url(url), poolclass=NullPool)
+        AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+        async def override_get_async_db():
+            async with AsyncSessionLocal() as session:
+                yield session
+
+        app.dependency_overrides[get_async_db] = override_get_async_db
+        response_cache.maxsize = 0
+        try:
+            with TestClient(app) as client:
+                print("\nGET /jobs/search?limit=20")
+                for label, search in SEARCHES:
+                    path = f"/jobs/search?{urlencode(dict(search, limit=20), doseq=True)}"
+                    latency = measure(lambda: client.get(path).raise_for_status(), args.repeats)
+                    print(f"{label:<22} {latency:8.1f}ms")
+        finally:
+            app.dependency_overrides.clear()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
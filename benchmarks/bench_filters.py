@@ -0,0 +1,129 @@
+"""Benchmark /jobs filter queries with and without the query indexes.
+
+Fills a SQLite database file with synthetic jobs and times the first page
+of each filter, as built by the /jobs endpoint, against the same table
+once the indexes from migration 0002 are dropped and company/location use
+substring ILIKE filters on the original columns. The prefix filters are
+compared with the same substring filters, as they were the only option.
+
+Usage:
+    python -m benchmarks.bench_filters --rows 500000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, text
+from sqlalchemy.orm import sessionmaker
+
+from app import schemas
+from app.database import Base, create_db_engine
+from app.main import _filter_jobs
+
+# Indexes added by migration 0002 (ix_jobs_canonical_id is only changed, so it is kept)
+QUERY_INDEXES = [
+    "ix_jobs_is_remote_posted_date", "ix_jobs_salary_min", "ix_jobs_company_lower",
+    "ix_jobs_location_lower", "ix_job_tags_tag_id_job_id",
+]
+
+FILTERS = [
+    ("company", {"company": "company 42"}),
+    ("company prefix", {"company_prefix": "company 42"}),
+    ("location (rare)", {"location": "town 17"}),
+    ("location (30% of jobs)", {"location": "burlington"}),
+    ("location prefix (rare)", {"location_prefix": "town 17"}),
+    ("is_remote", {"is_remote": True}),
+    ("min_salary", {"min_salary": 140000}),
+    ("tag", {"tag": "tag7"}),
+    ("is_remote + min_salary", {"is_remote": True, "min_salary": 120000}),
+]
+
+
+def populate(engine, rows: int, seed: int = 0):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    towns = [f"Town {n}, VT" for n in range(250)]
+    with engine.begin() as conn:
+        conn.execute(insert(schemas.Tag), [{"name": f"tag{n}"} for n in range(200)])
+        for start in range(0, rows, 10000):
+            jobs = []
+            for n in range(start, min(start + 10000, rows)):
+                company = f"Company {n % 3000}"
+                location = "Burlington, VT" if rng.random() < 0.3 else rng.choice(towns)
+                jobs.append({
+                    "title": f"Job {n}", "company": company, "location": location,
+                    "company_lower": company.lower(), "location_lower": location.lower(),
+                    "description": "", "url": f"https://example.com/job{n}", "source": "indeed",
+                    "is_remote": rng.random() < 0.05,
+                    "salary_min": rng.randrange(30, 150) * 1000 if rng.random() < 0.6 else None,
+                    "posted_date": now - timedelta(days=rng.randrange(90)),
+                })
+            conn.execute(insert(schemas.Job), jobs)
+        conn.execute(insert(schemas.JobTag), [
+            {"job_id": job_id, "tag_id": tag_id}
+            for job_id in range(1, rows + 1) for tag_id in rng.sample(range(1, 201), 3)
+        ])
+
+
+def unindexed_filter(db, company=None, location=None, company_prefix=None, location_prefix=None, **filters):
+    """The filters before the lowercased columns: substring ILIKE on company and location."""
+    query, _ = _filter_jobs(db, **filters)
+    company = company or company_prefix
+    location = location or location_prefix
+    if company:
+        query = query.filter(schemas.Job.company.ilike(f"%{company}%"))
+    if location:
+        query = query.filter(schemas.Job.location.ilike(f"%{location}%"))
+    return query
+
+
+def time_filters(db, build, repeats: int):
+    timings = {}
+    for label, filters in FILTERS:
+        start = time.perf_counter()
+        for _ in range(repeats):
+            query = build(db, **filters).filter(schemas.Job.canonical_id.is_(None))
+            query.order_by(schemas.Job.posted_date.desc(), schemas.Job.id).limit(100).all()
+            db.expunge_all()
+        timings[label] = (time.perf_counter() - start) / repeats
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    path = tempfile.mktemp(suffix=".db")
+    engine = create_db_engine(f"sqlite:///{path}")
+    try:
+        Base.metadata.create_all(bind=engine)
+        populate(engine, args.rows)
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+        with sessionmaker(bind=engine)() as db:
+            indexed = time_filters(db, lambda session, **f: _filter_jobs(session, **f)[0], args.repeats)
+
+        with engine.begin() as conn:
+            for name in QUERY_INDEXES:
+                conn.execute(text(f"DROP INDEX {name}"))
+            conn.execute(text("ANALYZE"))
+        with sessionmaker(bind=engine)() as db:
+            unindexed = time_filters(db, unindexed_filter, args.repeats)
+
+        print(f"{args.rows} jobs, first page of 100")
+        print(f"{'filter':<24} {'before':>10} {'after':>10}")
+        for label, _ in FILTERS:
+            print(f"{label:<24} {unindexed[label] * 1000:8.1f}ms {indexed[label] * 1000:8.1f}ms "
+                  f"{unindexed[label] / indexed[label]:6.1f}x")
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark per-row vs batched job ingestion.
+
+Inserts synthetic job listings into a fresh SQLite database file, once with
+the original per-row commit/refresh loop from ``run_scrapers`` and once with
+``app.ingest.ingest_jobs``, and reports rows/sec for each.
+
+Usage:
+    python -m benchmarks.bench_ingest --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import schemas
+from app.database import Base
+from app.ingest import ingest_jobs
+
+# Tag keywords of the original per-row loop
+TAG_KEYWORDS = ["python", "javascript", "react", "sql", "remote", "junior", "senior"]
+
+DESCRIPTIONS = [
+    "We are looking for a senior Python developer with SQL experience.",
+    "Junior web developer, JavaScript and React, remote friendly.",
+    "Data analyst working with spreadsheets and reporting tools.",
+    "Mechanical engineer for a manufacturing plant in Burlington.",
+]
+
+
+def synthetic_jobs(count: int):
+    return [
+        {
+            "title": f"Software Developer {n}",
+            "company": f"Company {n % 500}",
+            "location": "Burlington, VT",
+            "description": DESCRIPTIONS[n % len(DESCRIPTIONS)] * 20,
+            "url": f"https://www.indeed.com/viewjob?jk={n}",
+            "source": "indeed",
+            "is_remote": n % 3 == 0,
+            "salary_min": 50000.0 + n % 50 * 1000,
+            "salary_max": 70000.0 + n % 50 * 1000,
+            "posted_date": None,
+        }
+        for n in range(count)
+    ]
+
+
+def legacy_ingest(db, jobs):
+    """The per-row ingestion loop that run_scrapers used before batching."""
+    for job_data in jobs:
+        existing_job = db.query(schemas.Job).filter(schemas.Job.url == job_data["url"]).first()
+        if existing_job:
+            continue
+
+        new_job = schemas.Job(**job_data)
+        db.add(new_job)
+        db.commit()
+        db.refresh(new_job)
+
+        for keyword in TAG_KEYWORDS:
+            if keyword in job_data["title"].lower() or keyword in job_data.get("description", "").lower():
+                tag = db.query(schemas.Tag).filter(schemas.Tag.name == keyword).first()
+                if not tag:
+                    tag = schemas.Tag(name=keyword)
+                    db.add(tag)
+                    db.commit()
+                    db.refresh(tag)
+
+                db.add(schemas.JobTag(job_id=new_job.id, tag_id=tag.id))
+                db.commit()
+
+
+def run(ingest, jobs) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        try:
+            start = time.perf_counter()
+            ingest(db, jobs)
+            elapsed = time.perf_counter() - start
+            assert db.query(schemas.Job).count() == len(jobs)
+        finally:
+            db.close()
+            engine.dispose()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--legacy-max", type=int, default=10000,
+                        help="Skip the per-row path above this size (it needs one fsync per row)")
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'per-row rows/s':>16} {'batched rows/s':>16} {'speedup':>8}")
+    for size in args.sizes:
+        jobs = synthetic_jobs(size)
+        batched = size / run(ingest_jobs, jobs)
+        if size <= args.legacy_max:
+            legacy = size / run(legacy_ingest, synthetic_jobs(size))
+            print(f"{size:>8} {legacy:>16,.0f} {batched:>16,.0f} {batched / legacy:>7.1f}x")
+        else:
+            print(f"{size:>8} {'skipped':>16} {batched:>16,.0f} {'':>8}")
+
+
+if __name__ == "__main__":
+    main()
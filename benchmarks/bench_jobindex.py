@@ -0,0 +1,141 @@
+"""Benchmark /jobs listings resolved by the in-memory job index vs SQL.
+
+Fills a SQLite database file with synthetic tagged jobs, reports the
+index's load time and memory footprint, then for a few structured filters
+the latency of resolving a page of 20 ids (SQL query vs index masks) and
+of the whole GET /jobs request with the response cache off.
+
+Usage:
+    python -m benchmarks.bench_jobindex --rows 300000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app import main as app_main, schemas
+from app.cache import response_cache
+from app.database import Base, create_async_db_engine, create_db_engine, get_async_db, to_async_url
+from app.jobindex import JobIndex
+
+TAGS = ["python", "javascript", "react", "sql", "remote", "junior", "senior", "aws", "docker", "excel"]
+
+LISTINGS = [
+    ("no filters", {}),
+    ("is_remote", {"is_remote": True}),
+    ("min_salary", {"min_salary": 120000}),
+    ("tag", {"tag": "python"}),
+    ("days", {"days": 3}),
+    ("remote + salary + tag", {"is_remote": True, "min_salary": 100000, "tag": "aws"}),
+    ("deep page", {"is_remote": False, "skip": 100000}),
+]
+
+
+def populate(engine, rows: int, start: int = 0, seed: int = 0):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        if not start:
+            conn.execute(insert(schemas.Tag), [{"id": n + 1, "name": name} for n, name in enumerate(TAGS)])
+        for offset in range(start, start + rows, 10000):
+            ids = range(offset + 1, min(offset + 10000, start + rows) + 1)
+            conn.execute(insert(schemas.Job), [{
+                "id": job_id, "title": f"Job {job_id}", "company": "Company", "company_lower": "company",
+                "location": "Vermont", "location_lower": "vermont", "description": "Lorem ipsum " * 20,
+                "url": f"https://example.com/job{job_id}", "source": rng.choice(["indeed", "linkedin", "vtjobs"]),
+                "is_remote": rng.random() < 0.2,
+                "salary_min": rng.randrange(25, 180) * 1000 if rng.random() < 0.6 else None,
+                "posted_date": now - timedelta(days=rng.randrange(120), seconds=rng.randrange(86400)),
+            } for job_id in ids])
+            conn.execute(insert(schemas.JobTag), [
+                {"job_id": job_id, "tag_id": tag_id}
+                for job_id in ids for tag_id in rng.sample(range(1, len(TAGS) + 1), 2)
+            ])
+
+
+def measure(func, repeats: int):
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+def sql_page(db, skip=0, **filters):
+    query, _ = app_main._filter_jobs(db, **filters)
+    query = query.filter(schemas.Job.canonical_id.is_(None)).with_entities(schemas.Job.id)
+    return query.order_by(schemas.Job.posted_date.desc(), schemas.Job.id).offset(skip).limit(20).all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=300000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_db_engine(url)
+        Base.metadata.create_all(bind=engine)
+        populate(engine, args.rows)
+        db = sessionmaker(bind=engine)()
+
+        index = JobIndex(enabled=True)
+        index.load(db)
+        stats = index.stats()
+        print(f"{stats['jobs']} jobs: index loaded in {stats['load_seconds']:.2f} s, "
+              f"{stats['memory_bytes'] / 2 ** 20:.1f} MiB ({stats['memory_bytes'] / stats['jobs']:.1f} bytes/job)")
+        populate(engine, 1000, start=args.rows, seed=1)
+        start = time.perf_counter()
+        index.refresh(db)
+        print(f"incremental refresh with 1000 new jobs: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        print(f"\nresolve a page of 20 ids, median of {args.repeats}")
+        print(f"{'listing':<24} {'SQL':>10} {'index':>10}")
+        for label, filters in LISTINGS:
+            sql = measure(lambda: sql_page(db, **filters), args.repeats)
+            indexed = measure(lambda: index.page(limit=20, **filters), args.repeats)
+            assert [row.id for row in sql_page(db, **filters)] == index.page(limit=20, **filters)
+            print(f"{label:<24} {sql:8.2f}ms {indexed:8.2f}ms {sql / indexed:7.1f}x")
+        db.close()
+
+        async_engine = create_async_db_engine(to_async_url(url), poolclass=NullPool)
+        AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+        async def override_get_async_db():
+            async with AsyncSessionLocal() as session:
+                yield session
+
+        app_main.app.dependency_overrides[get_async_db] = override_get_async_db
+        app_main.job_index = index
+        response_cache.maxsize = 0
+        try:
+            with TestClient(app_main.app) as client:
+                print(f"\nGET /jobs?limit=20, median of {args.repeats}")
+                print(f"{'listing':<24} {'SQL':>10} {'index':>10}")
+                for label, filters in LISTINGS:
+                    path = f"/jobs?{urlencode(dict(filters, limit=20))}"
+                    latencies = []
+                    for enabled in (False, True):
+                        index.enabled = enabled
+                        latencies.append(measure(lambda: client.get(path).raise_for_status(), args.repeats))
+                    print(f"{label:<24} {latencies[0]:8.2f}ms {latencies[1]:8.2f}ms "
+                          f"{latencies[0] / latencies[1]:7.1f}x")
+        finally:
+            app_main.app.dependency_overrides.clear()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Benchmark the overhead of the metrics hooks.
+
+Reports the cost of a counter increment and a histogram observation, of
+running a small SQL query with and without the statement timing hooks,
+and the latency of GET /jobs with the metrics off and on (response cache
+off), so the price of leaving the instrumentation on can be checked.
+
+Usage:
+    python -m benchmarks.bench_metrics --rows 10000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, insert, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app import metrics, schemas
+from app.cache import response_cache
+from app.database import Base, create_async_db_engine, create_db_engine, get_async_db, to_async_url
+from app.main import app
+from app.metrics import MetricsRegistry, registry
+
+LISTINGS = ["/jobs?limit=20", "/jobs?is_remote=true&limit=20", "/jobs?tag=python&limit=20"]
+
+
+def populate(engine, rows: int):
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(schemas.Tag), [{"id": 1, "name": "python"}])
+        conn.execute(insert(schemas.Job), [{
+            "id": job_id, "title": f"Job {job_id}", "company": "Company", "company_lower": "company",
+            "location": "Vermont", "location_lower": "vermont", "description": "Lorem ipsum " * 20,
+            "url": f"https://example.com/job{job_id}", "source": "indeed", "is_remote": job_id % 5 == 0,
+            "posted_date": now - timedelta(minutes=job_id),
+        } for job_id in range(1, rows + 1)])
+        conn.execute(insert(schemas.JobTag), [{"job_id": job_id, "tag_id": 1} for job_id in range(1, rows + 1, 3)])
+
+
+def per_call(func, calls: int) -> float:
+    """Nanoseconds per call of func, best of 5 rounds."""
+    rounds = []
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        rounds.append((time.perf_counter() - start) / calls * 1e9)
+    return min(rounds)
+
+
+def measure(func, repeats: int):
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+def set_sql_hooks(engine, on: bool):
+    hooks = [("before_cursor_execute", metrics._before_cursor_execute),
+             ("after_cursor_execute", metrics._after_cursor_execute),
+             ("handle_error", metrics._handle_error)]
+    for name, hook in hooks:
+        if on and not event.contains(engine, name, hook):
+            event.listen(engine, name, hook)
+        elif not on and event.contains(engine, name, hook):
+            event.remove(engine, name, hook)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--calls", type=int, default=100000)
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    local = MetricsRegistry(enabled=True)
+    counter = local.counter("bench_total", "Benchmark counter.", ("source",))
+    histogram = local.histogram("bench_seconds", "Benchmark histogram.", ("route",))
+    print(f"counter inc:          {per_call(lambda: counter.inc(source='indeed'), args.calls):6.0f} ns")
+    print(f"histogram observe:    {per_call(lambda: histogram.observe(0.01, route='/jobs'), args.calls):6.0f} ns")
+    local.enabled = False
+    print(f"disabled observe:     {per_call(lambda: histogram.observe(0.01, route='/jobs'), args.calls):6.0f} ns")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_db_engine(url)
+        Base.metadata.create_all(bind=engine)
+        populate(engine, args.rows)
+
+        with engine.connect() as conn:
+            query = lambda: conn.execute(text("SELECT id FROM jobs WHERE id = 1")).all()
+            # Alternate hooks off and on, keeping the best round of each, as the machine's speed drifts
+            timings = [float("inf"), float("inf")]
+            for _ in range(5):
+                for on in (False, True):
+                    set_sql_hooks(engine, on)
+                    timings[on] = min(timings[on], per_call(query, args.calls // 50))
+        print(f"\nSQL query by primary key: {timings[0] / 1000:.1f} us without hooks, "
+              f"{timings[1] / 1000:.1f} us with (+{timings[1] - timings[0]:.0f} ns)")
+
+        async_engine = create_async_db_engine(to_async_url(url), poolclass=NullPool)
+        AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+        async def override_get_async_db():
+            async with AsyncSessionLocal() as session:
+                yield session
+
+        app.dependency_overrides[get_async_db] = override_get_async_db
+        response_cache.maxsize = 0
+        try:
+            with TestClient(app) as client:
+                print(f"\nGET, median of {args.repeats}")
+                print(f"{'listing':<34} {'off':>9} {'on':>9}")
+                for path in LISTINGS:
+                    # Requests alternate between metrics off and on, for the same reason
+                    samples = [[], []]
+                    for _ in range(args.repeats):
+                        for on in (False, True):
+                            registry.enabled = on
+                            set_sql_hooks(async_engine.sync_engine, on)
+                            samples[on].append(measure(lambda: client.get(path).raise_for_status(), 1))
+                    latencies = [statistics.median(values) for values in samples]
+                    print(f"{path:<34} {latencies[0]:7.3f}ms {latencies[1]:7.3f}ms "
+                          f"{(latencies[1] / latencies[0] - 1) * 100:+6.1f}%")
+        finally:
+            app.dependency_overrides.clear()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark a sequential scrape loop vs the concurrent multi-source orchestrator.
+
+Runs the (source x keyword) search matrix against simulated sources with
+different search latencies, once one search after another like the
+original ``run_scrapers`` loop and once with
+``app.scraper.scrape_sources``, and reports the wall time of each.
+
+Usage:
+    python -m benchmarks.bench_orchestrator --keywords 8 --latencies 0.2 0.5 1.0
+"""
+import argparse
+import asyncio
+import time
+
+from app.scraper import BaseScraper, scrape_sources
+
+
+class SimulatedScraper(BaseScraper):
+    """Source answering every search after a fixed delay."""
+
+    SOURCE_NAME = "simulated"
+
+    def __init__(self, name: str, latency: float, search_concurrency: int):
+        self.name = name
+        self.latency = latency
+        self.search_concurrency = search_concurrency
+
+    def search(self, keywords: str = "", location: str = "Vermont"):
+        time.sleep(self.latency)
+        return [{"url": f"https://{self.name}.example.com/{keywords}/{n}", "source": self.name}
+                for n in range(10)]
+
+
+def sequential(scrapers, keywords):
+    """The original loop: one keyword after another, one source after another."""
+    for keyword in keywords:
+        for scraper in scrapers.values():
+            jobs = scraper.search(keyword)
+            asyncio.run(scraper.get_jobs_details(job["url"] for job in jobs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keywords", type=int, default=8)
+    parser.add_argument("--latencies", type=float, nargs="+", default=[0.2, 0.5, 1.0],
+                        help="Search latency in seconds of each simulated source")
+    parser.add_argument("--search-concurrency", type=int, default=2)
+    args = parser.parse_args()
+
+    scrapers = {
+        f"source{n}": SimulatedScraper(f"source{n}", latency, args.search_concurrency)
+        for n, latency in enumerate(args.latencies)
+    }
+    keywords = [f"keyword {n}" for n in range(args.keywords)]
+    slowest = max(args.latencies) * -(-args.keywords // args.search_concurrency)
+    print(f"{len(scrapers)} sources x {args.keywords} keywords, "
+          f"slowest source alone needs {slowest:.1f} s at concurrency {args.search_concurrency}")
+
+    start = time.perf_counter()
+    sequential(scrapers, keywords)
+    print(f"sequential    {time.perf_counter() - start:8.2f} s")
+
+    start = time.perf_counter()
+    asyncio.run(scrape_sources(scrapers, keywords, lambda jobs: jobs, len))
+    print(f"orchestrator  {time.perf_counter() - start:8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
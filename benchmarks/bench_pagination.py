@@ -0,0 +1,118 @@
+"""Benchmark offset vs keyset (cursor) pagination over the jobs table.
+
+Fills a SQLite database file with synthetic jobs, then pages through the
+whole table with skip/limit and with cursors, and reports the total walk
+time plus the latency of single pages at increasing depths.
+
+Usage:
+    python -m benchmarks.bench_pagination --rows 500000 --limit 1000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app import schemas
+from app.database import Base
+from app.pagination import fetch_keyset_page
+
+
+def populate(engine, rows: int, seed: int = 0):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    batch = []
+    with engine.begin() as conn:
+        for n in range(rows):
+            batch.append({
+                "title": f"Job {n}",
+                "company": f"Company {n % 2000}",
+                "location": "Burlington, VT",
+                "description": "",
+                "url": f"https://example.com/job{n}",
+                "source": "indeed",
+                # Day granularity like the scrapers produce, plus some undated jobs
+                "posted_date": None if n % 50 == 0 else now - timedelta(days=rng.randrange(90)),
+            })
+            if len(batch) == 10000:
+                conn.execute(insert(schemas.Job), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(schemas.Job), batch)
+
+
+def offset_page(db, page: int, limit: int):
+    return (
+        db.query(schemas.Job)
+        .order_by(schemas.Job.posted_date.desc(), schemas.Job.id.desc())
+        .offset(page * limit).limit(limit).all()
+    )
+
+
+def walk_offset(db, limit: int):
+    page, seen = 0, 0
+    while True:
+        jobs = offset_page(db, page, limit)
+        seen += len(jobs)
+        db.expunge_all()
+        if len(jobs) < limit:
+            return seen
+        page += 1
+
+
+def walk_cursor(db, limit: int, stop_after: int = None):
+    cursor, seen = None, 0
+    while True:
+        jobs = fetch_keyset_page(db.query(schemas.Job), cursor, limit, "sqlite")
+        seen += len(jobs)
+        if len(jobs) < limit or (stop_after is not None and seen >= stop_after):
+            return seen, cursor
+        cursor = (jobs[-1].posted_date, jobs[-1].id)
+        db.expunge_all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--limit", type=int, default=1000, help="Page size")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        populate(engine, args.rows)
+        db = sessionmaker(bind=engine)()
+
+        print(f"{args.rows} jobs, page size {args.limit}")
+        for label, walk in [("offset", lambda: walk_offset(db, args.limit)),
+                            ("cursor", lambda: walk_cursor(db, args.limit)[0])]:
+            start = time.perf_counter()
+            seen = walk()
+            elapsed = time.perf_counter() - start
+            print(f"full walk, {label}: {elapsed:8.2f} s ({seen} jobs)")
+
+        print(f"{'depth':>8} {'offset ms':>10} {'cursor ms':>10}")
+        for fraction in (0, 0.1, 0.5, 0.9):
+            depth = int(args.rows * fraction) // args.limit * args.limit
+            _, cursor = walk_cursor(db, args.limit, stop_after=depth) if depth else (0, None)
+
+            start = time.perf_counter()
+            offset_page(db, depth // args.limit, args.limit)
+            offset_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            fetch_keyset_page(db.query(schemas.Job), cursor, args.limit, "sqlite")
+            cursor_ms = (time.perf_counter() - start) * 1000
+            db.expunge_all()
+            print(f"{depth:>8} {offset_ms:>10.1f} {cursor_ms:>10.1f}")
+
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
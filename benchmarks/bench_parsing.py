@@ -0,0 +1,128 @@
+"""Benchmark Indeed page parsing with each HTML parser backend.
+
+Parses search result pages and job detail pages with the original full
+``BeautifulSoup(html, "html.parser")`` tree and with every installed
+``app.scraper.parsing`` backend, and reports pages/sec and peak Python
+memory (tracemalloc; selectolax's C heap isn't counted) for each.
+
+Saved pages can be passed with --search-pages and --detail-pages;
+otherwise pages shaped like Indeed's (listings inside a large page of
+navigation, scripts and filters) are generated.
+
+Usage:
+    python -m benchmarks.bench_parsing --repeats 20
+    python -m benchmarks.bench_parsing --search-pages saved/search*.html --detail-pages saved/job*.html
+"""
+import argparse
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from app.scraper.indeed import IndeedScraper
+from app.scraper.parsing import available_backends
+
+LISTING = """
+<div class="cardOutline tapItem job_seen_beacon" data-jk="{n:016x}">
+  <table class="jobCard_mainContent"><tbody><tr><td class="resultContent">
+    <div class="heading4"><h2 class="jobTitle"><a id="job_{n}" href="/rc/clk?jk={n:016x}"><span title="Software Developer {n}">Software Developer {n}</span></a></h2></div>
+    <div class="heading6 company_location"><span class="companyName">Company {n}</span>
+      <div class="companyLocation">{location}</div></div>
+    <div class="metadata salary-snippet-container"><span class="salary-snippet">$6{d},000 - $8{d},000 a year</span></div>
+  </td></tr></tbody></table>
+  <div class="job-snippet"><ul><li>Build and maintain web applications in Python and JavaScript.</li>
+  <li>Work with SQL databases and cloud infrastructure.</li></ul></div>
+  <span class="date">Posted {d} days ago</span>
+</div>
+"""
+
+NOISE = """
+<div class="gnav-Dropdown"><ul>{items}</ul></div>
+<script type="text/javascript">window.mosaic = {{"providerData": {{"jobs": [{data}]}}}};</script>
+<div class="filters"><button class="yosegi-FilterPill">Remote</button><button class="yosegi-FilterPill">Salary</button></div>
+"""
+
+
+def search_page(listings: int = 15, noise: int = 40) -> str:
+    cards = "".join(
+        LISTING.format(n=n, d=n % 10, location="Remote" if n % 4 == 0 else "Burlington, VT")
+        for n in range(listings)
+    )
+    filler = "".join(
+        NOISE.format(items="".join(f"<li><a href='/q-{k}'>Search {k}</a></li>" for k in range(30)),
+                     data=",".join(f'{{"id": {k}, "title": "Job {k}"}}' for k in range(30)))
+        for _ in range(noise)
+    )
+    return f"<html><head><title>Jobs</title></head><body>{filler[:len(filler) // 2]}" \
+           f"<div id='mosaic-jobResults'>{cards}</div>{filler[len(filler) // 2:]}</body></html>"
+
+
+def detail_page(noise: int = 40) -> str:
+    description = "<p>We are hiring a developer with Python, SQL and AWS experience.</p>" * 40
+    filler = "".join(
+        NOISE.format(items="".join(f"<li><a href='/q-{k}'>Search {k}</a></li>" for k in range(30)),
+                     data=",".join(f'{{"id": {k}}}' for k in range(30)))
+        for _ in range(noise)
+    )
+    return f"<html><body>{filler}<div id='jobDescriptionText'>{description}</div>{filler}</body></html>"
+
+
+def legacy_parse_search(html: str):
+    soup = BeautifulSoup(html, "html.parser")
+    return [(job.select_one("h2.jobTitle span"), job.get("data-jk")) for job in soup.select("div.job_seen_beacon")]
+
+
+def legacy_parse_detail(html: str):
+    return BeautifulSoup(html, "html.parser").select_one("div#jobDescriptionText")
+
+
+def measure(parse, pages, repeats: int):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for page in pages:
+            parse(page)
+    elapsed = time.perf_counter() - start
+
+    # Peak memory in a separate pass, since tracing slows parsing down
+    tracemalloc.start()
+    for page in pages:
+        parse(page)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(pages) * repeats / elapsed, peak / 1024 / 1024
+
+
+def read_pages(paths):
+    pages = []
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            pages.append(f.read())
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--search-pages", nargs="*", default=None, help="Saved search result pages")
+    parser.add_argument("--detail-pages", nargs="*", default=None, help="Saved job detail pages")
+    args = parser.parse_args()
+
+    search_pages = read_pages(args.search_pages) if args.search_pages else [search_page()]
+    detail_pages = read_pages(args.detail_pages) if args.detail_pages else [detail_page()]
+    size_kb = sum(map(len, search_pages)) / len(search_pages) / 1024
+    print(f"search pages: {len(search_pages)} (avg {size_kb:.0f} KB), detail pages: {len(detail_pages)}")
+    print(f"{'backend':<22} {'search p/s':>11} {'peak MB':>8} {'detail p/s':>11} {'peak MB':>8}")
+
+    runs = [("full tree html.parser", legacy_parse_search, legacy_parse_detail)]
+    for backend in available_backends():
+        scraper = IndeedScraper(parser=backend)
+        runs.append((backend, scraper._parse_search_results, scraper._parse_job_details))
+
+    for label, parse_search, parse_detail in runs:
+        search_rate, search_peak = measure(parse_search, search_pages, args.repeats)
+        detail_rate, detail_peak = measure(parse_detail, detail_pages, args.repeats)
+        print(f"{label:<22} {search_rate:11.1f} {search_peak:8.1f} {detail_rate:11.1f} {detail_peak:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
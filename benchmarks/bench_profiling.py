@@ -0,0 +1,100 @@
+"""Benchmark the overhead of request profiling.
+
+Fills a SQLite database file with synthetic jobs and reports the median
+latency of a few GET /jobs listings (response cache off) with profiling
+disabled, enabled but not requested, and requested with X-Profile: 1,
+along with the size of the kept call tree.
+
+Usage:
+    python -m benchmarks.bench_profiling --rows 10000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app import profiling, schemas
+from app.cache import response_cache
+from app.database import Base, create_async_db_engine, create_db_engine, get_async_db, to_async_url
+from app.main import app
+from app.profiling import profiler
+
+LISTINGS = ["/jobs?limit=20", "/jobs?is_remote=true&limit=100", "/jobs?tag=python&skip=2000&limit=20"]
+
+MODES = ["disabled", "enabled", "requested"]
+
+
+def populate(engine, rows: int):
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(schemas.Tag), [{"id": 1, "name": "python"}])
+        conn.execute(insert(schemas.Job), [{
+            "id": job_id, "title": f"Job {job_id}", "company": "Company", "company_lower": "company",
+            "location": "Vermont", "location_lower": "vermont", "description": "Lorem ipsum " * 20,
+            "url": f"https://example.com/job{job_id}", "source": "indeed", "is_remote": job_id % 5 == 0,
+            "posted_date": now - timedelta(minutes=job_id),
+        } for job_id in range(1, rows + 1)])
+        conn.execute(insert(schemas.JobTag), [{"job_id": job_id, "tag_id": 1} for job_id in range(1, rows + 1, 3)])
+
+
+def timed_get(client, path: str, headers=None) -> float:
+    start = time.perf_counter()
+    client.get(path, headers=headers).raise_for_status()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_db_engine(url)
+        Base.metadata.create_all(bind=engine)
+        populate(engine, args.rows)
+
+        # Engines are created with profiling on, so its SQL hooks are installed
+        profiler.enabled = True
+        async_engine = create_async_db_engine(to_async_url(url), poolclass=NullPool)
+        AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+        async def override_get_async_db():
+            async with AsyncSessionLocal() as session:
+                yield session
+
+        app.dependency_overrides[get_async_db] = override_get_async_db
+        response_cache.maxsize = 0
+        try:
+            with TestClient(app) as client:
+                print(f"GET, median of {args.repeats}")
+                print(f"{'listing':<38}" + "".join(f"{mode:>11}" for mode in MODES))
+                for path in LISTINGS:
+                    # Modes alternate request by request, as the machine's speed drifts
+                    samples = {mode: [] for mode in MODES}
+                    for _ in range(args.repeats):
+                        profiler.enabled = False
+                        samples["disabled"].append(timed_get(client, path))
+                        profiler.enabled = True
+                        samples["enabled"].append(timed_get(client, path))
+                        samples["requested"].append(timed_get(client, path, {"X-Profile": "1"}))
+                    print(f"{path:<38}" + "".join(f"{statistics.median(samples[mode]):9.2f}ms" for mode in MODES))
+                profile = profiler.get(profiler.list()[0]["id"])
+                print(f"\nlast profile: {len(profile.statements)} statements, "
+                      f"call tree of {len(profile.call_tree.splitlines())} lines")
+        finally:
+            profiler.enabled = profiling.PROFILING_ENABLED
+            app.dependency_overrides.clear()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
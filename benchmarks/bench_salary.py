@@ -0,0 +1,89 @@
+"""Benchmark salary parsing throughput in strings/sec and how many strings it covers.
+
+Compares the original three-regex Indeed parser, app.salary one string at
+a time, and its batch API on synthetic salary snippets in the formats job
+boards use. Snippets repeat like they do across real listings.
+
+Usage:
+    python -m benchmarks.bench_salary --strings 200000
+"""
+import argparse
+import random
+import re
+import time
+
+from app.salary import parse_salaries, parse_salary
+
+FORMATS = [
+    "${low:,} - ${high:,} a year",
+    "${low:,} a year",
+    "${hourly} an hour",
+    "${hourly} - ${hourly_high} an hour",
+    "${hourly}/hr",
+    "${monthly:,} a month",
+    "${weekly:,} a week",
+    "${k}K - ${k_high}K",
+    "${k}K",
+    "Up to ${high:,} a year",
+    "Competitive salary",
+]
+
+
+def original_parse(salary_text):
+    """The Indeed scraper's parser before app.salary."""
+    if not salary_text:
+        return {"salary_min": None, "salary_max": None}
+    salary_text = salary_text.lower()
+    range_match = re.search(r'\$(\d+[,\d]*)\s*-\s*\$(\d+[,\d]*)\s*a\s*year', salary_text)
+    if range_match:
+        return {"salary_min": float(range_match.group(1).replace(',', '')),
+                "salary_max": float(range_match.group(2).replace(',', ''))}
+    single_year_match = re.search(r'\$(\d+[,\d]*)\s*a\s*year', salary_text)
+    if single_year_match:
+        salary = float(single_year_match.group(1).replace(',', ''))
+        return {"salary_min": salary, "salary_max": salary}
+    hourly_match = re.search(r'\$(\d+[,.\d]*)\s*an\s*hour', salary_text)
+    if hourly_match:
+        yearly = float(hourly_match.group(1).replace(',', '')) * 40 * 52
+        return {"salary_min": yearly, "salary_max": yearly}
+    return {"salary_min": None, "salary_max": None}
+
+
+def synthetic_salaries(count: int, distinct: int, seed: int = 0):
+    rng = random.Random(seed)
+    pool = []
+    for _ in range(distinct):
+        low = rng.randrange(30, 120) * 1000
+        hourly = rng.randrange(15, 60)
+        k = low // 1000
+        pool.append(rng.choice(FORMATS).format(
+            low=low, high=low + rng.randrange(5, 30) * 1000, hourly=hourly, hourly_high=hourly + 5,
+            monthly=low // 12, weekly=low // 52, k=k, k_high=k + 20,
+        ))
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def measure(label, func, texts):
+    start = time.perf_counter()
+    results = func(texts)
+    elapsed = time.perf_counter() - start
+    parsed = sum(result is not None and result.get("salary_min") is not None
+                 if isinstance(result, dict) else result is not None for result in results)
+    print(f"{label:<28} {elapsed:8.3f} s {len(texts) / elapsed:12.0f} strings/s {parsed / len(texts):8.1%} parsed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--strings", type=int, default=200000)
+    parser.add_argument("--distinct", type=int, default=5000, help="Distinct salary strings")
+    args = parser.parse_args()
+
+    texts = synthetic_salaries(args.strings, args.distinct)
+    print(f"{args.strings} salary strings, {len(set(texts))} distinct")
+    measure("original (3 regexes)", lambda t: [original_parse(text) for text in t], texts)
+    measure("parse_salary", lambda t: [parse_salary(text) for text in t], texts)
+    measure("parse_salaries (batch)", parse_salaries, texts)
+
+
+if __name__ == "__main__":
+    main()
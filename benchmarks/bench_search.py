@@ -0,0 +1,105 @@
+"""Benchmark /jobs?keyword= latency with and without the full-text index.
+
+Fills a SQLite database file with synthetic jobs and measures p50/p99
+latency of keyword searches through the API, once with the substring
+(ILIKE) filter and once with the FTS5 index.
+
+Usage:
+    python -m benchmarks.bench_search --sizes 10000 100000 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app import schemas, search
+from app.database import Base, get_db
+from app.main import app
+
+WORDS = (
+    "python java javascript react sql developer engineer analyst data manager support "
+    "customer service sales marketing nurse teacher technician warehouse driver burlington "
+    "montpelier vermont remote team experience skills design build maintain systems reporting"
+).split()
+
+SEARCHES = ["python", "data analyst", "nurse", "warehouse driver", "react developer", "montpelier"]
+
+
+def populate(engine, size: int, seed: int = 0):
+    rng = random.Random(seed)
+    batch = []
+    with engine.begin() as conn:
+        for n in range(size):
+            batch.append({
+                "title": " ".join(rng.choices(WORDS, k=3)).title(),
+                "company": f"Company {n % 2000}",
+                "location": "Burlington, VT",
+                "description": " ".join(rng.choices(WORDS, k=120)),
+                "url": f"https://example.com/job{n}",
+                "source": "indeed",
+                "is_remote": n % 4 == 0,
+            })
+            if len(batch) == 10000:
+                conn.execute(insert(schemas.Job), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(schemas.Job), batch)
+
+
+def measure(client, requests: int, sort: str):
+    latencies = []
+    for n in range(requests):
+        keyword = SEARCHES[n % len(SEARCHES)]
+        start = time.perf_counter()
+        response = client.get("/jobs", params={"keyword": keyword, "limit": 20, "sort": sort})
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200
+    cuts = statistics.quantiles(latencies, n=100)
+    return cuts[49], cuts[98]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--requests", type=int, default=60, help="Searches per measurement")
+    args = parser.parse_args()
+
+    print(f"{'jobs':>9} {'mode':<22} {'p50 ms':>9} {'p99 ms':>9}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+            Base.metadata.create_all(bind=engine)
+            populate(engine, size)
+            SessionLocal = sessionmaker(bind=engine)
+
+            def override_get_db():
+                db = SessionLocal()
+                try:
+                    yield db
+                finally:
+                    db.close()
+
+            app.dependency_overrides[get_db] = override_get_db
+            try:
+                with TestClient(app) as client:
+                    for label, fulltext, sort in [
+                        ("ILIKE", False, "date"),
+                        ("FTS5", True, "date"),
+                        ("FTS5 + BM25 ranking", True, "relevance"),
+                    ]:
+                        search.FULLTEXT_ENABLED = fulltext
+                        p50, p99 = measure(client, args.requests, sort)
+                        print(f"{size:>9} {label:<22} {p50:>9.1f} {p99:>9.1f}")
+            finally:
+                app.dependency_overrides.clear()
+                engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark /stats computed from the jobs table vs read from stat counters.
+
+Fills a SQLite database file with synthetic tagged jobs and reports the
+latency of the full aggregate queries and of reading the counters.
+
+Usage:
+    python -m benchmarks.bench_stats --rows 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app import schemas
+from app.database import Base
+from app.stats import compute_stats, read_stats, refresh_stat_counters
+
+TAGS = ["python", "javascript", "react", "sql", "remote", "junior", "senior", "aws", "docker", "excel"]
+
+
+def populate(engine, rows: int, seed: int = 0):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(schemas.Tag), [{"id": n + 1, "name": name} for n, name in enumerate(TAGS)])
+        for start in range(0, rows, 10000):
+            ids = range(start + 1, min(start + 10000, rows) + 1)
+            conn.execute(insert(schemas.Job), [{
+                "id": job_id,
+                "title": f"Job {job_id}",
+                "company": f"Company {rng.randrange(5000)}",
+                "location": "Vermont",
+                "description": "",
+                "url": f"https://example.com/job{job_id}",
+                "source": rng.choice(["indeed", "linkedin", "vtjobs"]),
+                "is_remote": rng.random() < 0.2,
+                "posted_date": now - timedelta(days=rng.randrange(120)),
+            } for job_id in ids])
+            conn.execute(insert(schemas.JobTag), [
+                {"job_id": job_id, "tag_id": tag_id}
+                for job_id in ids for tag_id in rng.sample(range(1, len(TAGS) + 1), 2)
+            ])
+
+
+def measure(func, repeats: int):
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies), max(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        populate(engine, args.rows)
+        db = sessionmaker(bind=engine)()
+
+        start = time.perf_counter()
+        refresh_stat_counters(db)
+        print(f"{args.rows} jobs, counter refresh took {time.perf_counter() - start:.2f} s")
+
+        assert read_stats(db)["total_jobs"] == compute_stats(db)["total_jobs"]
+        for label, func in [("aggregate queries", lambda: compute_stats(db)),
+                            ("stat counters", lambda: read_stats(db))]:
+            median, worst = measure(func, args.repeats)
+            print(f"{label:<20} median {median:10.1f} ms   max {worst:10.1f} ms")
+
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark tag extraction throughput in MB/s of description text.
+
+Compares the original nested keyword loop (7 keywords), the same loop run
+over every alias of the bundled vocabulary, and the compiled TagExtractor.
+
+Usage:
+    python -m benchmarks.bench_tagging --jobs 5000
+"""
+import argparse
+import random
+import time
+
+from app.tagging import get_tag_extractor
+
+# Tag keywords of the original nested loop in run_scrapers
+TAG_KEYWORDS = ["python", "javascript", "react", "sql", "remote", "junior", "senior"]
+
+FILLER = (
+    "We are a growing team in Burlington looking for someone who enjoys solving problems, "
+    "working closely with customers and shipping reliable software. "
+).split()
+
+
+def synthetic_jobs(count: int, words_per_job: int, seed: int = 0):
+    rng = random.Random(seed)
+    aliases = list(get_tag_extractor().aliases)
+    jobs = []
+    for n in range(count):
+        words = [rng.choice(aliases) if rng.random() < 0.05 else rng.choice(FILLER) for _ in range(words_per_job)]
+        jobs.append({"title": f"Software Developer {n}", "description": " ".join(words)})
+    return jobs
+
+
+def nested_loop(jobs, keywords):
+    for job_data in jobs:
+        tags = set()
+        for keyword in keywords:
+            if keyword.lower() in job_data["title"].lower() or keyword.lower() in job_data.get("description", "").lower():
+                tags.add(keyword)
+
+
+def compiled(jobs):
+    get_tag_extractor().extract_many(jobs)
+
+
+def measure(label, func, jobs, megabytes):
+    start = time.perf_counter()
+    func(jobs)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {elapsed:8.3f} s {megabytes / elapsed:10.2f} MB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--words", type=int, default=400, help="Words per description")
+    args = parser.parse_args()
+
+    extractor = get_tag_extractor()
+    jobs = synthetic_jobs(args.jobs, args.words)
+    megabytes = sum(len(job_data["title"]) + len(job_data["description"]) for job_data in jobs) / 1e6
+
+    print(f"{args.jobs} descriptions, {megabytes:.1f} MB, vocabulary of {len(extractor.tags)} tags / "
+          f"{len(extractor.aliases)} aliases")
+    measure("nested loop (7 keywords)", lambda j: nested_loop(j, TAG_KEYWORDS), jobs, megabytes)
+    measure("nested loop (full vocabulary)", lambda j: nested_loop(j, list(extractor.aliases)), jobs, megabytes)
+    measure("TagExtractor (full vocabulary)", compiled, jobs, megabytes)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,34 @@
+import os
+
+# Don't persist the scraper fetch cache while testing
+os.environ.setdefault("SCRAPER_CACHE_PATH", "")
+# Tests commit jobs in-process, so skip the cross-process data version checks
+os.environ.setdefault("RESPONSE_CACHE_SYNC_INTERVAL", "0")
+
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from fastapi.testclient import TestClient
-from app.database import Base, get_db
+from app.database import Base, create_async_db_engine, create_db_engine, get_async_db, get_db, to_async_url
 from app.main import app
-from app import schemas
-import os
+from app.cache import response_cache
+from app import profiling, schemas
+from app.stats import ensure_stat_counters
 
 # Use in-memory SQLite database for testing
 TEST_DATABASE_URL = "sqlite:///./test.db"
 
 # Create test engine and session
-engine = create_engine(
-    TEST_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+engine = create_db_engine(TEST_DATABASE_URL)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine on the same database for the async endpoints. Each TestClient
+# runs its own event loop, so connections aren't pooled across tests.
+async_engine = create_async_db_engine(to_async_url(TEST_DATABASE_URL), poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 @pytest.fixture(scope="function")
 def db():
     # Create the database tables
@@ -39,11 +52,78 @@ def client(db):
         finally:
             pass
     
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as async_db:
+            yield async_db
+    
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    response_cache.clear()
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
 
+@pytest.fixture(scope="function")
+def query_counter():
+    """Record the SQL statements executed on the test database"""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    for target in (engine, async_engine.sync_engine):
+        event.listen(target, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        for target in (engine, async_engine.sync_engine):
+            event.remove(target, "before_cursor_execute", before_cursor_execute)
+
+@pytest.fixture(scope="function")
+def query_plans():
+    """Record SELECTs executed on the test database; calling the fixture returns their SQLite query plans"""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+    
+    def explain():
+        with engine.connect() as conn:
+            return [
+                (statement, [row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)])
+                for statement, parameters in statements
+            ]
+    
+    for target in (engine, async_engine.sync_engine):
+        event.listen(target, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield explain
+    finally:
+        for target in (engine, async_engine.sync_engine):
+            event.remove(target, "before_cursor_execute", before_cursor_execute)
+
+@pytest.fixture(scope="function")
+def profiler():
+    """Enable request profiling, with its SQL hooks on the test database"""
+    settings = (profiling.profiler.sample_rate, profiling.profiler.slow_ms)
+    profiling.profiler.enabled = True
+    hooks = [("before_cursor_execute", profiling._before_cursor_execute),
+             ("after_cursor_execute", profiling._after_cursor_execute),
+             ("handle_error", profiling._handle_error)]
+    for target in (engine, async_engine.sync_engine):
+        for name, hook in hooks:
+            event.listen(target, name, hook)
+    try:
+        yield profiling.profiler
+    finally:
+        for target in (engine, async_engine.sync_engine):
+            for name, hook in hooks:
+                event.remove(target, name, hook)
+        profiling.profiler.enabled = False
+        profiling.profiler.sample_rate, profiling.profiler.slow_ms = settings
+        profiling.profiler.clear()
+
 @pytest.fixture(scope="function")
 def test_jobs(db):
     """Create some test job entries in the database"""
@@ -110,6 +190,9 @@ def test_jobs(db):
     
     db.commit()
     
+    # Jobs added outside ingestion get their counters built, as at startup
+    ensure_stat_counters(db)
+    
     # Return the test data for reference if needed
     return {
         "jobs": jobs,
@@ -1,6 +1,8 @@
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
+from app import schemas
+from datetime import datetime, timedelta
 
 def test_root_endpoint(client):
     """Test the root endpoint returns the expected information."""
@@ -99,4 +101,156 @@ def test_get_stats(client, test_jobs):
     assert "indeed" in stats["jobs_by_source"]
     assert "linkedin" in stats["jobs_by_source"]
     assert "vtjobs" in stats["jobs_by_source"]
-    assert stats["jobs_by_source"]["indeed"] == 1
\ No newline at end of file
+    assert stats["jobs_by_source"]["indeed"] == 1
+
+def _add_jobs(db, *descriptions):
+    """Add untagged jobs with the given (title, description) pairs."""
+    for n, (title, description) in enumerate(descriptions):
+        db.add(schemas.Job(
+            title=title,
+            company="TestCo",
+            location="Vermont",
+            description=description,
+            url=f"https://example.com/search{n}",
+            source="indeed",
+        ))
+    db.commit()
+
+def test_get_jobs_keyword_fulltext(client, db):
+    """Test keyword search through the full-text index."""
+    _add_jobs(
+        db,
+        ("Python Developer", "Backend services"),
+        ("Data Analyst", "Reporting with python and SQL"),
+        ("Web Developer", "Frontend work"),
+    )
+    
+    # Matches words in title or description, case-insensitively
+    response = client.get("/jobs?keyword=PYTHON")
+    assert response.status_code == 200
+    assert {job["title"] for job in response.json()} == {"Python Developer", "Data Analyst"}
+    
+    # Multiple words must all match, words match as prefixes
+    response = client.get("/jobs?keyword=report sql")
+    assert [job["title"] for job in response.json()] == ["Data Analyst"]
+    
+    # The index follows updates and deletes
+    job = db.query(schemas.Job).filter(schemas.Job.title == "Web Developer").one()
+    job.description = "Python frontend work"
+    db.delete(db.query(schemas.Job).filter(schemas.Job.title == "Data Analyst").one())
+    db.commit()
+    response = client.get("/jobs?keyword=python")
+    assert {job["title"] for job in response.json()} == {"Python Developer", "Web Developer"}
+
+def test_get_jobs_keyword_relevance(client, db):
+    """Test ordering keyword matches by relevance."""
+    _add_jobs(
+        db,
+        ("Office Manager", "Some python scripting is a plus"),
+        ("Python Developer", "Python, python and more python"),
+    )
+    
+    response = client.get("/jobs?keyword=python&sort=relevance")
+    assert response.status_code == 200
+    assert [job["title"] for job in response.json()] == ["Python Developer", "Office Manager"]
+
+def test_get_jobs_cursor_pagination(client, db):
+    """Test paging through jobs with cursors while new jobs arrive."""
+    now = datetime.utcnow()
+    for n in range(7):
+        db.add(schemas.Job(
+            title=f"Job {n}",
+            company="TestCo",
+            location="Vermont",
+            description="",
+            url=f"https://example.com/page{n}",
+            source="indeed",
+            # Two jobs share a date and one has no date at all
+            posted_date=None if n == 0 else now - timedelta(days=min(n, 5)),
+        ))
+    db.commit()
+    
+    response = client.get("/jobs?paginate=cursor&limit=3")
+    assert response.status_code == 200
+    titles = [job["title"] for job in response.json()]
+    cursor = response.headers["X-Next-Cursor"]
+    
+    # A job added while paging doesn't shift the following pages
+    db.add(schemas.Job(title="Newest", company="TestCo", location="Vermont", description="",
+                       url="https://example.com/newest", source="indeed", posted_date=now))
+    db.commit()
+    
+    while cursor:
+        response = client.get(f"/jobs?cursor={cursor}&limit=3")
+        assert response.status_code == 200
+        titles += [job["title"] for job in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+    
+    assert titles == ["Job 1", "Job 2", "Job 3", "Job 4", "Job 6", "Job 5", "Job 0"]
+
+def test_get_jobs_invalid_cursor(client):
+    """Test that malformed cursors are rejected."""
+    response = client.get("/jobs?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+def _add_tagged_jobs(db, count):
+    tags = [schemas.Tag(name=name) for name in ("python", "sql", "react")]
+    db.add_all(tags)
+    for n in range(count):
+        job = schemas.Job(title=f"Job {n}", company="TestCo", location="Vermont", description="Long text " * 50,
+                          url=f"https://example.com/tagged{n}", source="indeed")
+        job.job_tags = [schemas.JobTag(tag=tags[n % 3]), schemas.JobTag(tag=tags[(n + 1) % 3])]
+        db.add(job)
+    db.commit()
+
+def test_get_jobs_loads_tags_without_n_plus_1(client, db, query_counter):
+    """Test that a page of jobs and all their tags take a constant number of queries."""
+    _add_tagged_jobs(db, 30)
+    query_counter.clear()
+    
+    response = client.get("/jobs")
+    assert response.status_code == 200
+    jobs = response.json()
+    assert len(jobs) == 30
+    assert {tag["name"] for tag in jobs[0]["tags"]} == {"python", "sql"}
+    
+    # One query for the jobs and one for all of their tags
+    assert len(query_counter) == 2
+    
+    query_counter.clear()
+    response = client.get("/jobs/5")
+    assert [tag["name"] for tag in response.json()["tags"]] == ["react", "sql"]
+    assert len(query_counter) == 2
+
+def test_get_jobs_summary(client, db, query_counter):
+    """Test that summary mode leaves descriptions out of the query and payload."""
+    _add_tagged_jobs(db, 5)
+    query_counter.clear()
+    
+    response = client.get("/jobs?fields=summary")
+    assert response.status_code == 200
+    jobs = response.json()
+    assert len(jobs) == 5
+    assert "description" not in jobs[0]
+    assert jobs[0]["tags"]
+    assert "description" not in query_counter[0]
+
+def test_get_jobs_company_location(client, db):
+    """Test company and location match any part of the name, and their _prefix variants the start, ignoring case."""
+    from app.ingest import ingest_jobs
+    ingest_jobs(db, [
+        {"title": "Baker", "company": "Café Ami", "location": "Burlington, VT", "description": "",
+         "url": "https://example.com/baker", "source": "vtjobs"},
+        {"title": "Barista", "company": "Ami Coffee", "location": "South Burlington, VT", "description": "",
+         "url": "https://example.com/barista", "source": "vtjobs"},
+    ])
+    
+    assert [job["title"] for job in client.get("/jobs?company=coffee").json()] == ["Barista"]
+    assert sorted(job["title"] for job in client.get("/jobs?company=AMI").json()) == ["Baker", "Barista"]
+    assert sorted(job["title"] for job in client.get("/jobs?location=VT").json()) == ["Baker", "Barista"]
+    assert [job["title"] for job in client.get("/jobs?location=100%25").json()] == []
+    
+    assert [job["title"] for job in client.get("/jobs?company_prefix=CAFÉ").json()] == ["Baker"]
+    assert [job["title"] for job in client.get("/jobs?company_prefix=ami").json()] == ["Barista"]
+    assert [job["title"] for job in client.get("/jobs?location_prefix=burlington").json()] == ["Baker"]
+    assert [job["title"] for job in client.get("/jobs/search?location_prefix=south").json()["jobs"]] == ["Barista"]
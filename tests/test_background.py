@@ -1,12 +1,35 @@
+import asyncio
 import pytest
-from unittest.mock import patch, MagicMock
-from sqlalchemy.orm import Session
-from app.main import run_scrapers
+from unittest.mock import patch, MagicMock, AsyncMock
+from sqlalchemy.orm import Session, sessionmaker
+from app.worker import execute_run, run_scheduled, run_scrapers, scrapers
 from app import schemas
+from app.scheduler import Schedule
+from app.scrape_queue import claim_next_run, enqueue_scrape
+from app.scraper import BaseScraper
 
-@patch('app.main.indeed_scraper')
-def test_run_scrapers(mock_indeed_scraper, db):
+class _MockScraper(BaseScraper):
+    """Scraper whose search and detail fetching are mocks."""
+    
+    SOURCE_NAME = "indeed"
+    
+    def __init__(self):
+        self.search = MagicMock(return_value=[])
+        self.get_jobs_details = AsyncMock(return_value={})
+    
+    def search(self, keywords="", location="Vermont"):
+        pass
+
+def _mock_scraper():
+    """Register a mocked Indeed scraper as the only source."""
+    mock_scraper = _MockScraper()
+    scrapers["indeed"] = mock_scraper
+    return mock_scraper
+
+@patch.dict('app.worker.scrapers', clear=True)
+def test_run_scrapers(db):
     """Test the background scraping functionality."""
+    mock_indeed_scraper = _mock_scraper()
     # Create mock job data
     mock_job_data = {
         "title": "Test Job",
@@ -21,11 +44,13 @@ def test_run_scrapers(mock_indeed_scraper, db):
         "posted_date": None
     }
     
-    # Mock the search and get_job_details methods
+    # Mock the search and get_jobs_details methods
     mock_indeed_scraper.search.return_value = [mock_job_data]
-    mock_indeed_scraper.get_job_details.return_value = {
-        "description": "Detailed job description with python and javascript requirements."
-    }
+    mock_indeed_scraper.get_jobs_details = AsyncMock(return_value={
+        "https://example.com/job1": {
+            "description": "Detailed job description with python and javascript requirements."
+        }
+    })
     
     # Run the scraper
     run_scrapers(db)
@@ -45,9 +70,10 @@ def test_run_scrapers(mock_indeed_scraper, db):
     job_tags = db.query(schemas.JobTag).all()
     assert len(job_tags) > 0
 
-@patch('app.main.indeed_scraper')
-def test_run_scrapers_existing_job(mock_indeed_scraper, db):
+@patch.dict('app.worker.scrapers', clear=True)
+def test_run_scrapers_existing_job(db):
     """Test that run_scrapers doesn't duplicate existing jobs."""
+    mock_indeed_scraper = _mock_scraper()
     # First, add a job to the database
     existing_job = schemas.Job(
         title="Existing Job",
@@ -77,6 +103,7 @@ def test_run_scrapers_existing_job(mock_indeed_scraper, db):
     
     # Mock the search method
     mock_indeed_scraper.search.return_value = [mock_job_data]
+    mock_indeed_scraper.get_jobs_details = AsyncMock(return_value={})
     
     # Run the scraper
     run_scrapers(db)
@@ -87,4 +114,81 @@ def test_run_scrapers_existing_job(mock_indeed_scraper, db):
     
     # Verify the job still has its original title (wasn't updated)
     job = db.query(schemas.Job).first()
-    assert job.title == "Existing Job"
\ No newline at end of file
+    assert job.title == "Existing Job"
+    
+    # Existing jobs shouldn't have their details fetched again
+    mock_indeed_scraper.get_jobs_details.assert_not_called()
+
+@patch.dict('app.worker.scrapers', clear=True)
+def test_execute_run_records_progress(db):
+    """Test that a worker run records its progress and outcome."""
+    mock_indeed_scraper = _mock_scraper()
+    mock_indeed_scraper.search.return_value = [{
+        "title": "Queued Job",
+        "company": "Test Company",
+        "location": "Burlington, VT",
+        "description": "Python developer",
+        "url": "https://example.com/queued-job",
+        "source": "indeed",
+        "is_remote": False,
+        "posted_date": None
+    }]
+    
+    enqueue_scrape(db)
+    run = claim_next_run(db, "test-worker")
+    execute_run(db, run)
+    
+    db.refresh(run)
+    assert run.status == "succeeded"
+    # Each of the four keyword searches found the listing
+    assert run.jobs_found == 4
+    assert run.jobs_inserted == 1
+    assert run.finished_at is not None
+
+@patch.dict('app.worker.scrapers', clear=True)
+def test_execute_run_without_new_jobs_reports_progress(db):
+    """Test that a run only finding stored jobs still refreshes its heartbeat and counts them."""
+    mock_indeed_scraper = _mock_scraper()
+    db.add(schemas.Job(title="Stored Job", url="https://example.com/stored-job", source="indeed"))
+    db.commit()
+    mock_indeed_scraper.search.return_value = [{"title": "Stored Job", "url": "https://example.com/stored-job"}]
+    
+    enqueue_scrape(db)
+    run = claim_next_run(db, "test-worker")
+    claimed_at = run.heartbeat_at
+    execute_run(db, run)
+    
+    db.refresh(run)
+    assert run.status == "succeeded"
+    assert run.jobs_found == 4
+    assert run.jobs_inserted == 0
+    assert run.heartbeat_at > claimed_at
+    mock_indeed_scraper.get_jobs_details.assert_not_called()
+
+@patch('app.worker.run_scrapers', side_effect=RuntimeError("source down"))
+def test_execute_run_records_failure(mock_run_scrapers, db):
+    """Test that a failing worker run is marked as failed."""
+    enqueue_scrape(db)
+    run = claim_next_run(db, "test-worker")
+    execute_run(db, run)
+    
+    db.refresh(run)
+    assert run.status == "failed"
+    assert run.error == "source down"
+
+@patch.dict('app.worker.scrapers', clear=True)
+def test_run_scheduled_records_run(db):
+    """Test that a scheduled scrape runs as a scrape run, and is skipped while another is queued."""
+    mock_indeed_scraper = _mock_scraper()
+    mock_indeed_scraper.search.return_value = [{"title": "Job", "url": "https://example.com/job", "source": "indeed"}]
+    schedule = Schedule("indeed", ["developer"], interval=3600)
+    
+    with patch('app.worker.SessionLocal', sessionmaker(bind=db.get_bind())):
+        assert asyncio.run(run_scheduled(schedule, schedule.budget())) == {"indeed": 1}
+        run = db.query(schemas.ScrapeRun).one()
+        assert (run.status, run.jobs_found, run.jobs_inserted) == ("succeeded", 1, 1)
+        
+        enqueue_scrape(db)
+        assert asyncio.run(run_scheduled(schedule, schedule.budget())) == {"indeed": 0}
+        assert mock_indeed_scraper.search.call_count == 1
+        assert db.query(schemas.ScrapeRun).count() == 2
@@ -0,0 +1,127 @@
+import time
+from app import schemas
+from app.cache import ResponseCache, render_json, response_cache
+from app.dataversion import data_version_query
+from app.dedup import backfill_fingerprints
+from app.ingest import ingest_jobs, retag_jobs
+from app.salary import backfill_salaries
+
+
+class TestResponseCache:
+    """Tests for the in-process response cache."""
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = ResponseCache(maxsize=2, ttl=60)
+        a, b, c = (cache.make_key("tags", {"n": n}) for n in "abc")
+        cache.set(a, render_json("a"))
+        cache.set(b, render_json("b"))
+        cache.get(a)
+        cache.set(c, render_json("c"))
+        
+        assert cache.get(b) is None
+        assert cache.get(a).body == b'"a"'
+        assert cache.get(c).body == b'"c"'
+        assert cache.evictions == 1
+    
+    def test_ttl_expiry(self):
+        """Test that entries expire after the TTL."""
+        cache = ResponseCache(maxsize=10, ttl=0.05)
+        key = cache.make_key("tags", {})
+        cache.set(key, render_json([]))
+        assert cache.get(key) is not None
+        
+        time.sleep(0.1)
+        assert cache.get(key) is None
+        assert cache.stats()["size"] == 0
+    
+    def test_key_normalization(self):
+        """Test that parameter order and unset parameters don't change the key."""
+        cache = ResponseCache()
+        assert cache.make_key("jobs", {"a": 1, "b": None, "c": True}) == cache.make_key("jobs", {"c": True, "a": 1})
+        assert cache.make_key("jobs", {"a": 1}) != cache.make_key("jobs", {"a": 2})
+    
+    def test_disabled(self):
+        """Test that a zero-size cache stores nothing."""
+        cache = ResponseCache(maxsize=0)
+        key = cache.make_key("tags", {})
+        cache.set(key, render_json([]))
+        assert cache.get(key) is None
+    
+    def test_version_change_invalidates(self):
+        """Test that a changed data version from another process clears the cache."""
+        cache = ResponseCache(maxsize=10, ttl=60, sync_interval=60)
+        assert cache.version_due()
+        assert not cache.version_due()
+        
+        cache.observe_version(3)
+        key = cache.make_key("tags", {})
+        cache.set(key, render_json([]))
+        cache.observe_version(3)
+        assert cache.get(key) is not None
+        
+        cache.observe_version(5)
+        assert cache.generation == 1
+        assert cache.stats()["size"] == 0
+
+
+def test_cached_endpoint(client, db):
+    """Test that repeated reads are served from the cache until the generation changes."""
+    db.add(schemas.Tag(name="python"))
+    db.commit()
+    
+    before = response_cache.stats()
+    assert client.get("/tags").json() == [{"id": 1, "name": "python"}]
+    
+    # Changes that don't bump the generation are not visible yet
+    db.add(schemas.Tag(name="sql"))
+    db.commit()
+    assert client.get("/tags").json() == [{"id": 1, "name": "python"}]
+    
+    after = response_cache.stats()
+    assert after["hits"] == before["hits"] + 1
+    assert after["misses"] == before["misses"] + 1
+    
+    response_cache.bump_generation()
+    assert len(client.get("/tags").json()) == 2
+    
+    assert client.get("/cache/stats").json()["generation"] == after["generation"] + 1
+
+
+def test_writers_advance_data_version(db):
+    """Test that updates to stored jobs advance the data version, not only inserts."""
+    versions = [db.scalar(data_version_query())]
+    ingest_jobs(db, [{"title": "Python Developer", "url": "https://example.com/1", "source": "indeed"}])
+    versions.append(db.scalar(data_version_query()))
+    
+    # Duplicate postings stored without fingerprints, as before deduplication existed
+    description = ("Our restaurant in Stowe is hiring a line cook for the dinner service. You will prepare "
+                   "dishes from local farms, keep the kitchen clean and help with ordering and inventory.")
+    db.add(schemas.Job(title="Line Cook", description=description, url="https://example.com/2", source="vtjobs",
+                       salary_text="$20 an hour"))
+    db.add(schemas.Job(title="Line Cook", description=description, url="https://example.com/3", source="vtjobs"))
+    db.commit()
+    versions.append(db.scalar(data_version_query()))
+    
+    backfill_salaries(db)
+    versions.append(db.scalar(data_version_query()))
+    retag_jobs(db)
+    versions.append(db.scalar(data_version_query()))
+    backfill_fingerprints(db)
+    versions.append(db.scalar(data_version_query()))
+    
+    # The fingerprint backfill also advances it when rebuilding the stats
+    assert versions == [0, 1, 1, 2, 3, 5]
+
+
+def test_update_by_another_process_invalidates(client, db, monkeypatch):
+    """Test that a backfill committed outside the API process invalidates its cached responses."""
+    monkeypatch.setattr(response_cache, "sync_interval", 0.01)
+    db.add(schemas.Job(title="Chef", company="Café", location="Stowe, VT", description="", source="vtjobs",
+                       url="https://example.com/chef", salary_text="$50,000"))
+    db.commit()
+    
+    assert client.get("/jobs").json()[0]["salary_min"] is None
+    backfill_salaries(db)
+    time.sleep(0.02)
+    assert client.get("/jobs").json()[0]["salary_min"] == 50000
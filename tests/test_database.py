@@ -0,0 +1,27 @@
+from app.database import POOL_OPTIONS, SQLITE_PRAGMAS, create_db_engine, engine_options, to_async_url
+
+def test_to_async_url():
+    """Test that database URLs are mapped to their async drivers."""
+    assert to_async_url("sqlite:///./jobs.db") == "sqlite+aiosqlite:///./jobs.db"
+    assert to_async_url("postgresql://user:secret@db/jobs") == "postgresql+asyncpg://user:secret@db/jobs"
+    assert to_async_url("postgresql+psycopg2://db/jobs") == "postgresql+asyncpg://db/jobs"
+    
+    # Async URLs and backends without a known async driver are left alone
+    assert to_async_url("sqlite+aiosqlite:///./jobs.db") == "sqlite+aiosqlite:///./jobs.db"
+    assert to_async_url("mysql://db/jobs") == "mysql://db/jobs"
+
+def test_sqlite_pragmas(tmp_path):
+    """Test that SQLite connections are opened with the configured pragmas."""
+    db_engine = create_db_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    with db_engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == SQLITE_PRAGMAS["busy_timeout"]
+    db_engine.dispose()
+
+def test_engine_options():
+    """Test that pool settings only apply to server databases."""
+    assert engine_options("sqlite:///./jobs.db") == {}
+    options = engine_options("postgresql://db/jobs")
+    assert options["pool_size"] == POOL_OPTIONS["pool_size"]
+    assert options["pool_pre_ping"] is True
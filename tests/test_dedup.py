@@ -0,0 +1,129 @@
+import pytest
+from app import dedup, schemas
+from app.dedup import LSHIndex, MinHasher, backfill_fingerprints, job_shingles, minhasher, similarity
+from app.ingest import ingest_jobs
+from app.stats import read_stats
+
+DESCRIPTION = (
+    "We are hiring a backend developer to build and maintain the services behind our booking "
+    "platform. You will design REST APIs in Python, model data in PostgreSQL, write tests, review "
+    "code and work closely with product and support teams in our Burlington office. Experience "
+    "with Django or FastAPI, Docker and cloud deployments is a plus. We offer health insurance, "
+    "a retirement plan, flexible hours and three weeks of paid time off."
+)
+
+OTHER_DESCRIPTION = (
+    "Our hospital is looking for a registered nurse for the night shift in the surgical unit. "
+    "Responsibilities include patient assessment, medication administration, charting and "
+    "coordinating care with physicians. A Vermont RN license and two years of acute care "
+    "experience are required. Sign-on bonus and tuition assistance available."
+)
+
+
+def posting(url, source="indeed", title="Backend Developer", description=DESCRIPTION, **fields):
+    return dict({
+        "title": title,
+        "company": "Green Mountain Travel",
+        "location": "Burlington, VT",
+        "description": description,
+        "url": url,
+        "source": source,
+    }, **fields)
+
+
+def test_signature_estimates_jaccard():
+    """Test that signature agreement approximates the true Jaccard similarity."""
+    a = job_shingles(posting("a"))
+    b = job_shingles(posting("b", description=DESCRIPTION.replace("three weeks", "four weeks")))
+    exact = len(a & b) / len(a | b)
+    assert abs(similarity(minhasher.signature(a), minhasher.signature(b)) - exact) < 0.1
+    other = job_shingles(posting("c", description=OTHER_DESCRIPTION))
+    assert similarity(minhasher.signature(a), minhasher.signature(other)) < 0.3
+
+
+def test_pure_python_signatures_match_numpy(monkeypatch):
+    """Test that stored signatures don't depend on whether numpy is installed."""
+    pytest.importorskip("numpy")
+    shingles = job_shingles(posting("a"))
+    with_numpy = MinHasher().signature(shingles)
+    monkeypatch.setattr(dedup, "HAS_NUMPY", False)
+    assert MinHasher().signature(shingles) == with_numpy
+
+
+def test_lsh_index_finds_similar_signatures():
+    """Test that the LSH index returns near-duplicates and skips unrelated items."""
+    index = LSHIndex()
+    index.add("original", minhasher.signature(job_shingles(posting("a"))))
+    index.add("other", minhasher.signature(job_shingles(posting("b", description=OTHER_DESCRIPTION))))
+    
+    edited = posting("c", title="Backend Developer (Python)", description=DESCRIPTION + " Apply today.")
+    matches = index.query(minhasher.signature(job_shingles(edited)))
+    assert [key for key, _ in matches] == ["original"]
+
+
+def test_duplicates_are_linked_on_ingest(db):
+    """Test that the same posting from another source or keyword is linked to the first one."""
+    ingest_jobs(db, [
+        posting("https://indeed.example/1"),
+        posting("https://other.example/x", description=OTHER_DESCRIPTION),
+    ])
+    # A later batch, matched against the persisted index
+    ingest_jobs(db, [
+        posting("https://vtjobs.example/9", source="vtjobs", description=DESCRIPTION.replace("a plus", "nice to have")),
+        posting("https://indeed.example/2", title="Backend Developer II"),
+    ])
+    
+    jobs = {job.url: job for job in db.query(schemas.Job)}
+    original = jobs["https://indeed.example/1"]
+    assert original.canonical_id is None
+    assert jobs["https://other.example/x"].canonical_id is None
+    assert jobs["https://vtjobs.example/9"].canonical_id == original.id
+    assert jobs["https://indeed.example/2"].canonical_id == original.id
+    assert db.query(schemas.JobFingerprint).count() == 4
+
+
+def test_duplicates_within_a_batch(db):
+    """Test that duplicates inside one batch point at the first posting."""
+    ingest_jobs(db, [posting(f"https://example.com/{n}") for n in range(3)])
+    jobs = db.query(schemas.Job).order_by(schemas.Job.id).all()
+    assert [job.canonical_id for job in jobs] == [None, jobs[0].id, jobs[0].id]
+
+
+def test_deleted_jobs_left_in_index(db):
+    """Test that fingerprints and buckets of deleted jobs are neither matched nor in the way."""
+    ingest_jobs(db, [posting("https://indeed.example/1")])
+    # Buckets of a job deleted without its rows, and the fingerprint of one whose id SQLite hands out again
+    db.query(schemas.JobLSHBucket).update({"job_id": 1000})
+    db.query(schemas.JobTag).delete()
+    db.query(schemas.Job).delete()
+    db.commit()
+    
+    ingest_jobs(db, [posting("https://indeed.example/2")])
+    job = db.query(schemas.Job).one()
+    assert job.canonical_id is None
+    assert db.query(schemas.JobFingerprint).filter_by(job_id=job.id).count() == 1
+
+
+def test_jobs_collapse_duplicates(client, db):
+    """Test that /jobs lists each posting once unless collapse=false."""
+    ingest_jobs(db, [posting("https://indeed.example/1"), posting("https://vtjobs.example/1", source="vtjobs")])
+    
+    assert [job["url"] for job in client.get("/jobs").json()] == ["https://indeed.example/1"]
+    assert len(client.get("/jobs?collapse=false").json()) == 2
+    assert client.get("/stats").json()["total_jobs"] == 1
+    assert client.get("/stats?fresh=true").json()["total_jobs"] == 1
+
+
+def test_backfill_fingerprints(db):
+    """Test fingerprinting jobs that were stored without going through ingestion."""
+    for n in range(3):
+        data = posting(f"https://example.com/{n}")
+        db.add(schemas.Job(**data))
+    db.commit()
+    
+    assert read_stats(db, fresh=True)["total_jobs"] == 3
+    
+    assert backfill_fingerprints(db, batch_size=2) == 2
+    assert db.query(schemas.Job).filter(schemas.Job.canonical_id.isnot(None)).count() == 2
+    assert read_stats(db)["total_jobs"] == 1
+    assert backfill_fingerprints(db) == 0
@@ -0,0 +1,109 @@
+import asyncio
+import csv
+import io
+import json
+import tracemalloc
+
+import pytest
+
+from app import export, schemas
+from app.main import app
+
+
+def test_export_ndjson(client, test_jobs):
+    """Test exporting jobs as one JSON object per line, with filters and tags."""
+    response = client.get("/jobs/export?format=ndjson")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert "attachment" in response.headers["content-disposition"]
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["title"] for row in rows] == ["Python Developer", "Remote Frontend Developer", "Data Analyst"]
+    assert rows[0]["tags"] == ["python"]
+    assert set(rows[0]) == set(export.FIELDS)
+
+    response = client.get("/jobs/export?is_remote=true")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["company"] for row in rows] == ["WebWorks"]
+
+
+def test_export_csv(client, test_jobs):
+    """Test exporting jobs as CSV with a header row."""
+    response = client.get("/jobs/export?format=csv&tag=react")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 1
+    assert rows[0]["title"] == "Remote Frontend Developer"
+    assert rows[0]["tags"] == "react"
+    assert rows[0]["salary_min"] == "80000.0"
+
+
+@pytest.mark.skipif(export.HAS_PYARROW, reason="pyarrow is installed")
+def test_export_parquet_requires_pyarrow(client):
+    response = client.get("/jobs/export?format=parquet")
+    assert response.status_code == 400
+
+
+@pytest.mark.skipif(not export.HAS_PYARROW, reason="pyarrow is not installed")
+def test_export_parquet(client, test_jobs):
+    import pyarrow.parquet as pq
+
+    response = client.get("/jobs/export?format=parquet")
+    assert response.status_code == 200
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.column("title").to_pylist() == ["Python Developer", "Remote Frontend Developer", "Data Analyst"]
+    assert table.column("tags").to_pylist()[2] == ["data-analysis"]
+
+
+def _insert_jobs(db, start, count):
+    db.execute(schemas.Job.__table__.insert(), [
+        {"title": f"Job {n}", "company": "Acme", "location": "Burlington, VT", "description": "x" * 200,
+         "url": f"https://example.com/job/{n}", "source": "indeed", "is_remote": False}
+        for n in range(start, start + count)
+    ])
+    db.commit()
+
+
+def _export_peak(path):
+    """Rows exported and peak traced memory while streaming an export.
+
+    Calls the ASGI app directly, since the test client buffers whole
+    response bodies.
+    """
+    scope = {"type": "http", "method": "GET", "path": path, "raw_path": path.encode(), "query_string": b"",
+             "headers": [], "http_version": "1.1", "scheme": "http", "server": ("test", 80),
+             "client": ("test", 1234), "root_path": "", "app": app}
+    lines = 0
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if requested:
+            # Stay connected until the response is complete
+            await asyncio.Event().wait()
+        requested = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal lines
+        lines += message.get("body", b"").count(b"\n")
+
+    tracemalloc.start()
+    try:
+        asyncio.run(app(scope, receive, send))
+        return lines, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_export_memory_is_bounded(client, db, monkeypatch):
+    """Test exporting 10x the rows doesn't take noticeably more memory."""
+    monkeypatch.setattr(export, "EXPORT_CHUNK_SIZE", 500)
+    _insert_jobs(db, 0, 2000)
+    small_rows, small_peak = _export_peak("/jobs/export")
+    _insert_jobs(db, 2000, 18000)
+    large_rows, large_peak = _export_peak("/jobs/export")
+
+    assert (small_rows, large_rows) == (2000, 20000)
+    # Holding the export in memory would take over 5 MB more
+    assert large_peak < small_peak * 1.5 + 1_000_000
@@ -0,0 +1,120 @@
+from collections import Counter
+from datetime import datetime, timedelta
+
+from app import facets
+from app.ingest import ingest_jobs
+
+
+def make_jobs(count):
+    now = datetime.utcnow()
+    return [
+        {
+            "title": f"Developer {n}",
+            "company": f"Company {n % 3}",
+            "location": "Vermont",
+            "description": ("Python", "SQL", "Python and SQL")[n % 3],
+            "url": f"https://example.com/facets{n}",
+            "source": "indeed" if n % 4 else "linkedin",
+            "is_remote": n % 5 == 0,
+            "salary_min": 30000.0 + n * 5000 if n % 2 else None,
+            "salary_max": 40000.0 + n * 5000 if n % 2 else None,
+            "posted_date": now - timedelta(days=n),
+        }
+        for n in range(count)
+    ]
+
+
+def _counts(values):
+    return Counter(value for value in values if value is not None)
+
+
+def _facet(response, name):
+    return {entry["value"]: entry["count"] for entry in response["facets"][name]}
+
+
+def test_search_facets_follow_filters(client, db):
+    """Test the page, total and every facet are computed under the same filters."""
+    jobs = make_jobs(30)
+    ingest_jobs(db, jobs)
+
+    response = client.get("/jobs/search?is_remote=false&min_salary=50000&limit=5")
+    assert response.status_code == 200
+    result = response.json()
+
+    matched = [job for job in jobs if not job["is_remote"] and (job["salary_min"] or 0) >= 50000]
+    assert result["total"] == len(matched)
+    assert len(result["jobs"]) == 5
+    assert _facet(result, "source") == _counts(job["source"] for job in matched)
+    assert _facet(result, "company") == _counts(job["company"] for job in matched)
+    assert _facet(result, "is_remote") == {False: len(matched)}
+    assert _facet(result, "tag") == {
+        "python": sum("Python" in job["description"] for job in matched),
+        "sql": sum("SQL" in job["description"] for job in matched),
+    }
+    assert _facet(result, "salary") == _counts(
+        next(facets.salary_bucket_label(low, high) for low, high in facets.SALARY_BUCKETS
+             if high is None or job["salary_min"] < high)
+        for job in matched
+    )
+    # Salary buckets are listed in salary order, other facets most frequent first
+    labels = [facets.salary_bucket_label(low, high) for low, high in facets.SALARY_BUCKETS]
+    assert [entry["value"] for entry in result["facets"]["salary"]] == [
+        label for label in labels if label in _facet(result, "salary")
+    ]
+    counts = [entry["count"] for entry in result["facets"]["company"]]
+    assert counts == sorted(counts, reverse=True)
+
+
+def test_search_filters(client, db):
+    """Test the JobSearch filters /jobs doesn't have: source, maximum salary, every tag and posting dates."""
+    jobs = make_jobs(30)
+    ingest_jobs(db, jobs)
+
+    result = client.get("/jobs/search?tags=python&tags=sql").json()
+    assert result["total"] == 10
+    assert all({tag["name"] for tag in job["tags"]} == {"python", "sql"} for job in result["jobs"])
+
+    result = client.get("/jobs/search?source=indeed&max_salary=80000").json()
+    assert sorted(job["title"] for job in result["jobs"]) == [f"Developer {n}" for n in (1, 3, 5, 7)]
+
+    after = (datetime.utcnow() - timedelta(days=10, hours=12)).isoformat()
+    before = (datetime.utcnow() - timedelta(days=4, hours=12)).isoformat()
+    result = client.get(f"/jobs/search?posted_after={after}&posted_before={before}").json()
+    assert sorted(job["title"] for job in result["jobs"]) == sorted(f"Developer {n}" for n in range(5, 11))
+
+
+def test_search_remote_facet_counts_null_as_false(client, db):
+    """Test jobs with an unknown is_remote are counted with the onsite ones, in one entry."""
+    jobs = make_jobs(10)
+    for job in jobs[1:4]:
+        job["is_remote"] = None
+    ingest_jobs(db, jobs)
+
+    result = client.get("/jobs/search?limit=0").json()
+    assert result["facets"]["is_remote"] == [{"value": False, "count": 8}, {"value": True, "count": 2}]
+
+
+def test_search_counts_facets_in_one_query(client, db, query_counter):
+    """Test the page, its tags and every facet take three queries however many facets there are."""
+    ingest_jobs(db, make_jobs(30))
+    query_counter.clear()
+
+    response = client.get("/jobs/search?keyword=developer&fields=summary")
+    assert response.status_code == 200
+    assert response.json()["total"] == 30
+    assert len(query_counter) == 3
+
+
+def test_search_facet_limit(client, db, monkeypatch):
+    """Test each facet keeps only its most frequent values."""
+    monkeypatch.setattr(facets, "FACET_LIMIT", 2)
+    ingest_jobs(db, make_jobs(30) + [
+        dict(job, company="Company 1", url=f"https://example.com/extra{n}", title=f"Tester {n}")
+        for n, job in enumerate(make_jobs(4))
+    ])
+
+    result = client.get("/jobs/search?limit=0").json()
+    assert result["jobs"] == []
+    assert result["total"] == 34
+    assert _facet(result, "company") == {"Company 1": 14, "Company 0": 10}
+    assert len(result["facets"]["salary"]) == 2
@@ -0,0 +1,68 @@
+from app import schemas
+from app.ingest import ingest_jobs, find_existing_urls
+
+
+def make_job(n, **overrides):
+    job_data = {
+        "title": f"Job {n}",
+        "company": "Test Company",
+        "location": "Burlington, VT",
+        "description": "Python and SQL required",
+        "url": f"https://example.com/job{n}",
+        "source": "indeed",
+        "is_remote": False,
+        "salary_min": None,
+        "salary_max": None,
+        "posted_date": None,
+    }
+    job_data.update(overrides)
+    return job_data
+
+
+def test_ingest_jobs(db):
+    """Test that a batch of jobs is stored together with its tags."""
+    jobs = [make_job(n) for n in range(5)]
+    jobs.append(make_job(5, description="React frontend"))
+
+    inserted = ingest_jobs(db, jobs)
+
+    assert inserted == 6
+    assert db.query(schemas.Job).count() == 6
+
+    # Tags are shared between jobs rather than duplicated
+    tags = {tag.name: tag for tag in db.query(schemas.Tag).all()}
+    assert set(tags) == {"python", "sql", "react", "frontend"}
+    assert db.query(schemas.JobTag).filter(schemas.JobTag.tag_id == tags["python"].id).count() == 5
+    assert db.query(schemas.JobTag).filter(schemas.JobTag.tag_id == tags["react"].id).count() == 1
+
+    # Defaults are applied to bulk-inserted rows
+    job = db.query(schemas.Job).first()
+    assert job.created_at is not None
+    assert job.is_remote is False
+
+
+def test_ingest_jobs_skips_existing_and_duplicates(db):
+    """Test that stored URLs, repeated URLs and missing URLs are skipped."""
+    ingest_jobs(db, [make_job(1)])
+
+    inserted = ingest_jobs(db, [
+        make_job(1, title="Updated title"),
+        make_job(2),
+        make_job(2, title="Same URL again"),
+        make_job(3, url=None),
+    ])
+
+    assert inserted == 1
+    assert db.query(schemas.Job).count() == 2
+    assert db.query(schemas.Job).filter(schemas.Job.url == "https://example.com/job1").one().title == "Job 1"
+    assert db.query(schemas.Job).filter(schemas.Job.url == "https://example.com/job2").one().title == "Job 2"
+
+
+def test_find_existing_urls(db):
+    """Test looking up stored URLs in chunks."""
+    ingest_jobs(db, [make_job(n) for n in range(1200)])
+
+    urls = [f"https://example.com/job{n}" for n in range(1000, 1400)]
+    existing = find_existing_urls(db, urls)
+
+    assert existing == {f"https://example.com/job{n}" for n in range(1000, 1200)}
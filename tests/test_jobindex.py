@@ -0,0 +1,119 @@
+import itertools
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import jobindex, main, schemas
+from app.cache import response_cache
+from app.ingest import ingest_jobs
+from app.jobindex import HAS_NUMPY, JobIndex
+
+pytestmark = pytest.mark.skipif(not HAS_NUMPY, reason="numpy is not installed")
+
+
+def make_jobs(count, start=0, seed=0):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    return [
+        {
+            "title": f"Developer {n}",
+            "company": f"Company {n}",
+            "location": "Vermont",
+            "description": rng.choice(["Python", "SQL", "Python and SQL", "React", ""]),
+            "url": f"https://example.com/index{n}",
+            "source": "indeed",
+            "is_remote": rng.random() < 0.3,
+            "salary_min": rng.choice([None, 45000.0, 60000.0, 80000.0]),
+            # Several jobs per day, to check ties are broken by id, and some undated
+            "posted_date": now - timedelta(days=rng.randrange(20)) if rng.random() < 0.9 else None,
+        }
+        for n in range(start, start + count)
+    ]
+
+
+@pytest.fixture
+def job_index(monkeypatch):
+    index = JobIndex(enabled=True)
+    monkeypatch.setattr(main, "job_index", index)
+    return index
+
+
+def _listing(client, index, path):
+    """The ids listed at path with the index on and off."""
+    response_cache.clear()
+    index.enabled = True
+    indexed = [job["id"] for job in client.get(path).json()]
+    response_cache.clear()
+    index.enabled = False
+    unindexed = [job["id"] for job in client.get(path).json()]
+    index.enabled = True
+    return indexed, unindexed
+
+
+@pytest.mark.parametrize("block_size", [jobindex.SCAN_BLOCK_SIZE, 16])
+def test_index_matches_sql(client, db, job_index, monkeypatch, block_size):
+    """Test every combination of indexed filters lists the same jobs, in the same order, as SQL."""
+    monkeypatch.setattr(jobindex, "SCAN_BLOCK_SIZE", block_size)
+    ingest_jobs(db, make_jobs(150))
+    job_index.load(db)
+
+    options = {
+        "is_remote": [None, "true", "false"],
+        "min_salary": [None, "60000"],
+        "tag": [None, "python", "sql", "missing"],
+        "days": [None, "7"],
+    }
+    nonempty = 0
+    for values in itertools.product(*options.values()):
+        params = "&".join(f"{name}={value}" for name, value in zip(options, values) if value is not None)
+        for page in ("skip=0&limit=200", "skip=5&limit=10"):
+            indexed, unindexed = _listing(client, job_index, f"/jobs?{params}&{page}")
+            assert indexed == unindexed, params
+            nonempty += bool(indexed)
+    assert nonempty > 60
+    assert job_index.stats()["hits"] == 96
+
+
+def test_index_excludes_unknown_remote(client, db, job_index):
+    """Test jobs with a NULL is_remote match neither is_remote filter, as in SQL."""
+    ingest_jobs(db, make_jobs(20))
+    db.query(schemas.Job).filter(schemas.Job.id <= 5).update({"is_remote": None})
+    db.commit()
+    job_index.load(db)
+
+    for value in ("true", "false"):
+        indexed, unindexed = _listing(client, job_index, f"/jobs?is_remote={value}&limit=200")
+        assert indexed == unindexed
+        assert not set(indexed) & {1, 2, 3, 4, 5}
+
+
+def test_index_refreshes_after_scrape_commit(client, db, job_index):
+    """Test jobs inserted after loading, and their tags, are added once the cache generation changes."""
+    ingest_jobs(db, make_jobs(50))
+    job_index.sync(db, response_cache.generation)
+    assert job_index.stats()["jobs"] == 50
+
+    ingest_jobs(db, make_jobs(30, start=50, seed=1))
+    job_index.sync(db, response_cache.generation)
+    assert job_index.stats()["jobs"] == 50
+
+    response_cache.bump_generation()
+    indexed, unindexed = _listing(client, job_index, "/jobs?tag=python&limit=200")
+    assert job_index.stats()["jobs"] == 80
+    assert indexed == unindexed
+    assert any(job_id > 50 for job_id in indexed)
+
+
+def test_index_falls_back_to_sql(client, db, job_index):
+    """Test filters the index doesn't hold and cursor pagination are served from SQL."""
+    ingest_jobs(db, make_jobs(20))
+    job_index.load(db)
+
+    assert client.get("/jobs?company=company%201").status_code == 200
+    assert client.get("/jobs?paginate=cursor").status_code == 200
+    assert client.get("/jobs?is_remote=false").status_code == 200
+    stats = job_index.stats()
+    assert (stats["hits"], stats["fallbacks"]) == (1, 2)
+    assert stats["memory_bytes"] > 0
+    assert client.get("/index/stats").json()["jobs"] == 20
@@ -0,0 +1,134 @@
+import asyncio
+import urllib.request
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import text
+
+from app import metrics
+from app.metrics import MetricsRegistry, StageTimer, filter_combination, registry, serve_metrics
+from app.scraper import BaseScraper, scrape_sources
+from app.scraper.indeed import IndeedScraper
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    registry.reset()
+    yield
+    registry.reset()
+
+
+def test_text_format():
+    """Test counters and histograms render in the Prometheus text format, buckets cumulative."""
+    local = MetricsRegistry(enabled=True)
+    pages = local.counter("pages_total", "Pages.", ("source",))
+    latency = local.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    pages.inc(source="indeed")
+    pages.inc(2, source='say "hi"')
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value, route="/jobs")
+
+    lines = local.render().splitlines()
+    assert "# TYPE pages_total counter" in lines
+    assert 'pages_total{source="indeed"} 1' in lines
+    assert 'pages_total{source="say \\"hi\\""} 2' in lines
+    assert 'latency_seconds_bucket{route="/jobs",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/jobs",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{route="/jobs",le="+Inf"} 3' in lines
+    assert 'latency_seconds_sum{route="/jobs"} 5.55' in lines
+    assert 'latency_seconds_count{route="/jobs"} 3' in lines
+
+
+def test_disabled_registry_records_nothing():
+    local = MetricsRegistry(enabled=False)
+    pages = local.counter("pages_total", "Pages.")
+    pages.inc()
+    assert pages.value() == 0
+
+
+def test_filter_combination():
+    assert filter_combination(b"") == "none"
+    assert filter_combination(b"tag=python&is_remote=true&limit=5&skip=10") == "is_remote,tag"
+    assert filter_combination(b"tags=a&tags=b&company=") == "tags"
+
+
+def test_metrics_endpoint(client, test_jobs):
+    """Test requests are recorded by route template, status and filter combination."""
+    client.get("/jobs?is_remote=true&limit=5")
+    client.get(f"/jobs/{test_jobs['jobs'][0].id}")
+    client.get("/jobs/999999")
+    client.get("/no-such-page")
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/jobs",status="200"} 1' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/jobs/{job_id}",status="200"} 1' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/jobs/{job_id}",status="404"} 1' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="unmatched",status="404"} 1' in body
+    assert 'jobs_filter_duration_seconds_count{route="/jobs",filters="is_remote"} 1' in body
+    assert 'route="/no-such-page"' not in body
+
+
+def test_sql_statements_are_timed(db):
+    before = metrics.db_query_duration.count(operation="select")
+    for _ in range(3):
+        db.execute(text("SELECT 1"))
+    assert metrics.db_query_duration.count(operation="select") - before == 3
+
+
+def test_scrape_stages_and_duplicates():
+    """Test a scrape records its stages, inserted jobs and skipped duplicates."""
+    class SameJobScraper(BaseScraper):
+        SOURCE_NAME = "same"
+
+        def search(self, keywords="", location="Vermont"):
+            return [{"url": "https://example.com/same", "source": "same"},
+                    {"url": "https://example.com/stored", "source": "same"}]
+
+        async def get_jobs_details(self, job_urls):
+            return {url: {"description": "Details"} for url in job_urls}
+
+    def filter_new(jobs):
+        return [job for job in jobs if job["url"] != "https://example.com/stored"]
+
+    timer = StageTimer()
+    inserted = asyncio.run(scrape_sources({"same": SameJobScraper()}, ["a", "b"], filter_new, len))
+
+    assert inserted == {"same": 1}
+    assert metrics.scraper_jobs_inserted.value(source="same") == 1
+    assert metrics.scraper_duplicates_skipped.value(source="same", reason="stored") == 2
+    assert metrics.scraper_duplicates_skipped.value(source="same", reason="claimed") == 1
+    assert metrics.scrape_stage_duration.count(stage="filter_new") == 2
+    assert metrics.scrape_stage_duration.count(stage="ingest") == 1
+    assert {"filter_new", "ingest", "total"} <= set(timer.breakdown())
+
+
+def test_scraper_pages_are_counted():
+    scraper = IndeedScraper()
+    response = MagicMock(status_code=200, text='<div id="jobDescriptionText">Python</div>')
+    response.content = response.text.encode()
+    scraper.session = MagicMock()
+    scraper.session.get.return_value = response
+
+    scraper.get_job_details("https://example.com/job")
+
+    assert metrics.scraper_pages_fetched.value(source="indeed", kind="detail") == 1
+    assert metrics.scraper_bytes_downloaded.value(source="indeed") == len(response.content)
+    assert metrics.scraper_parse_duration.count(source="indeed", kind="detail") == 1
+    assert metrics.scraper_detail_fetch_duration.count(source="indeed") == 1
+    assert metrics.scrape_stage_duration.count(stage="request") == 1
+    assert metrics.scrape_stage_duration.count(stage="rate_limit_wait") == 1
+
+
+def test_serve_metrics():
+    """Test the worker's metrics server serves the registry."""
+    metrics.scraper_jobs_inserted.inc(3, source="indeed")
+    server = serve_metrics(0, host="127.0.0.1")
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+            body = response.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert 'scraper_jobs_inserted_total{source="indeed"} 3' in body
@@ -0,0 +1,62 @@
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import inspect, text
+
+from app import schemas
+from app.database import create_db_engine
+from app.migrations import alembic_config, upgrade_database
+
+
+def _schema_differences(conn):
+    return compare_metadata(MigrationContext.configure(conn), schemas.Base.metadata)
+
+
+def _revision(conn):
+    return MigrationContext.configure(conn).get_current_revision()
+
+
+def test_migrations_match_models(tmp_path):
+    """Test running every migration on an empty database yields the models' schema."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    with engine.begin() as conn:
+        command.upgrade(alembic_config(conn), "head")
+    with engine.connect() as conn:
+        assert _schema_differences(conn) == []
+        assert _revision(conn) == "0003"
+    engine.dispose()
+
+
+def test_upgrade_new_database(tmp_path):
+    """Test a new database is created from the models and stamped with the latest revision."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    upgrade_database(engine)
+    with engine.connect() as conn:
+        assert _revision(conn) == "0003"
+        assert inspect(conn).has_table("jobs_fts")
+    engine.dispose()
+
+
+def test_upgrade_unversioned_database(tmp_path):
+    """Test a database created before migrations gets the missing columns, filled, and indexes."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE jobs (id INTEGER PRIMARY KEY, title VARCHAR, company VARCHAR, location VARCHAR, "
+            "description TEXT, salary_min FLOAT, salary_max FLOAT, url VARCHAR, posted_date DATETIME, "
+            "created_at DATETIME, updated_at DATETIME, source VARCHAR, is_remote BOOLEAN)"
+        ))
+        conn.execute(text(
+            "INSERT INTO jobs (title, company, location, url, source, is_remote) "
+            "VALUES ('Chef', 'Café Étoile', 'Burlington, VT', 'https://example.com/chef', 'vtjobs', 0)"
+        ))
+
+    upgrade_database(engine)
+    with engine.connect() as conn:
+        assert _revision(conn) == "0003"
+        row = conn.execute(text("SELECT company_lower, location_lower, canonical_id FROM jobs")).one()
+        assert row == ("café étoile", "burlington, vt", None)
+        indexes = {index["name"] for index in inspect(conn).get_indexes("jobs")}
+        assert {"ix_jobs_company_lower", "ix_jobs_salary_min", "ix_jobs_is_remote_posted_date"} <= indexes
+        assert inspect(conn).has_table("scrape_runs")
+    engine.dispose()
@@ -0,0 +1,238 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.scraper import SCRAPERS, BaseScraper, ScrapeBudget, create_scrapers, register_scraper, scrape_sources
+from app.scraper.fetchcache import fetch_metrics
+from app.scraper.http import FetchResult
+from app.scraper.base import iterate_in_thread
+
+class FakeScraper(BaseScraper):
+    """Scraper returning one listing per search after a fixed delay."""
+    
+    SOURCE_NAME = "fake"
+    
+    def __init__(self, name, delay=0.0, search_concurrency=2, fail_on=()):
+        self.name = name
+        self.delay = delay
+        self.search_concurrency = search_concurrency
+        self.fail_on = set(fail_on)
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+    
+    def search(self, keywords="", location="Vermont"):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if keywords in self.fail_on:
+                raise RuntimeError("search failed")
+            return [{"url": f"https://{self.name}.example.com/{keywords}", "source": self.name, "description": ""}]
+        finally:
+            with self._lock:
+                self.active -= 1
+    
+    async def get_jobs_details(self, job_urls):
+        return {url: {"description": f"Details for {url}"} for url in job_urls}
+
+def _run(scrapers, keywords):
+    ingested = []
+    
+    def ingest(jobs):
+        ingested.extend(jobs)
+        return len(jobs)
+    
+    inserted = asyncio.run(scrape_sources(scrapers, keywords, lambda jobs: jobs, ingest))
+    return inserted, ingested
+
+class TestScrapeSources:
+    """Tests for the multi-source scrape orchestrator"""
+    
+    def test_sources_run_concurrently(self):
+        """Test that the run takes about as long as the slowest source."""
+        scrapers = {
+            "slow": FakeScraper("slow", delay=0.2, search_concurrency=4),
+            "fast": FakeScraper("fast", delay=0.05),
+        }
+        keywords = ["a", "b", "c", "d"]
+        
+        start = time.perf_counter()
+        inserted, ingested = _run(scrapers, keywords)
+        elapsed = time.perf_counter() - start
+        
+        assert inserted == {"slow": 4, "fast": 4}
+        assert len(ingested) == 8
+        assert all(job["description"].startswith("Details for") for job in ingested)
+        # Run sequentially, the searches take 4 * 0.2 + 4 * 0.05 = 1.0 s
+        assert elapsed < 0.6
+    
+    def test_per_source_concurrency_limit(self):
+        """Test that a source never runs more searches than its limit."""
+        scraper = FakeScraper("limited", delay=0.05, search_concurrency=2)
+        _run({"limited": scraper}, ["a", "b", "c", "d", "e", "f"])
+        assert scraper.max_active == 2
+    
+    def test_failing_search_is_isolated(self):
+        """Test that one failing search doesn't stop the others."""
+        scrapers = {"flaky": FakeScraper("flaky", fail_on={"b"}), "ok": FakeScraper("ok")}
+        inserted, _ = _run(scrapers, ["a", "b"])
+        assert inserted == {"flaky": 1, "ok": 2}
+
+def test_batches_ingested_while_search_streams():
+    """Test that listings are ingested before a multi-page search finishes."""
+    events = []
+    
+    class PagedScraper(FakeScraper):
+        def iter_search(self, keywords="", location="Vermont", max_pages=None, max_results=None):
+            for page in range(3):
+                time.sleep(0.05)
+                events.append(f"page {page}")
+                for n in range(10):
+                    yield {"url": f"https://example.com/{page}/{n}", "source": self.name, "description": ""}
+    
+    def ingest(jobs):
+        events.append(f"ingest {len(jobs)}")
+        return len(jobs)
+    
+    inserted = asyncio.run(scrape_sources({"paged": PagedScraper("paged")}, ["a"], lambda jobs: jobs, ingest,
+                                          batch_size=10))
+    assert inserted == {"paged": 30}
+    assert events.index("ingest 10") < events.index("page 2")
+
+def test_budget_stops_run():
+    """Test that a run stops fetching once its request budget is spent."""
+    pages = []
+    
+    class PagedScraper(FakeScraper):
+        PAGE_SIZE = 10
+        
+        def iter_search(self, keywords="", location="Vermont", max_pages=None, max_results=None):
+            for page in range(20):
+                pages.append(page)
+                for n in range(10):
+                    yield {"url": f"https://example.com/{keywords}/{page}/{n}", "source": self.name, "description": ""}
+    
+    budget = ScrapeBudget(max_requests=25)
+    inserted = asyncio.run(scrape_sources({"paged": PagedScraper("paged", search_concurrency=1)}, ["a", "b"],
+                                          lambda jobs: jobs, lambda jobs: len(jobs), batch_size=10, budget=budget))
+    
+    # Each batch of 10 costs a results page and 10 detail pages
+    assert budget.exhausted
+    assert inserted == {"paged": 30}
+    assert budget.requests == 33
+    assert len(pages) < 20
+
+def test_on_error_reports_failed_searches():
+    """Test that failed searches are reported to the on_error callback."""
+    errors = []
+    asyncio.run(scrape_sources({"flaky": FakeScraper("flaky", fail_on={"b"})}, ["a", "b"],
+                               lambda jobs: jobs, lambda jobs: len(jobs),
+                               on_error=lambda name, keyword, e: errors.append((name, keyword))))
+    assert errors == [("flaky", "b")]
+
+def test_scraper_registry():
+    """Test registering and creating scrapers by source name."""
+    assert "indeed" in SCRAPERS
+    
+    @register_scraper
+    class RegisteredScraper(BaseScraper):
+        SOURCE_NAME = "registered"
+        
+        def search(self, keywords="", location="Vermont"):
+            return []
+    
+    try:
+        scrapers = create_scrapers(["registered", " indeed "])
+        assert isinstance(scrapers["registered"], RegisteredScraper)
+        assert set(scrapers) == {"registered", "indeed"}
+        
+        with pytest.raises(ValueError):
+            create_scrapers(["missing"])
+    finally:
+        del SCRAPERS["registered"]
+
+def test_duplicate_listings_fetched_once():
+    """Test that a job found by several keywords is only fetched and ingested once."""
+    class SameJobScraper(FakeScraper):
+        def search(self, keywords="", location="Vermont"):
+            return [{"url": "https://example.com/same-job", "source": self.name, "description": ""}]
+    
+    scraper = SameJobScraper("same")
+    fetched = []
+    
+    async def get_jobs_details(job_urls):
+        urls = list(job_urls)
+        fetched.extend(urls)
+        return {url: {"description": "Details"} for url in urls}
+    
+    scraper.get_jobs_details = get_jobs_details
+    before = fetch_metrics.snapshot()["duplicate_details_skipped"]
+    inserted, ingested = _run({"same": scraper}, ["a", "b", "c"])
+    
+    assert fetched == ["https://example.com/same-job"]
+    assert inserted == {"same": 1}
+    assert fetch_metrics.snapshot()["duplicate_details_skipped"] - before == 2
+
+def test_failed_details_are_not_ingested():
+    """Test that listings whose details failed are left for a later search."""
+    attempts = []
+    
+    async def get_jobs_details(job_urls):
+        urls = list(job_urls)
+        attempts.extend(urls)
+        if len(attempts) == 1:
+            return {url: FetchResult(url, 503, None, error="HTTP 503") for url in urls}
+        return {url: {"description": "Details"} for url in urls}
+    
+    class SameJobScraper(FakeScraper):
+        def search(self, keywords="", location="Vermont"):
+            return [{"url": "https://example.com/flaky-job", "source": self.name, "description": ""}]
+    
+    scraper = SameJobScraper("flaky", search_concurrency=1)
+    scraper.get_jobs_details = get_jobs_details
+    before = fetch_metrics.snapshot()["details_failed"]
+    inserted, ingested = _run({"flaky": scraper}, ["a", "b"])
+    
+    # The first search's fetch failed, so the second search fetched the job again
+    assert attempts == ["https://example.com/flaky-job"] * 2
+    assert inserted == {"flaky": 1}
+    assert ingested[0]["description"] == "Details"
+    assert fetch_metrics.snapshot()["details_failed"] - before == 1
+
+class TestIterateInThread:
+    """Tests for streaming a blocking iterator into async code"""
+    
+    def test_backpressure_and_early_exit(self):
+        """Test that the producer stays within the buffer and stops when the consumer does."""
+        produced = []
+        
+        def numbers():
+            for n in range(1000):
+                produced.append(n)
+                yield n
+        
+        async def consume():
+            items = []
+            async for item in iterate_in_thread(numbers(), buffer=5):
+                items.append(item)
+                await asyncio.sleep(0.01)
+                if len(items) == 3:
+                    break
+            return items
+        
+        assert asyncio.run(consume()) == [0, 1, 2]
+        assert len(produced) <= 3 + 5 + 1
+    
+    def test_errors_propagate(self):
+        """Test that an exception in the iterator reaches the consumer."""
+        def failing():
+            yield 1
+            raise RuntimeError("page failed")
+        
+        async def consume():
+            return [item async for item in iterate_in_thread(failing())]
+        
+        with pytest.raises(RuntimeError, match="page failed"):
+            asyncio.run(consume())
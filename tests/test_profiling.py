@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import deque
+
+from app.cache import response_cache
+from app.profiling import StackSampler
+
+
+def test_requested_profile(client, test_jobs, profiler):
+    """Test a request sent with X-Profile: 1 is profiled with its SQL statements and kept."""
+    response = client.get("/jobs?tag=python&is_remote=false", headers={"X-Profile": "1"})
+    assert response.status_code == 200
+    profile_id = int(response.headers["x-profile-id"])
+
+    summaries = client.get("/profiles").json()
+    assert [summary["id"] for summary in summaries] == [profile_id]
+    assert summaries[0]["query"] == "tag=python&is_remote=false"
+
+    profile = client.get(f"/profiles/{profile_id}").json()
+    assert profile["path"] == "/jobs"
+    assert profile["status"] == 200
+    assert profile["requested"]
+    assert profile["sql_count"] == len(profile["statements"]) > 0
+    assert any("FROM jobs" in statement["statement"] for statement in profile["statements"])
+    assert all(statement["duration_ms"] >= 0 for statement in profile["statements"])
+    assert profile["call_tree"].split()[1] == "samples,"
+
+
+def test_profile_query_parameter_bypasses_cache(client, test_jobs, profiler):
+    """Test ?profile=1 profiles the request and runs its queries even when the response is cached."""
+    client.get("/stats")
+    assert response_cache.stats()["size"] == 1
+
+    response = client.get("/stats?profile=1")
+    profile = client.get(f"/profiles/{response.headers['x-profile-id']}").json()
+    assert profile["path"] == "/stats"
+    assert profile["sql_count"] > 0
+
+
+def test_sampled_profiles_kept_when_slow(client, test_jobs, profiler):
+    profiler.sample_rate = 1.0
+    profiler.slow_ms = 60000
+    response = client.get("/jobs")
+    assert "x-profile-id" not in response.headers
+    assert client.get("/profiles").json() == []
+
+    profiler.slow_ms = 0
+    client.get("/jobs?min_salary=50000")
+    summaries = client.get("/profiles").json()
+    assert len(summaries) == 1
+    assert not summaries[0]["requested"]
+    assert summaries[0]["query"] == "min_salary=50000"
+
+
+def test_ring_buffer_keeps_latest(client, test_jobs, profiler, monkeypatch):
+    monkeypatch.setattr(profiler, "_profiles", deque(maxlen=2))
+    ids = [int(client.get("/tags", headers={"X-Profile": "1"}).headers["x-profile-id"]) for _ in range(3)]
+
+    assert [summary["id"] for summary in client.get("/profiles").json()] == ids[:0:-1]
+    assert client.get(f"/profiles/{ids[0]}").status_code == 404
+
+
+def test_disabled_by_default(client, test_jobs):
+    response = client.get("/jobs?profile=1", headers={"X-Profile": "1"})
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+    assert client.get("/profiles").json() == []
+
+
+def test_stack_sampler_builds_call_tree():
+    """Test sampled stacks are merged into a tree weighted by time, callers above callees."""
+    def spin(seconds):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            pass
+
+    def outer():
+        spin(0.1)
+
+    sampler = StackSampler(threading.get_ident(), interval=0.001)
+    sampler.start()
+    outer()
+    sampler.stop()
+
+    lines = sampler.render().splitlines()
+    assert sampler.samples > 5
+    outer_line = next(line for line in lines if line.endswith("(outer)"))
+    spin_line = next(line for line in lines if line.endswith("(spin)"))
+    assert lines.index(outer_line) < lines.index(spin_line)
+    assert len(spin_line) - len(spin_line.lstrip()) > len(outer_line) - len(outer_line.lstrip())
+    assert float(outer_line.split()[0]) > 50
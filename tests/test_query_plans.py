@@ -0,0 +1,73 @@
+"""Query plans of the /jobs filters, checked with SQLite's EXPLAIN QUERY PLAN.
+
+Every combination of filters, in both pagination modes, must be served by
+indexes: a plan step scanning a whole table fails the test.
+
+A plan may also sort the matches before returning a page, which for a
+filter matching many jobs costs far more than walking them in date order.
+"""
+import itertools
+import re
+from urllib.parse import urlencode
+
+import pytest
+
+FILTERS = {
+    "keyword": "python",
+    "company": "tech",
+    "location": "burl",
+    "is_remote": "true",
+    "min_salary": "75000",
+    "tag": "python",
+    "days": "7",
+}
+
+# A plan step reading every row of a table, rather than seeking into an index
+# ("SEARCH ...") or walking one in order ("SCAN ... USING INDEX ...")
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+# Sorting every match; "FOR RIGHT PART OF ORDER BY" only sorts jobs posted at the same time
+FULL_SORT = "USE TEMP B-TREE FOR ORDER BY"
+
+
+def _full_scans(plans):
+    return [(statement, step) for statement, steps in plans for step in steps if FULL_SCAN.match(step)]
+
+
+def test_filter_combinations_use_indexes(client, test_jobs, query_plans):
+    """Test no combination of /jobs filters scans a whole table."""
+    for size in range(len(FILTERS) + 1):
+        for names in itertools.combinations(FILTERS, size):
+            for paginate in ("offset", "cursor"):
+                params = dict({name: FILTERS[name] for name in names}, paginate=paginate)
+                response = client.get(f"/jobs?{urlencode(params)}")
+                assert response.status_code == 200
+    failures = {f"{step}: {' '.join(statement.split())}" for statement, step in _full_scans(query_plans())}
+    assert not failures, "\n".join(sorted(set(failures)))
+
+
+@pytest.mark.parametrize("params, index", [
+    ({}, "ix_jobs_posted_date_id"),
+    ({"company": "tech"}, "ix_jobs_posted_date_id"),
+    ({"location": "burl"}, "ix_jobs_posted_date_id"),
+    ({"company_prefix": "tech"}, "ix_jobs_company_lower"),
+    ({"location_prefix": "burl"}, "ix_jobs_location_lower"),
+    ({"is_remote": "true"}, "ix_jobs_is_remote_posted_date"),
+    ({"tag": "python"}, "ix_job_tags_tag_id_job_id"),
+    ({"days": "7", "paginate": "cursor"}, "ix_jobs_posted_date_id"),
+])
+def test_filter_uses_index(client, test_jobs, query_plans, params, index):
+    """Test each filter is served by the index designed for it."""
+    client.get(f"/jobs?{urlencode(params)}")
+    steps = [step for _, steps in query_plans() for step in steps]
+    assert any(index in step for step in steps), steps
+
+
+@pytest.mark.parametrize("paginate", ["offset", "cursor"])
+def test_common_location_walks_date_order(client, test_jobs, query_plans, paginate):
+    """Test a location filter, which may match most jobs, walks them newest first instead of sorting them."""
+    client.get(f"/jobs?location=vt&paginate={paginate}")
+    # The page query; loading the page's tags sorts them by name
+    steps = next(steps for statement, steps in query_plans() if "LIMIT" in statement)
+    assert any("ix_jobs_posted_date_id" in step for step in steps), steps
+    assert FULL_SORT not in steps, steps
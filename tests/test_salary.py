@@ -0,0 +1,69 @@
+import pytest
+
+from app import schemas
+from app.ingest import ingest_jobs
+from app.salary import Salary, backfill_salaries, parse_salaries, parse_salary
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("$50,000 - $70,000 a year", (50000, 70000, "year")),
+    ("$80K", (80000, 80000, "year")),
+    ("$80K - $100K", (80000, 100000, "year")),
+    ("$80-100K/yr", (80000, 100000, "year")),
+    ("$20 - $25 an hour", (20 * 2080, 25 * 2080, "hour")),
+    ("Pay: $22.50 per hour", (22.5 * 2080, 22.5 * 2080, "hour")),
+    ("$200 a day", (200 * 260, 200 * 260, "day")),
+    ("$1,200 per week", (1200 * 52, 1200 * 52, "week")),
+    ("$3,000 bi-weekly", (3000 * 26, 3000 * 26, "biweek")),
+    ("$4,000 - $5,000 a month", (48000, 60000, "month")),
+    ("50,000 to 70,000 per year", (50000, 70000, "year")),
+    ("$18", (18 * 2080, 18 * 2080, "hour")),
+    ("80k to $100k", (80000, 100000, "year")),
+    ("401k match, $55,000 a year", (55000, 55000, "year")),
+])
+def test_parse_salary(text, expected):
+    """Test parsing salaries quoted per period, as ranges and with K suffixes."""
+    assert parse_salary(text) == Salary(*expected)
+
+
+@pytest.mark.parametrize("text", [None, "", "Competitive salary", "Full-time, 40 hours", "$5,000",
+                                  "80K", "401k match"])
+def test_parse_salary_without_salary(text):
+    """Test text without an unambiguous salary isn't parsed."""
+    assert parse_salary(text) is None
+
+
+def test_parse_salaries():
+    """Test batch parsing keeps the order of the texts."""
+    texts = ["$80K", None, "$25 an hour", "$80K"]
+    assert parse_salaries(texts) == [parse_salary(text) for text in texts]
+
+
+def test_ingest_parses_salary_text(client, db):
+    """Test ingested salary text is parsed, so the min_salary filter covers it."""
+    ingest_jobs(db, [
+        {"title": "Nurse", "company": "UVM", "location": "Burlington, VT", "description": "Care",
+         "url": "https://example.com/nurse", "source": "vtjobs", "salary_text": "$45 an hour"},
+        {"title": "Clerk", "company": "Town", "location": "Barre, VT", "description": "Records",
+         "url": "https://example.com/clerk", "source": "vtjobs", "salary_text": "$3,000 a month"},
+    ])
+
+    jobs = client.get("/jobs?min_salary=80000").json()
+    assert [job["title"] for job in jobs] == ["Nurse"]
+    assert jobs[0]["salary_min"] == 45 * 2080
+    assert jobs[0]["salary_text"] == "$45 an hour"
+
+
+def test_backfill_salaries(db):
+    """Test stored salary text is parsed in batches, leaving parsed salaries alone."""
+    for n, (text, salary_min) in enumerate([("$80K", None), ("$25 an hour", None), ("$90K", 1.0), ("DOE", None)]):
+        db.add(schemas.Job(title=f"Job {n}", company="Acme", location="VT", description="",
+                           url=f"https://example.com/{n}", source="indeed", salary_text=text, salary_min=salary_min))
+    db.commit()
+
+    assert backfill_salaries(db, batch_size=2) == 2
+    salaries = [job.salary_min for job in db.query(schemas.Job).order_by(schemas.Job.id)]
+    assert salaries == [80000, 52000, 1.0, None]
+
+    assert backfill_salaries(db, batch_size=2, reparse=True) == 1
+    assert db.query(schemas.Job).filter(schemas.Job.salary_text == "$90K").one().salary_max == 90000
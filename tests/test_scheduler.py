@@ -0,0 +1,91 @@
+import asyncio
+import random
+import pytest
+from app.scheduler import Schedule, Scheduler, load_schedules
+
+
+def _scheduler(schedules, job, **kwargs):
+    return Scheduler(schedules, job, rng=random.Random(0), **kwargs)
+
+
+async def _noop(schedule, budget):
+    pass
+
+
+def test_delays_are_jittered():
+    """Test that delays vary within the jitter around the interval."""
+    schedule = Schedule("indeed", ["python"], interval=100, jitter=0.2)
+    scheduler = _scheduler([schedule], _noop)
+    
+    delays = [scheduler.next_delay(schedule) for _ in range(50)]
+    assert all(80 <= delay <= 120 for delay in delays)
+    assert len(set(delays)) > 1
+    assert all(0 <= scheduler.initial_delay(schedule) <= 20 for _ in range(50))
+
+
+def test_failures_back_off():
+    """Test that the delay doubles after each failure up to max_backoff."""
+    schedule = Schedule("indeed", ["python"], interval=100, jitter=0)
+    scheduler = _scheduler([schedule], _noop, max_backoff=500)
+    
+    assert [scheduler.next_delay(schedule, failures) for failures in range(5)] == [100, 200, 400, 500, 500]
+
+
+def test_run_once_counts_failures():
+    """Test that failures accumulate and a success resets them."""
+    outcomes = [RuntimeError("down"), RuntimeError("down"), None]
+    budgets = []
+    
+    async def job(schedule, budget):
+        budgets.append(budget)
+        error = outcomes.pop(0)
+        if error:
+            raise error
+    
+    schedule = Schedule("indeed", ["python"], interval=100, max_requests=50)
+    scheduler = _scheduler([schedule], job)
+    
+    async def run():
+        failures = 0
+        history = []
+        for _ in range(3):
+            failures = await scheduler.run_once(schedule, failures)
+            history.append(failures)
+        return history
+    
+    assert asyncio.run(run()) == [1, 2, 0]
+    assert all(budget.max_requests == 50 for budget in budgets)
+    assert len({id(budget) for budget in budgets}) == 3
+
+
+def test_schedules_run_independently():
+    """Test that each schedule repeats on its own interval."""
+    runs = []
+    
+    async def job(schedule, budget):
+        runs.append(schedule.source)
+    
+    schedules = [Schedule("fast", [], interval=0.02, jitter=0), Schedule("slow", [], interval=10, jitter=0)]
+    scheduler = _scheduler(schedules, job)
+    
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(scheduler.run(), timeout=0.15)
+    
+    asyncio.run(run())
+    assert runs.count("fast") >= 3
+    assert runs.count("slow") == 1
+    assert scheduler.state["fast"].failures == 0
+
+
+def test_load_schedules(monkeypatch):
+    """Test per-source overrides of the schedule settings."""
+    monkeypatch.setenv("SCRAPE_INTERVAL", "3600")
+    monkeypatch.setenv("SCRAPE_INTERVAL_VTJOBS", "600")
+    monkeypatch.setenv("SCRAPE_KEYWORDS_VTJOBS", "nurse, teacher")
+    monkeypatch.setenv("SCRAPE_MAX_REQUESTS", "200")
+    
+    indeed, vtjobs = load_schedules(["indeed", "vtjobs"], ["engineer"])
+    assert (indeed.interval, indeed.keywords, indeed.max_requests) == (3600, ["engineer"], 200)
+    assert (vtjobs.interval, vtjobs.keywords) == (600, ["nurse", "teacher"])
+    assert vtjobs.max_seconds is None
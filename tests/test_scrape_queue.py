@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+from app import schemas
+from app.scrape_queue import claim_next_run, enqueue_scrape, fail_stale_runs, finish_run, record_progress, start_run
+
+
+def test_enqueue_coalesces_queued_runs(db):
+    """Test that triggers made while a run is queued join that run."""
+    run, created = enqueue_scrape(db)
+    again, created_again = enqueue_scrape(db)
+    
+    assert created and not created_again
+    assert again.id == run.id
+    assert again.triggers == 2
+    assert db.query(schemas.ScrapeRun).count() == 1
+
+
+def test_claim_is_single_flight(db):
+    """Test that a second run isn't started while one is running."""
+    first, _ = enqueue_scrape(db)
+    claimed = claim_next_run(db, "worker-1")
+    assert claimed.id == first.id
+    assert claimed.status == "running"
+    assert claimed.worker == "worker-1"
+    
+    # A new trigger queues a run, which waits for the running one
+    second, created = enqueue_scrape(db)
+    assert created and second.id != first.id
+    assert claim_next_run(db, "worker-2") is None
+    
+    finish_run(db, first.id)
+    assert claim_next_run(db, "worker-2").id == second.id
+
+
+def test_start_run_is_single_flight(db):
+    """Test that a run started outside the queue waits for no one and blocks other starts."""
+    run = start_run(db, "scheduler")
+    assert run.status == "running" and run.heartbeat_at is not None
+    assert start_run(db, "scheduler") is None
+    
+    # A run queued meanwhile isn't claimed until the started one finishes
+    enqueue_scrape(db)
+    assert claim_next_run(db, "worker-1") is None
+    finish_run(db, run.id)
+    assert start_run(db, "scheduler") is None
+    assert claim_next_run(db, "worker-1") is not None
+
+
+def test_claim_empty_queue(db):
+    """Test that claiming from an empty queue returns None."""
+    assert claim_next_run(db, "worker-1") is None
+
+
+def test_fail_stale_runs(db):
+    """Test that runs without a recent heartbeat are failed so the queue moves on."""
+    enqueue_scrape(db)
+    run = claim_next_run(db, "worker-1")
+    record_progress(db, run.id, found=3, inserted=2)
+    assert fail_stale_runs(db, timeout=60) == 0
+    
+    run.heartbeat_at = datetime.utcnow() - timedelta(hours=2)
+    db.commit()
+    assert fail_stale_runs(db, timeout=60) == 1
+    
+    db.refresh(run)
+    assert run.status == "failed"
+    assert run.jobs_inserted == 2
+
+
+def test_scrape_endpoints(client, db):
+    """Test queuing a scrape through the API and reading its status."""
+    response = client.post("/jobs/scrape")
+    assert response.status_code == 202
+    data = response.json()
+    assert data["status"] == "queued"
+    assert data["coalesced"] is False
+    
+    response = client.post("/jobs/scrape")
+    assert response.json()["run_id"] == data["run_id"]
+    assert response.json()["coalesced"] is True
+    
+    claim_next_run(db, "worker-1")
+    record_progress(db, data["run_id"], found=4, inserted=4)
+    
+    response = client.get(f"/jobs/scrape/{data['run_id']}")
+    assert response.status_code == 200
+    run = response.json()
+    assert run["status"] == "running"
+    assert run["triggers"] == 2
+    assert run["jobs_inserted"] == 4
+    assert run["elapsed_seconds"] is not None
+    
+    assert client.get("/jobs/scrape/999").status_code == 404
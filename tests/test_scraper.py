@@ -1,6 +1,18 @@
+import asyncio
+import threading
+import time
 import pytest
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import aiohttp
+import requests
+from aiohttp import web
 from unittest.mock import patch, MagicMock
-from app.scraper.indeed import IndeedScraper
+from app.scraper.indeed import IndeedScraper, AsyncIndeedScraper
+from app.scraper.fetchcache import FetchCache, FetchMetrics
+from app.scraper.http import CircuitBreaker, CircuitOpenError, FetchResult, HttpClient, RetryPolicy, retry_after_seconds
+from app.scraper.parsing import available_backends, resolve_backend
+from app.scraper.ratelimit import HostRateLimiter, TokenBucket
 
 class TestIndeedScraper:
     """Tests for the Indeed job scraper."""
@@ -114,4 +126,416 @@ class TestIndeedScraper:
         mock_session_instance.get.assert_called_once_with("https://example.com/job")
         
         # Verify results (basic check since exact parsing depends on BeautifulSoup)
-        assert "description" in details
\ No newline at end of file
+        assert "description" in details
+
+async def _serve_job_pages(handler, coro):
+    """Run ``coro(base_url)`` against a local aiohttp server using ``handler``."""
+    server_app = web.Application()
+    server_app.router.add_get("/viewjob", handler)
+    runner = web.AppRunner(server_app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        return await coro(f"http://127.0.0.1:{port}")
+    finally:
+        await runner.cleanup()
+
+
+class TestAsyncIndeedScraper:
+    """Tests for the concurrent Indeed detail fetcher."""
+    
+    def test_get_jobs_details(self):
+        """Test that detail pages are fetched concurrently and parsed."""
+        in_flight = 0
+        max_in_flight = 0
+        
+        async def handler(request):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            if request.query["jk"] == "missing":
+                return web.Response(status=404)
+            return web.Response(
+                text=f'<div id="jobDescriptionText">Job {request.query["jk"]}</div>',
+                content_type="text/html",
+            )
+        
+        scraper = AsyncIndeedScraper(concurrency=4, rate=1000)
+        
+        async def fetch(base_url):
+            urls = [f"{base_url}/viewjob?jk={i}" for i in range(8)] + [f"{base_url}/viewjob?jk=missing"]
+            return urls, await scraper.get_jobs_details(urls)
+        
+        urls, details = asyncio.run(_serve_job_pages(handler, fetch))
+        
+        assert len(details) == 9
+        assert details[urls[3]] == {"description": "Job 3"}
+        assert isinstance(details[urls[-1]], FetchResult)
+        assert details[urls[-1]].status == 404
+        assert 1 < max_in_flight <= 4
+    
+    def test_token_bucket_rate(self):
+        """Test that the token bucket spaces out requests beyond the burst."""
+        bucket = TokenBucket(rate=20, capacity=1)
+        
+        async def take(n):
+            for _ in range(n):
+                await bucket.acquire()
+        
+        start = time.monotonic()
+        asyncio.run(take(5))
+        elapsed = time.monotonic() - start
+        
+        # One token is available immediately, the other four arrive at 20/s
+        assert 0.15 <= elapsed < 0.5
+
+SEARCH_PAGE = """
+<div class="job_seen_beacon" data-jk="abc123">
+    <h2 class="jobTitle"><span>Python Developer</span></h2>
+    <span class="companyName">TechCorp</span>
+    <div class="companyLocation">Burlington, VT</div>
+    <span class="date">2 days ago</span>
+</div>
+"""
+
+class _FakeIndeedHandler(BaseHTTPRequestHandler):
+    """Serves ``body``, honoring If-None-Match when ``use_etag`` is set."""
+    use_etag = True
+    body = SEARCH_PAGE
+    requests = []
+    
+    def do_GET(self):
+        self.requests.append(dict(self.headers))
+        if self.use_etag and self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = self.body.encode()
+        self.send_response(200)
+        if self.use_etag:
+            self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def fake_indeed():
+    _FakeIndeedHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeIndeedHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/jobs"
+    server.shutdown()
+    server.server_close()
+
+class TestFetchCache:
+    """Tests for conditional requests through the fetch cache"""
+    
+    def _scraper(self, base_url, cache):
+        scraper = IndeedScraper(fetch_cache=cache)
+        scraper.BASE_URL = base_url
+        return scraper
+    
+    def test_cache_directory_is_created(self, tmp_path):
+        """Test that the cache file's directory is created, as the default lives in a per-user cache directory."""
+        cache = FetchCache(str(tmp_path / "cache" / "vermont-jobs" / "fetch.db"))
+        assert (tmp_path / "cache" / "vermont-jobs" / "fetch.db").exists()
+        assert cache.get("https://example.com") is None
+    
+    @pytest.mark.parametrize("use_etag", [True, False])
+    def test_unchanged_page_is_not_parsed_again(self, fake_indeed, tmp_path, monkeypatch, use_etag):
+        """Test that a 304 or an identical body reuses the cached listings."""
+        monkeypatch.setattr(_FakeIndeedHandler, "use_etag", use_etag)
+        metrics = FetchMetrics()
+        cache = FetchCache(str(tmp_path / "fetch.db"), metrics=metrics)
+        first = self._scraper(fake_indeed, cache).search("python")
+        
+        # A new scraper on the same cache file, as in the next scrape run
+        cache = FetchCache(str(tmp_path / "fetch.db"), metrics=metrics)
+        scraper = self._scraper(fake_indeed, cache)
+        with patch.object(scraper, "_parse_search_results", wraps=scraper._parse_search_results) as parse:
+            second = scraper.search("python")
+        
+        assert second == first
+        assert first[0]["url"] == "https://www.indeed.com/viewjob?jk=abc123"
+        assert isinstance(second[0]["posted_date"], datetime)
+        parse.assert_not_called()
+        
+        counts = metrics.snapshot()
+        assert counts["requests"] == 2
+        assert counts["parses"] == 1
+        assert counts["parses_avoided"] == 1
+        if use_etag:
+            assert _FakeIndeedHandler.requests[1]["If-None-Match"] == '"v1"'
+            assert counts["not_modified"] == 1
+            assert counts["bytes_saved"] == len(SEARCH_PAGE.encode())
+        else:
+            assert counts["unchanged"] == 1
+            assert counts["bytes_saved"] == 0
+    
+    def test_changed_page_is_parsed(self, fake_indeed, monkeypatch):
+        """Test that a changed body replaces the cached listings."""
+        monkeypatch.setattr(_FakeIndeedHandler, "use_etag", False)
+        metrics = FetchMetrics()
+        scraper = self._scraper(fake_indeed, FetchCache(metrics=metrics))
+        assert scraper.search("python")[0]["title"] == "Python Developer"
+        
+        monkeypatch.setattr(_FakeIndeedHandler, "body", SEARCH_PAGE.replace("Python", "Rust"))
+        assert scraper.search("python")[0]["title"] == "Rust Developer"
+        assert metrics.snapshot()["parses"] == 2
+
+RESULTS_PAGE = """
+<html><head><script>var jobs = '<div class="job_seen_beacon">';</script></head><body>
+<nav><div class="job_seen_beacon_nav">Menu</div></nav>
+<div class="cardOutline job_seen_beacon" data-jk="job1">
+    <h2 class="jobTitle"><span>Python Developer</span></h2>
+    <span class="companyName">TechCorp</span>
+    <div class="companyLocation">Remote in Burlington, VT</div>
+    <span class="salary-snippet">$70,000 - $90,000 a year</span>
+</div>
+<div class="job_seen_beacon" data-jk="job2">
+    <h2 class="jobTitle"><span>Data Analyst</span></h2>
+    <span class="companyName">DataVT</span>
+    <div class="companyLocation">Montpelier, VT</div>
+</div>
+</body></html>
+"""
+
+class TestPageParser:
+    """Tests for the selectable HTML parser backends"""
+    
+    @pytest.mark.parametrize("backend", available_backends())
+    def test_backends_agree(self, backend):
+        """Test that every installed backend extracts the same listings and details."""
+        scraper = IndeedScraper(parser=backend)
+        jobs = scraper._parse_search_results(RESULTS_PAGE)
+        
+        assert [job["url"] for job in jobs] == [
+            "https://www.indeed.com/viewjob?jk=job1",
+            "https://www.indeed.com/viewjob?jk=job2",
+        ]
+        assert [job["title"] for job in jobs] == ["Python Developer", "Data Analyst"]
+        assert jobs[0]["is_remote"] is True
+        assert jobs[0]["salary_min"] == 70000.0
+        assert jobs[1]["salary_min"] is None
+        
+        details = scraper._parse_job_details(
+            '<html><body><div id="header">x</div><div id="jobDescriptionText"> Python and SQL </div></body></html>'
+        )
+        assert details == {"description": "Python and SQL"}
+    
+    def test_resolve_backend(self):
+        """Test backend selection and validation."""
+        assert resolve_backend() == available_backends()[0]
+        assert resolve_backend("html.parser") == "html.parser"
+        with pytest.raises(ValueError):
+            resolve_backend("regex")
+
+def _results_page(start, count):
+    return "".join(
+        f'<div class="job_seen_beacon" data-jk="job{n}"><h2 class="jobTitle"><span>Job {n}</span></h2></div>'
+        for n in range(start, start + count)
+    )
+
+class TestIterSearch:
+    """Tests for lazily paginated searches"""
+    
+    def _scraper(self, total, **kwargs):
+        """Scraper whose session serves ``total`` listings, 10 per page, repeating the last page."""
+        scraper = IndeedScraper(http=HttpClient(rate=1000), **kwargs)
+        
+        def get(url, params=None, **_):
+            start = min((params or {}).get("start", 0), (total - 1) // 10 * 10)
+            response = MagicMock()
+            response.text = _results_page(start, min(10, total - start))
+            return response
+        
+        scraper.session = MagicMock()
+        scraper.session.get.side_effect = get
+        return scraper
+    
+    def test_follows_pages_until_repeated(self):
+        """Test that pages are followed with start= until the results repeat."""
+        scraper = self._scraper(25, max_pages=None)
+        jobs = list(scraper.iter_search("python"))
+        
+        assert [job["title"] for job in jobs] == [f"Job {n}" for n in range(25)]
+        starts = [call.kwargs["params"].get("start") for call in scraper.session.get.call_args_list]
+        assert starts == [None, 10, 20, 30]
+    
+    def test_limits(self):
+        """Test the page and result limits."""
+        assert len(list(self._scraper(100, max_pages=3).iter_search())) == 30
+        assert len(list(self._scraper(100, max_pages=None).iter_search(max_results=15))) == 15
+        assert len(self._scraper(100).search()) == 10
+    
+    def test_pages_are_fetched_lazily(self):
+        """Test that the next page is only requested once the previous one is consumed."""
+        scraper = self._scraper(100, max_pages=None)
+        listings = scraper.iter_search()
+        for _ in range(10):
+            next(listings)
+        assert scraper.session.get.call_count == 1
+        next(listings)
+        assert scraper.session.get.call_count == 2
+    
+    def test_aiter_search(self):
+        """Test the async iterator yields the same listings."""
+        scraper = self._scraper(25, max_pages=None)
+        
+        async def collect():
+            return [job async for job in scraper.aiter_search("python")]
+        
+        jobs = asyncio.run(collect())
+        assert [job["title"] for job in jobs] == [f"Job {n}" for n in range(25)]
+
+
+def _response(status, headers=None):
+    response = MagicMock()
+    response.status_code = status
+    response.headers = headers or {}
+    return response
+
+def _client(**kwargs):
+    return HttpClient(rate=1000, retry=RetryPolicy(max_retries=3, base_delay=0.01), metrics=FetchMetrics(), **kwargs)
+
+class TestHttpClient:
+    """Tests for retries, rate adaptation and the circuit breaker"""
+    
+    def test_retries_server_errors(self):
+        """Test that 5xx responses are retried until one succeeds."""
+        client = _client()
+        session = MagicMock()
+        session.get.side_effect = [_response(503), _response(502), _response(200)]
+        
+        assert client.get(session, "https://example.com/jobs").status_code == 200
+        assert session.get.call_count == 3
+        assert client.metrics.snapshot()["retries"] == 2
+        assert client.breaker.failures == 0
+    
+    def test_not_found_is_not_retried(self):
+        """Test that client errors other than 429 are returned without retrying."""
+        client = _client()
+        session = MagicMock()
+        session.get.return_value = _response(404)
+        
+        assert client.get(session, "https://example.com/jobs").status_code == 404
+        assert session.get.call_count == 1
+    
+    def test_retry_after_is_honored(self):
+        """Test that a 429 waits for Retry-After and slows the host down."""
+        client = _client()
+        session = MagicMock()
+        session.get.side_effect = [_response(429, {"Retry-After": "0.2"}), _response(200)]
+        
+        start = time.monotonic()
+        client.get(session, "https://example.com/jobs")
+        assert time.monotonic() - start >= 0.2
+        assert client.limiter.bucket_for("https://example.com/").rate < 1000
+    
+    def test_retry_after_parsing(self):
+        """Test Retry-After in seconds and as an HTTP date."""
+        assert retry_after_seconds("120") == 120
+        assert retry_after_seconds(None) is None
+        assert retry_after_seconds("soon") is None
+        assert retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+        assert RetryPolicy(max_delay=30).delay(0, retry_after=3600) == 30
+        assert all(0 <= RetryPolicy(base_delay=1).delay(3) <= 8 for _ in range(20))
+    
+    def test_circuit_opens_after_repeated_failures(self):
+        """Test that a failing source is paused, then probed with one trial request."""
+        client = _client(breaker=CircuitBreaker(failure_threshold=2, reset_timeout=0.1))
+        session = MagicMock()
+        session.get.return_value = _response(500)
+        
+        for _ in range(2):
+            assert client.get(session, "https://example.com/jobs").status_code == 500
+        assert client.breaker.state == "open"
+        calls = session.get.call_count
+        with pytest.raises(CircuitOpenError):
+            client.get(session, "https://example.com/jobs")
+        assert session.get.call_count == calls
+        
+        time.sleep(0.1)
+        assert client.breaker.state == "half-open"
+        session.get.return_value = _response(200)
+        assert client.get(session, "https://example.com/jobs").status_code == 200
+        assert client.breaker.state == "closed"
+    
+    @pytest.mark.parametrize("error", [requests.exceptions.ChunkedEncodingError("broken body"),
+                                       requests.exceptions.TooManyRedirects("loop"), KeyboardInterrupt()])
+    def test_trial_ended_by_other_errors(self, error):
+        """Test that a trial request failing with an error that isn't retried doesn't leave the circuit stuck."""
+        client = _client(breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.05))
+        session = MagicMock()
+        session.get.return_value = _response(500)
+        client.get(session, "https://example.com/jobs")
+        assert client.breaker.state == "open"
+        
+        time.sleep(0.05)
+        session.get.side_effect = error
+        with pytest.raises(type(error)):
+            client.get(session, "https://example.com/jobs")
+        
+        time.sleep(0.05)
+        session.get.side_effect = None
+        session.get.return_value = _response(200)
+        assert client.get(session, "https://example.com/jobs").status_code == 200
+        assert client.breaker.state == "closed"
+    
+    def test_async_failures_are_structured(self):
+        """Test that failed async fetches return a FetchResult instead of raising."""
+        attempts = 0
+        
+        async def handler(request):
+            nonlocal attempts
+            attempts += 1
+            return web.Response(status=503)
+        
+        client = _client()
+        
+        async def fetch(base_url):
+            async with aiohttp.ClientSession() as session:
+                return await client.aget(session, f"{base_url}/viewjob?jk=1")
+        
+        result = asyncio.run(_serve_job_pages(handler, fetch))
+        assert not result.ok
+        assert (result.status, result.attempts, attempts) == (503, 4, 4)
+        assert client.metrics.snapshot()["failed_requests"] == 1
+    
+    def test_async_trial_ended_by_decode_error(self):
+        """Test that an undecodable body during the trial request counts as a failure instead of blocking the source."""
+        async def handler(request):
+            return web.Response(body=b"\xff\xfe\xfd", content_type="text/html", charset="utf-8")
+        
+        client = _client(breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.05))
+        client.breaker.record_failure()
+        time.sleep(0.05)
+        
+        async def fetch(base_url):
+            async with aiohttp.ClientSession() as session:
+                with pytest.raises(UnicodeDecodeError):
+                    await client.aget(session, f"{base_url}/viewjob?jk=1")
+        
+        asyncio.run(_serve_job_pages(handler, fetch))
+        assert client.breaker.state == "open"
+        assert client.metrics.snapshot()["failed_requests"] == 1
+        time.sleep(0.05)
+        assert client.breaker.allow()
+    
+    def test_throttled_rate_recovers(self):
+        """Test that a throttled host's rate climbs back after successes."""
+        limiter = HostRateLimiter(rate=10)
+        limiter.throttled("https://example.com/a")
+        limiter.throttled("https://example.com/b")
+        assert limiter.bucket_for("https://example.com/").rate == 2.5
+        for _ in range(20):
+            limiter.succeeded("https://example.com/a")
+        assert limiter.bucket_for("https://example.com/").rate == 10
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+from app import schemas
+from app.ingest import ingest_jobs
+from app.stats import compute_stats, ensure_stat_counters, read_stats
+
+
+def make_jobs(count, start=0):
+    now = datetime.utcnow()
+    return [
+        {
+            "title": f"Developer {n}",
+            "company": f"Company {n % 3}",
+            "location": "Vermont",
+            "description": "Python" if n % 2 else "SQL",
+            "url": f"https://example.com/stats{n}",
+            "source": "indeed" if n % 4 else "linkedin",
+            "is_remote": n % 5 == 0,
+            "posted_date": now - timedelta(days=n),
+        }
+        for n in range(start, start + count)
+    ]
+
+
+def test_counters_follow_ingestion(db):
+    """Test that incrementally maintained counters match a full recompute."""
+    ingest_jobs(db, make_jobs(12))
+    assert read_stats(db) == compute_stats(db)
+    
+    # Further batches update the existing counters in place
+    ingest_jobs(db, make_jobs(9, start=12))
+    stats = read_stats(db)
+    assert stats == compute_stats(db)
+    assert stats["total_jobs"] == 21
+    assert stats["remote_jobs"] == 5
+    assert stats["recent_jobs"] == 7
+    assert stats["popular_tags"] == {"python": 10, "sql": 11}
+
+
+def test_fresh_stats(client, db):
+    """Test that ?fresh=true picks up jobs added outside the ingestion path."""
+    ingest_jobs(db, make_jobs(3))
+    assert client.get("/stats").json()["total_jobs"] == 3
+    
+    db.add(schemas.Job(title="Manual", company="Company 0", location="Vermont", description="",
+                       url="https://example.com/manual", source="vtjobs"))
+    db.commit()
+    
+    assert client.get("/stats").json()["total_jobs"] == 3
+    stats = client.get("/stats?fresh=true").json()
+    assert stats["total_jobs"] == 4
+    assert stats["jobs_by_source"]["vtjobs"] == 1
+    assert stats["top_companies"]["Company 0"] == 2
+
+
+def test_plain_read_does_not_build_counters(db):
+    """Test that only a fresh read or ensure_stat_counters builds missing counters."""
+    db.add(schemas.Job(title="Manual", company="Company 0", location="Vermont", description="",
+                       url="https://example.com/manual", source="vtjobs"))
+    db.commit()
+
+    assert read_stats(db)["total_jobs"] == 0
+    assert db.query(schemas.StatCounter).count() == 0
+
+    ensure_stat_counters(db)
+    assert read_stats(db) == compute_stats(db)
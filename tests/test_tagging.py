@@ -0,0 +1,76 @@
+import json
+from app import schemas
+from app.ingest import ingest_jobs, retag_jobs
+from app.tagging import TagExtractor, get_tag_extractor
+
+
+class TestTagExtractor:
+    """Tests for the compiled tag extractor."""
+    
+    def test_whole_word_matching(self):
+        """Test that tags only match whole tokens."""
+        extractor = TagExtractor({"sql": [], "react": [], "java": []})
+        
+        assert extractor.extract("Strong SQL skills") == {"sql"}
+        assert extractor.extract("NoSQL databases") == set()
+        assert extractor.extract("Reactive programming") == set()
+        assert extractor.extract("JavaScript only") == set()
+        assert extractor.extract("Java, React and sql.") == {"java", "react", "sql"}
+    
+    def test_aliases(self):
+        """Test that aliases map to their canonical tag."""
+        extractor = TagExtractor({
+            "node.js": ["nodejs", "node js"],
+            "c++": ["cpp"],
+            "c#": ["csharp"],
+            "machine-learning": ["machine learning", "ml"],
+            "javascript": ["js"],
+        })
+        
+        assert extractor.extract("Backend in NodeJS") == {"node.js"}
+        assert extractor.extract("Node.js and C++ experience") == {"node.js", "c++"}
+        assert extractor.extract("C# or cpp") == {"c#", "c++"}
+        assert extractor.extract("Machine\nlearning and ML ops") == {"machine-learning"}
+        assert extractor.extract("Title", None, "JS developer") == {"javascript"}
+    
+    def test_longest_alias_wins(self):
+        """Test that overlapping aliases prefer the longest match."""
+        extractor = TagExtractor({"react": [], "react-native": ["react native"]})
+        
+        assert extractor.extract("React Native developer") == {"react-native"}
+        assert extractor.extract("React developer") == {"react"}
+    
+    def test_default_vocabulary(self):
+        """Test the bundled vocabulary covers the original tag keywords."""
+        extractor = get_tag_extractor()
+        
+        assert {"python", "javascript", "react", "sql", "remote", "junior", "senior"} <= extractor.tags
+        assert len(extractor.tags) > 100
+        assert extractor.extract_job({
+            "title": "Senior Python Developer",
+            "description": "Work from home. PostgreSQL, Docker and AWS.",
+        }) == {"senior", "python", "remote", "postgresql", "docker", "aws"}
+    
+    def test_from_file(self, tmp_path):
+        """Test loading a vocabulary from a JSON file."""
+        path = tmp_path / "vocabulary.json"
+        path.write_text(json.dumps({"rust": ["rustlang"]}))
+        
+        extractor = TagExtractor.from_file(path)
+        
+        assert extractor.extract("Rustlang services") == {"rust"}
+
+
+def test_retag_jobs(db):
+    """Test retagging stored jobs with a new vocabulary."""
+    ingest_jobs(db, [
+        {"title": f"Job {n}", "company": "Co", "location": "VT", "description": "Python and Go",
+         "url": f"https://example.com/job{n}", "source": "indeed"}
+        for n in range(5)
+    ], extractor=TagExtractor({"python": []}))
+    
+    retagged = retag_jobs(db, TagExtractor({"go": ["golang", "go"]}), batch_size=2)
+    
+    assert retagged == 5
+    tag_names = [name for (name,) in db.query(schemas.Tag.name).join(schemas.JobTag).all()]
+    assert tag_names == ["go"] * 5